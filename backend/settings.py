@@ -21,12 +21,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # pierwszy, żeby czas obejmował całe przetwarzanie żądania
+    "backend.tickets.metrics.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # po udanym zapisie czyta z bazy głównej (REPLICA_PIN_SECONDS)
+    "backend.tickets.routers.ReplicaPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -55,9 +59,44 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # połączenie zostaje otwarte między żądaniami (sprawdzane przed ponownym użyciem);
+        # pod ASGI każde żądanie ma własny wątek, więc tam połączenie żyje tylko w obrębie żądania
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        # transakcje biorą blokadę zapisu od razu (BEGIN IMMEDIATE), patrz backend/tickets/db.py;
+        # None = zwykłe transakcje DEFERRED (porównanie: manage.py stress_sqlite_writes)
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
     }
 }
 
+# Profil SQLite ustawiany przy otwarciu każdego połączenia (backend/tickets/db.py):
+# WAL = odczyty nie blokują zapisu, busy_timeout = zapis czeka na blokadę zamiast
+# od razu zwracać "database is locked", mmap/cache = gorące strony w pamięci.
+# Pusty słownik = ustawienia domyślne SQLite.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # w WAL bezpieczne (utrata najwyżej ostatnich transakcji przy awarii OS)
+    "busy_timeout": 5000,  # ms
+    "mmap_size": 256 * 1024 * 1024,  # bajty
+    "cache_size": -64000,  # ujemne = KiB (~64 MB)
+    "temp_store": "MEMORY",
+}
+
+# Replika do odczytu (backend/tickets/routers.py): listy ticketów i komentarzy, statystyki,
+# lista techników i eksport czytają z aliasu REPLICA_DATABASE_ALIAS, reszta z "default".
+# Bez tego aliasu w DATABASES router niczego nie zmienia. Lokalnie: drugi plik SQLite
+# kopiowany z bazy głównej przez `python manage.py sync_replica --interval 2`:
+# DATABASES["replica"] = {
+#     **DATABASES["default"],
+#     "NAME": BASE_DIR / "db.replica.sqlite3",
+#     "TEST": {"MIRROR": "default"},
+# }
+DATABASE_ROUTERS = ["backend.tickets.routers.ReplicaRouter"]
+REPLICA_DATABASE_ALIAS = "replica"
+# Po zapisie użytkownik przez tyle sekund czyta z bazy głównej (widzi własne zmiany mimo
+# opóźnienia repliki); blokada jest w cache "default", przy kilku procesach ma być wspólny.
+REPLICA_PIN_SECONDS = 10
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -97,7 +136,62 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "backend.tickets.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
 }
+
+# Ile sekund rola użytkownika (ADMIN/TECHNICIAN/USER) jest trzymana w cache procesu
+# i dla ilu użytkowników najwyżej (najdawniej używani wypadają pierwsi).
+# Wpis jest usuwany przy każdej zmianie grup użytkownika (API, panel admina, shell).
+ROLE_CACHE_TTL = 60
+ROLE_CACHE_MAX_ENTRIES = 10000
+
+# Cache tokenów (CachedTokenAuthentication): snapshot użytkownika pod kluczem tokena.
+# Przy kilku procesach serwera "auth" powinien wskazywać na wspólny cache (np. Redis).
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "auth": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "helpdesk-auth",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+TOKEN_AUTH_CACHE_ALIAS = "auth"
+TOKEN_AUTH_CACHE_TTL = 60
+
+# Metryki żądań / SQL (GET /api/metrics/, tylko ADMIN); False wyłącza middleware
+METRICS_ENABLED = True
+
+# Strumień zdarzeń SSE (GET /api/events/, wymaga serwera ASGI):
+# maks. liczba zaległych zdarzeń na klienta (potem "resync") i interwał pingów w sekundach
+EVENT_STREAM_QUEUE_SIZE = 100
+EVENT_STREAM_HEARTBEAT = 15
+
+# Zadania w tle (backend/tickets/jobs.py): zapisywane w tej samej transakcji co zmiana ticketu,
+# wykonywane przez `python manage.py run_jobs`. Nieudane zadanie jest ponawiane po
+# JOB_RETRY_BASE_SECONDS * 2^(próba-1) s (maks. JOB_RETRY_MAX_SECONDS), po JOB_MAX_ATTEMPTS
+# próbach zostaje w stanie DEAD. Zadanie przerwane przez awarię workera wraca po JOB_LEASE_SECONDS.
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 10
+JOB_RETRY_MAX_SECONDS = 3600
+JOB_LEASE_SECONDS = 300
+
+# Powiadomienia e-mail o zmianach ticketów (backend/tickets/notifications.py) – pierwszy rodzaj zadań.
+# Lokalnie wiadomości trafiają do plików w EMAIL_FILE_PATH (nic nie jest wysyłane);
+# w produkcji: django.core.mail.backends.smtp.EmailBackend + EMAIL_HOST itd.
+TICKET_NOTIFICATIONS_ENABLED = True
+EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
+EMAIL_FILE_PATH = BASE_DIR / "sent_emails"
+DEFAULT_FROM_EMAIL = "helpdesk@localhost"
+
+# SLA (backend/tickets/sla.py): terminy reakcji i rozwiązania z SlaPolicy (priorytet + kategoria,
+# edycja w panelu admina) zapisywane przy tickecie. GET /api/tickets/at-risk/ domyślnie zwraca tickety,
+# których termin mija w ciągu SLA_AT_RISK_MINUTES minut; przekroczenia oznacza `python manage.py sla_sweep`.
+SLA_AT_RISK_MINUTES = 60
+
+# GET (JSON) listy/szczegółów ticketów, komentarzy, statystyk i health przez natywne widoki async
+# (backend/tickets/async_views.py); False = wszystkie żądania przez widoki DRF
+ASYNC_READ_VIEWS = True
@@ -1,6 +1,73 @@
+"""
+Serwowanie frontendu (Vite build w FRONTEND_DIST_DIR) bezpośrednio z Django.
+
+- ``spa_index``: index.html trzymany w pamięci, przeładowywany tylko gdy zmieni
+  się mtime / rozmiar pliku (jeden ``os.stat`` na żądanie zamiast odczytu).
+- ``static_asset``: pliki spod /static/. Gdy obok pliku leży wariant ``.br`` /
+  ``.gz`` (``manage.py compress_frontend``), wysyłany jest on zamiast oryginału
+  (najpierw brotli, potem gzip – zgodnie z Accept-Encoding). Pliki z ``assets/`` mają hash w nazwie,
+  więc dostają ``Cache-Control: immutable`` na rok; pozostałe są rewalidowane
+  (ETag / Last-Modified -> 304). Obsługiwany jest pojedynczy zakres ``Range``.
+  Cały plik idzie przez ``FileResponse``, więc serwer WSGI z
+  ``wsgi.file_wrapper`` (np. gunicorn) wysyła go przez sendfile, bez kopiowania.
+"""
+
+import mimetypes
+import os
+import re
+import stat
+import threading
 from pathlib import Path
+
 from django.conf import settings
-from django.http import HttpResponse, HttpResponseNotFound
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotFound
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+# Vite: assetsDir="assets", nazwy plików z hashem treści
+IMMUTABLE_PREFIX = "assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# kolejność = preferencja (brotli jest mniejsze)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _dist_dir():
+    dist_dir = getattr(settings, "FRONTEND_DIST_DIR", None)
+    return Path(dist_dir) if dist_dir else None
+
+
+# =========================
+# index.html
+# =========================
+
+class _IndexCache:
+    """Treść index.html w pamięci; klucz ważności: (ścieżka, mtime_ns, rozmiar)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None
+        self._body = b""
+        self._etag = ""
+
+    def get(self, path: Path):
+        st = os.stat(path)  # FileNotFoundError -> brak buildu
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if key != self._key:
+                self._body = path.read_bytes()
+                self._etag = '"%x-%x"' % (st.st_mtime_ns, st.st_size)
+                self._key = key
+            return self._body, self._etag, st.st_mtime
+
+
+_index_cache = _IndexCache()
 
 
 def spa_index(request):
@@ -9,15 +76,178 @@ def spa_index(request):
     - zwraca index.html z Vite build (frontend_dist/index.html)
     - dzięki temu React Router działa po odświeżeniu strony /tickets/123 itp.
     """
-    dist_dir = getattr(settings, "FRONTEND_DIST_DIR", None)
-    if not dist_dir:
+    dist_dir = _dist_dir()
+    if dist_dir is None:
         return HttpResponseNotFound("FRONTEND_DIST_DIR is not configured.")
 
-    index_path = Path(dist_dir) / "index.html"
-    if not index_path.exists():
+    try:
+        body, etag, mtime = _index_cache.get(dist_dir / "index.html")
+    except FileNotFoundError:
         return HttpResponseNotFound(
             "Frontend build not found. Run `npm run build` in /frontend "
             "to generate /frontend_dist/index.html"
         )
 
-    return HttpResponse(index_path.read_text(encoding="utf-8"), content_type="text/html")
+    # index.html wskazuje na aktualne nazwy assetów -> zawsze rewalidacja
+    response = get_conditional_response(request, etag=etag, last_modified=int(mtime))
+    if response is None:
+        response = HttpResponse(body, content_type="text/html; charset=utf-8")
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(mtime)
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+# =========================
+# /static/*
+# =========================
+
+def _accepted_encodings(request) -> set[str]:
+    accepted = set()
+    for part in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+def _stat_file(path: str):
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _select_variant(request, full_path: str, st, allow_compressed: bool):
+    """(ścieżka, stat, Content-Encoding lub None) pliku do wysłania."""
+
+    if allow_compressed:
+        accepted = _accepted_encodings(request)
+        for encoding, suffix in ENCODINGS:
+            if encoding in accepted or "*" in accepted:
+                variant_st = _stat_file(full_path + suffix)
+                # wariant starszy niż źródło = nieaktualny build
+                if variant_st is not None and variant_st.st_mtime_ns >= st.st_mtime_ns:
+                    return full_path + suffix, variant_st, encoding
+    return full_path, st, None
+
+
+def _parse_range(header: str, size: int):
+    """(start, end) włącznie; None = zignoruj nagłówek; ValueError = 416."""
+
+    match = _RANGE_RE.match(header.strip())
+    if match is None:
+        return None  # wiele zakresów / inna jednostka: cały plik (RFC 9110)
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # sufiks: ostatnie N bajtów
+        length = int(last)
+        if length == 0:
+            raise ValueError
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError
+    return start, end
+
+
+class _FileRange:
+    """Plik ograniczony do [start, end]; FileResponse czyta go do końca."""
+
+    def __init__(self, fileobj, start: int, end: int):
+        fileobj.seek(start)
+        self._file = fileobj
+        self._remaining = end - start + 1
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b""
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+@require_safe
+def static_asset(request, path):
+    dist_dir = _dist_dir()
+    if dist_dir is None:
+        raise Http404("FRONTEND_DIST_DIR is not configured.")
+    try:
+        full_path = safe_join(dist_dir, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    st = _stat_file(full_path)
+    if st is None:
+        raise Http404
+
+    range_header = request.headers.get("Range")
+    # zakresy dotyczą pliku źródłowego (klienci wznawiający pobieranie)
+    file_path, file_st, encoding = _select_variant(
+        request, full_path, st, allow_compressed=range_header is None
+    )
+
+    immutable = path.startswith(IMMUTABLE_PREFIX)
+    etag = '"%x-%x%s"' % (file_st.st_mtime_ns, file_st.st_size, "-" + encoding if encoding else "")
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(st.st_mtime),
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime))
+    if not_modified is not None:
+        response = not_modified
+    else:
+        content_type, _ = mimetypes.guess_type(full_path)
+        content_type = content_type or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "image/svg+xml"):
+            content_type += "; charset=utf-8"
+        response = _file_response(request, file_path, file_st.st_size, content_type, range_header, etag)
+        if encoding:
+            response["Content-Encoding"] = encoding
+
+    for name, value in headers.items():
+        response[name] = value
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
+
+
+def _file_response(request, file_path, size, content_type, range_header, etag):
+    byte_range = None
+    if range_header and request.headers.get("If-Range", etag) == etag:
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if request.method == "HEAD":
+        response = HttpResponse(content_type=content_type)
+        response["Content-Length"] = str(size)
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(file_path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            _FileRange(open(file_path, "rb"), start, end), content_type=content_type, status=206
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    # FileResponse zgaduje nazwę z pliku (np. "x.js.br"); nie jest potrzebna
+    if "Content-Disposition" in response:
+        del response["Content-Disposition"]
+    return response
@@ -1,11 +1,39 @@
 from django.contrib import admin
-from .models import Category, Ticket, Comment
+from django.utils import timezone
+from .jobs import requeue_dead
+from .models import Category, Ticket, Comment, Job, SlaPolicy
+from .sla import deadlines
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "status", "priority", "created_by", "assigned_to", "created_at")
     list_filter = ("status", "priority", "category")
     search_fields = ("title", "description")
+    readonly_fields = ("response_due_at", "resolve_due_at", "responded_at", "response_breached_at", "resolve_breached_at")
+
+    def save_model(self, request, obj, form, change):
+        if not change or {"priority", "category"} & set(form.changed_data):
+            start = obj.created_at if change else timezone.now()
+            for field, value in deadlines(obj.priority, obj.category_id, start).items():
+                setattr(obj, field, value)
+        super().save_model(request, obj, form, change)
+
+@admin.register(SlaPolicy)
+class SlaPolicyAdmin(admin.ModelAdmin):
+    list_display = ("priority", "category", "response_minutes", "resolve_minutes")
+    list_filter = ("priority",)
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "attempts", "max_attempts", "run_after", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("locked_by", "locked_until", "last_error", "created_at", "finished_at")
+    actions = ["requeue"]
+
+    @admin.action(description="Requeue selected dead jobs")
+    def requeue(self, request, queryset):
+        count = requeue_dead(queryset.values_list("id", flat=True))
+        self.message_user(request, f"Requeued {count} dead job(s).")
 
 admin.site.register(Category)
 admin.site.register(Comment)
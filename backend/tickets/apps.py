@@ -0,0 +1,22 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class TicketsConfig(AppConfig):
+    name = "backend.tickets"
+    label = "tickets"
+
+    def ready(self):
+        from django.contrib.auth.models import Group, User
+
+        from .db import apply_sqlite_pragmas
+        from .permissions import group_changed, user_groups_changed
+        from . import notifications  # noqa: F401 - registers its job handler
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid="tickets_sqlite_pragmas")
+        m2m_changed.connect(
+            user_groups_changed, sender=User.groups.through, dispatch_uid="tickets_role_cache_groups"
+        )
+        post_save.connect(group_changed, sender=Group, dispatch_uid="tickets_role_cache_group_save")
+        post_delete.connect(group_changed, sender=Group, dispatch_uid="tickets_role_cache_group_delete")
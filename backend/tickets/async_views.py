@@ -0,0 +1,255 @@
+"""Native async implementations of the hot read endpoints.
+
+Ticket list, ticket detail, comment list, stats and health are served by
+coroutines on the async ORM (``aaggregate``, ``aiterator``, ``afirst`` ...)
+when the app runs under ASGI. Under ``sync`` DRF views every request holds
+a worker thread for its whole duration; here a request waiting on the
+database only holds a coroutine, and authentication from the token cache
+never leaves the event loop.
+
+Behaviour matches the DRF views exactly: same visibility rules, same JSON
+(``render_tickets`` / ``CommentSerializer`` / stats payloads), same ETags,
+same error bodies and status codes. ``read_dispatch`` sends GET here and
+everything else (writes, HEAD, the browsable API) to the DRF view, so one
+URL keeps a single name. ``settings.ASYNC_READ_VIEWS = False`` routes all
+requests to the DRF views (``benchmark_concurrency`` compares the two).
+"""
+
+from __future__ import annotations
+
+import functools
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from .authentication import aauthenticate
+from .conditional import make_etag, not_modified_response, set_validators
+from .models import Comment, Ticket
+from .pagination import CommentCursorPagination, TicketCursorPagination
+from .permissions import aget_user_role, is_support_or_admin, is_technician_user
+from .representation import (
+    aticket_list_state,
+    requested_ticket_fields,
+    ticket_renderer,
+    ticket_row_state,
+    ticket_rows,
+)
+from .routers import aread_alias_for, reading_from
+from .serializers import CommentSerializer
+from .stats import aaggregate_ticket_stats, aticket_stats_payload, rollup_enabled
+from .views import (
+    _filtered_ticket_parts,
+    _filtered_ticket_qs,
+    _ticket_page_etag,
+    _visible_ticket_qs,
+)
+
+# rows fetched per round trip when the full (unpaginated) list is streamed
+LIST_CHUNK_SIZE = 2000
+
+
+def _json_response(data, status: int = 200) -> HttpResponse:
+    response = HttpResponse(
+        JSONRenderer().render(data), content_type="application/json", status=status
+    )
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+def _error_response(exc) -> HttpResponse:
+    """DRF ``exception_handler`` output (body, status, headers) without a DRF view."""
+
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        exc.auth_header = "Token"  # CachedTokenAuthentication.authenticate_header
+    handled = exception_handler(exc, {})
+    if handled is None:
+        raise exc
+    response = _json_response(handled.data, handled.status_code)
+    for header in ("WWW-Authenticate", "Retry-After"):
+        if header in handled:
+            response[header] = handled[header]
+    return response
+
+
+def async_read_view(view=None, *, allow_anonymous: bool = False, read_replica: bool = False):
+    """Run ``view(request, **kwargs)`` with a DRF ``Request`` whose ``user`` is set.
+
+    Authenticates (token cache / session), memoizes the role with
+    ``aget_user_role`` so the sync permission helpers below do not query,
+    and turns API exceptions into DRF-shaped JSON. Like DRF, a bad token is
+    rejected even when anonymous access is allowed. ``read_replica`` is the
+    async ``ReplicaReadMixin``.
+    """
+
+    if view is None:
+        return functools.partial(
+            async_read_view, allow_anonymous=allow_anonymous, read_replica=read_replica
+        )
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        drf_request = Request(request, authenticators=())
+        try:
+            user = await aauthenticate(request)
+            if user is not None:
+                await aget_user_role(user)
+                drf_request.user = user
+            elif not allow_anonymous:
+                raise exceptions.NotAuthenticated()
+            alias = await aread_alias_for(drf_request) if read_replica else None
+            # sync_to_async copies the context: the ORM threads see the alias
+            with reading_from(alias):
+                return await view(drf_request, *args, **kwargs)
+        except (exceptions.APIException, Http404) as exc:
+            return _error_response(exc)
+
+    return wrapper
+
+
+def _wants_browsable_api(request) -> bool:
+    return "format" in request.GET or "text/html" in request.headers.get("Accept", "")
+
+
+def read_dispatch(sync_view, async_view):
+    """One URL, two implementations: JSON GET -> ``async_view``, the rest -> DRF."""
+
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if (
+            request.method == "GET"
+            and getattr(settings, "ASYNC_READ_VIEWS", True)
+            and not _wants_browsable_api(request)
+        ):
+            return await async_view(request, *args, **kwargs)
+        return await sync_view(request, *args, **kwargs)
+
+    view.csrf_exempt = True  # DRF views enforce CSRF themselves (SessionAuthentication)
+    return view
+
+
+# =========================
+# HEALTH
+# =========================
+
+@async_read_view(allow_anonymous=True)
+async def health_check(request):
+    return _json_response({"status": "ok"})
+
+
+# =========================
+# TICKETS
+# =========================
+
+@async_read_view(read_replica=True)
+async def ticket_list(request):
+    """Async ``TicketListCreateAPIView.list``."""
+
+    keys = requested_ticket_fields(request.query_params)
+    include_internal = is_support_or_admin(request.user)
+    render = ticket_renderer(keys, include_internal)
+
+    parts = _filtered_ticket_parts(request.user, request.query_params)
+    paginator = TicketCursorPagination()
+    page = await paginator.apaginate_queryset([ticket_rows(part, keys) for part in parts], request)
+    if page is not None:
+        etag = _ticket_page_etag(request, paginator, page, include_internal)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        data = paginator.get_paginated_data([render(row) for row in page])
+        return set_validators(_json_response(data), etag)
+
+    queryset = _filtered_ticket_qs(request.user, request.query_params)
+    state = await aticket_list_state(queryset)
+    etag = make_etag("tickets", request.user.pk, request.get_full_path(), include_internal, *state.values())
+    not_modified = not_modified_response(request, etag)
+    if not_modified is not None:
+        return not_modified
+    rows = ticket_rows(queryset, keys)
+    data = [render(row) async for row in rows.aiterator(chunk_size=LIST_CHUNK_SIZE)]
+    return set_validators(_json_response(data), etag)
+
+
+@async_read_view
+async def ticket_detail(request, pk):
+    """Async ``TicketRetrieveUpdateDestroyAPIView.retrieve``."""
+
+    keys = requested_ticket_fields(request.query_params)
+    row = await ticket_rows(_visible_ticket_qs(request.user).filter(pk=pk), keys).afirst()
+    if row is None:
+        raise Http404
+    include_internal = is_support_or_admin(request.user)
+    etag = make_etag(
+        "ticket", pk, row.updated_at.isoformat(), keys, include_internal, *ticket_row_state(row)
+    )
+    not_modified = not_modified_response(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    data = ticket_renderer(keys, include_internal)(row)
+    return set_validators(_json_response(data), etag)
+
+
+# =========================
+# COMMENTS
+# =========================
+
+@async_read_view(read_replica=True)
+async def comment_list(request, ticket_id):
+    """Async ``CommentListCreateAPIView.list``."""
+
+    user = request.user
+    if not await _visible_ticket_qs(user).filter(pk=ticket_id).aexists():
+        raise Http404(f"No {Ticket._meta.object_name} matches the given query.")
+
+    queryset = Comment.objects.filter(ticket_id=ticket_id).order_by("-created_at")
+    support = is_support_or_admin(user)
+    if not support:
+        queryset = queryset.filter(visibility=Comment.VISIBILITY_PUBLIC)
+
+    state = await queryset.order_by().aaggregate(n=Count("id"), last=Max("updated_at"))
+    etag = make_etag(
+        "comments", ticket_id, support, request.get_full_path(), state["n"], state["last"]
+    )
+    not_modified = not_modified_response(request, etag)
+    if not_modified is not None:
+        return not_modified
+
+    # CommentSerializer only reads ticket_id / author_id here: no extra queries
+    paginator = CommentCursorPagination()
+    page = await paginator.apaginate_queryset(queryset, request)
+    if page is not None:
+        serializer = CommentSerializer(page, many=True, context={"request": request})
+        data = paginator.get_paginated_data(serializer.data)
+    else:
+        comments = [comment async for comment in queryset]
+        data = CommentSerializer(comments, many=True, context={"request": request}).data
+    return set_validators(_json_response(data), etag)
+
+
+# =========================
+# STATS
+# =========================
+
+@async_read_view(read_replica=True)
+async def ticket_stats(request):
+    """Async ``TicketStatsAPIView.get``."""
+
+    user = request.user
+    if not is_support_or_admin(user):
+        raise exceptions.PermissionDenied("You do not have permission to view stats.")
+
+    qs = _visible_ticket_qs(user)
+    if rollup_enabled():
+        data = await aticket_stats_payload(user, qs, is_technician=is_technician_user(user))
+    else:
+        data = await aaggregate_ticket_stats(qs)
+    return _json_response(data)
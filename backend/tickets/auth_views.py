@@ -1,14 +1,22 @@
 from django.contrib.auth import authenticate, get_user_model
+from django.db.models import Value
+from django.db.models.functions import Lower
 from rest_framework import permissions, status
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .authentication import invalidate_token
+from .events import hub
+
 User = get_user_model()
 
 
 def _user_payload(user, token=None):
-    groups = list(user.groups.values_list("name", flat=True))
+    # CachedTokenAuthentication already knows the groups
+    groups = getattr(user, "_cached_groups", None)
+    if groups is None:
+        groups = list(user.groups.values_list("name", flat=True))
     return {
         "token": token.key if token else None,
         "user": {
@@ -44,7 +52,13 @@ class LoginView(APIView):
         # 1) match by email
         # 2) fall back to treating identifier as username
         if not username and identifier:
-            user_obj = User.objects.filter(email__iexact=identifier).first()
+            # LOWER(email) = LOWER(%s) can use the functional index (email__iexact can't)
+            user_obj = (
+                User.objects.annotate(email_lower=Lower("email"))
+                .filter(email_lower=Lower(Value(identifier)))
+                .order_by("pk")
+                .first()
+            )
             username = user_obj.get_username() if user_obj else identifier
 
         if not username:
@@ -67,7 +81,9 @@ class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        token = Token.objects.filter(user=request.user).first()
+        token = request.auth if isinstance(request.auth, Token) else None
+        if token is None:
+            token = Token.objects.filter(user=request.user).first()
         return Response(_user_payload(request.user, token), status=status.HTTP_200_OK)
 
 
@@ -75,5 +91,9 @@ class LogoutView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        Token.objects.filter(user=request.user).delete()
+        tokens = Token.objects.filter(user=request.user)
+        for key in tokens.values_list("key", flat=True):
+            invalidate_token(key)
+        tokens.delete()
+        hub.disconnect_user(request.user.pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
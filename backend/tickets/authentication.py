@@ -0,0 +1,173 @@
+"""Token authentication backed by a cache of user snapshots.
+
+DRF ``TokenAuthentication`` runs ``Token JOIN User`` on every request.
+``CachedTokenAuthentication`` stores a small snapshot of the user (id, flags,
+role, groups) under the token key for ``settings.TOKEN_AUTH_CACHE_TTL``
+seconds and rebuilds ``request.user`` from it without touching the database.
+
+``aauthenticate`` is the same check for the native async views: a cache
+hit does not leave the event loop, a miss runs the database lookup through
+``sync_to_async``.
+
+Cached entries are dropped explicitly on logout, user update (role change,
+deactivation) and user deletion. With more than one server process, point
+``CACHES[settings.TOKEN_AUTH_CACHE_ALIAS]`` at a shared backend so that
+invalidation reaches every process.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import DEFERRED
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+
+from .permissions import get_user_role, set_cached_role
+
+# Fields loaded into the snapshot user; everything else stays deferred
+# (accessing it triggers a normal DB refresh, save() only writes these).
+SNAPSHOT_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+
+
+def _cache():
+    return caches[getattr(settings, "TOKEN_AUTH_CACHE_ALIAS", "default")]
+
+
+def _ttl() -> int:
+    return getattr(settings, "TOKEN_AUTH_CACHE_TTL", 60)
+
+
+def _cache_key(token_key: str) -> str:
+    # never keep raw token keys in the cache
+    return "authtoken:" + hashlib.sha256(token_key.encode()).hexdigest()
+
+
+def invalidate_token(token_key: str) -> None:
+    _cache().delete(_cache_key(token_key))
+
+
+def invalidate_user_tokens(user) -> None:
+    """Drop cached snapshots for all tokens of ``user``."""
+
+    keys = Token.objects.filter(user_id=user.pk).values_list("key", flat=True)
+    _cache().delete_many([_cache_key(key) for key in keys])
+
+
+def _snapshot(user) -> dict:
+    data = {field: getattr(user, field) for field in SNAPSHOT_FIELDS}
+    data["groups"] = list(user.groups.values_list("name", flat=True))
+    data["role"] = get_user_role(user)
+    return data
+
+
+def _from_values(model, values: dict):
+    """``model.from_db`` with ``values`` (attname -> value); other fields stay deferred.
+
+    ``from_db`` assigns values positionally in ``_meta.concrete_fields``
+    order, so they are laid out in that order here.
+    """
+
+    fields = model._meta.concrete_fields
+    return model.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [values.get(field.attname, DEFERRED) for field in fields],
+    )
+
+
+def _user_from_snapshot(data: dict):
+    user = _from_values(get_user_model(), {field: data[field] for field in SNAPSHOT_FIELDS})
+    user._cached_groups = list(data["groups"])
+    set_cached_role(user, data["role"])
+    return user
+
+
+def _from_snapshot(key: str, data: dict):
+    user = _user_from_snapshot(data)
+    token = _from_values(Token, {"key": key, "user_id": user.pk})
+    return user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for ``TokenAuthentication`` (same header format)."""
+
+    def authenticate_credentials(self, key):
+        cache = _cache()
+        cache_key = _cache_key(key)
+
+        data = cache.get(cache_key)
+        if data is not None:
+            return _from_snapshot(key, data)
+
+        user, token = super().authenticate_credentials(key)
+        data = _snapshot(user)
+        cache.set(cache_key, data, _ttl())
+        user._cached_groups = list(data["groups"])
+        return user, token
+
+    def token_key(self, request) -> str | None:
+        """Key from the ``Authorization`` header, checked like ``authenticate`` does."""
+
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_("Invalid token header. No credentials provided."))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(
+                _("Invalid token header. Token string should not contain spaces.")
+            )
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _("Invalid token header. Token string should not contain invalid characters.")
+            )
+
+    async def aauthenticate_credentials(self, key):
+        cache = _cache()
+        if isinstance(cache, LocMemCache):
+            # in-process dict: no I/O, no reason to leave the event loop
+            data = cache.get(_cache_key(key))
+        else:
+            data = await cache.aget(_cache_key(key))
+        if data is not None:
+            return _from_snapshot(key, data)
+        return await sync_to_async(self.authenticate_credentials)(key)
+
+
+async def aauthenticate(request):
+    """User for an async view: token header first, then the session; None if anonymous.
+
+    Same order and errors as ``DEFAULT_AUTHENTICATION_CLASSES``
+    (``AuthenticationFailed`` for a bad token or an inactive user).
+    """
+
+    authenticator = CachedTokenAuthentication()
+    key = authenticator.token_key(request)
+    if key is not None:
+        user, _token = await authenticator.aauthenticate_credentials(key)
+        return user
+
+    user = await request.auser()  # AuthenticationMiddleware
+    if user.is_authenticated and user.is_active:
+        return user
+    return None
@@ -0,0 +1,40 @@
+"""Conditional GET helpers (weak ETag -> 304 Not Modified).
+
+Views compute a cheap validator (timestamps / counts from the database)
+*before* running serializers; when the client already has that version,
+they answer 304 without building the body.
+
+No Last-Modified: a second-resolution timestamp of the newest
+``updated_at`` misses deletions and the columns written without touching
+``updated_at`` (comment counters, SLA events), so If-Modified-Since would
+answer 304 for a changed resource. Clients revalidate with If-None-Match.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from django.utils.cache import get_conditional_response
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from arbitrary parts (ids, timestamps, counts, query string)."""
+
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return 'W/"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def set_validators(response, etag: str):
+    response["ETag"] = etag
+    # Always revalidate: browsers must not reuse API responses without asking.
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified_response(request, etag: str):
+    """Return a 304 response if If-None-Match matches, else None."""
+
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        set_validators(response, etag)
+    return response
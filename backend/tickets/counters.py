@@ -0,0 +1,155 @@
+"""Per-ticket comment counters (``Ticket.public_comment_count`` & co.).
+
+``public_comment_count``, ``internal_comment_count``, ``last_comment_at``
+and ``last_public_comment_at`` are kept up to date by SQL triggers on
+``tickets_comment``, in the same statement as the comment insert, delete or
+visibility / ticket change - so API writes, the admin, ``bulk_create`` and
+cascading deletes are all covered, inside the caller's transaction. The
+ticket list and detail read them as plain columns: no join, no subquery.
+
+``Ticket.save()`` never writes these columns (a stale in-memory copy would
+overwrite a concurrent comment). Like the stats rollup, the triggers are
+SQLite-only; ``reconcile_comment_counters`` reports and repairs drift.
+"""
+
+from __future__ import annotations
+
+from django.db import connection, transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Comment, Ticket
+
+PUBLIC = Comment.VISIBILITY_PUBLIC
+
+COUNTER_FIELDS = (
+    "public_comment_count",
+    "internal_comment_count",
+    "last_comment_at",
+    "last_public_comment_at",
+)
+
+# created_at is stored as ISO text: MAX() over it is chronological
+_ADD_NEW = f"""
+    UPDATE tickets_ticket SET
+        public_comment_count = public_comment_count + (new.visibility = '{PUBLIC}'),
+        internal_comment_count = internal_comment_count + (new.visibility != '{PUBLIC}'),
+        last_comment_at = MAX(COALESCE(last_comment_at, new.created_at), new.created_at),
+        last_public_comment_at = CASE WHEN new.visibility = '{PUBLIC}'
+            THEN MAX(COALESCE(last_public_comment_at, new.created_at), new.created_at)
+            ELSE last_public_comment_at END
+    WHERE id = new.ticket_id;
+"""
+
+# runs after the row is gone / changed: the MAX() subqueries see the new state
+_REMOVE_OLD = f"""
+    UPDATE tickets_ticket SET
+        public_comment_count = public_comment_count - (old.visibility = '{PUBLIC}'),
+        internal_comment_count = internal_comment_count - (old.visibility != '{PUBLIC}'),
+        last_comment_at = (
+            SELECT MAX(created_at) FROM tickets_comment WHERE ticket_id = old.ticket_id
+        ),
+        last_public_comment_at = (
+            SELECT MAX(created_at) FROM tickets_comment
+            WHERE ticket_id = old.ticket_id AND visibility = '{PUBLIC}'
+        )
+    WHERE id = old.ticket_id;
+"""
+
+# Idempotent DDL. tickets_comment rebuilds drop these triggers; re-run it
+# from such migrations (as with ensure_search_schema / ensure_stats_triggers).
+TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_comment_counts_ai AFTER INSERT ON tickets_comment BEGIN
+        {_ADD_NEW}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_comment_counts_ad AFTER DELETE ON tickets_comment BEGIN
+        {_REMOVE_OLD}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_comment_counts_au
+    AFTER UPDATE OF visibility, ticket_id ON tickets_comment
+    WHEN old.visibility IS NOT new.visibility OR old.ticket_id IS NOT new.ticket_id
+    BEGIN
+        {_REMOVE_OLD}
+        {_ADD_NEW}
+    END
+    """,
+]
+
+DROP_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS tickets_comment_counts_au",
+    "DROP TRIGGER IF EXISTS tickets_comment_counts_ad",
+    "DROP TRIGGER IF EXISTS tickets_comment_counts_ai",
+]
+
+
+def counters_enabled(conn=None) -> bool:
+    return (conn or connection).vendor == "sqlite"
+
+
+def ensure_comment_counter_triggers(conn) -> None:
+    if not counters_enabled(conn):
+        return
+    with conn.cursor() as cursor:
+        for sql in TRIGGER_SQL:
+            cursor.execute(sql)
+
+
+def drop_comment_counter_triggers(conn) -> None:
+    if not counters_enabled(conn):
+        return
+    with conn.cursor() as cursor:
+        for sql in DROP_TRIGGER_SQL:
+            cursor.execute(sql)
+
+
+def expected_counters(comment_model=Comment) -> dict:
+    """Correlated subqueries (per ticket ``pk``) giving the counters as they should be."""
+
+    comments = comment_model.objects.filter(ticket=OuterRef("pk")).order_by().values("ticket")
+    public = comments.filter(visibility=PUBLIC)
+    internal = comments.exclude(visibility=PUBLIC)
+
+    def count(qs):
+        return Coalesce(
+            Subquery(qs.annotate(n=Count("id")).values("n"), output_field=IntegerField()), 0
+        )
+
+    def latest(qs):
+        return Subquery(qs.annotate(last=Max("created_at")).values("last"))
+
+    return {
+        "public_comment_count": count(public),
+        "internal_comment_count": count(internal),
+        "last_comment_at": latest(comments),
+        "last_public_comment_at": latest(public),
+    }
+
+
+def comment_counter_drift(ticket_model=Ticket, comment_model=Comment) -> dict[int, tuple]:
+    """``{ticket id: (stored, expected)}`` for tickets whose counters are wrong."""
+
+    expected = {f"expected_{name}": expr for name, expr in expected_counters(comment_model).items()}
+    rows = ticket_model.objects.order_by().annotate(**expected).values_list(
+        "id", *COUNTER_FIELDS, *expected
+    )
+    size = len(COUNTER_FIELDS)
+    drift = {}
+    for row in rows.iterator(chunk_size=2000):
+        stored, wanted = row[1 : 1 + size], row[1 + size :]
+        if stored != wanted:
+            drift[row[0]] = (stored, wanted)
+    return drift
+
+
+def rebuild_comment_counters(ticket_model=Ticket, comment_model=Comment) -> dict[int, tuple]:
+    """Recompute every ticket's counters; returns the drift found before the rebuild."""
+
+    with transaction.atomic():
+        drift = comment_counter_drift(ticket_model, comment_model)
+        ticket_model.objects.update(**expected_counters(comment_model))
+    return drift
@@ -0,0 +1,46 @@
+"""SQLite connection profile and write transactions.
+
+``apply_sqlite_pragmas`` runs on every new connection (``connection_created``)
+and applies ``settings.SQLITE_PRAGMAS``: WAL lets readers and the single
+writer work at the same time, ``busy_timeout`` makes a writer wait for the
+lock instead of failing at once, ``mmap_size`` / ``cache_size`` keep hot
+pages in memory.
+
+Transactions start with ``BEGIN IMMEDIATE`` (``DATABASES[...]["OPTIONS"]
+["transaction_mode"]``), i.e. take the write lock up front. A default
+(deferred) transaction that reads first and writes later has to upgrade its
+lock; when another connection committed in the meantime SQLite cannot wait
+for it and raises "database is locked" right away, whatever the busy
+timeout. With the lock taken at BEGIN the only wait is the busy handler's,
+which is what the timeout is for.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import transaction
+
+
+def sqlite_pragmas() -> dict:
+    return dict(getattr(settings, "SQLITE_PRAGMAS", None) or {})
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    pragmas = sqlite_pragmas()
+    if not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def write_transaction(using: str | None = None):
+    """``transaction.atomic`` around a block that writes.
+
+    The lock mode comes from the connection's ``transaction_mode`` option
+    (IMMEDIATE in settings); nested blocks are plain savepoints.
+    """
+
+    return transaction.atomic(using=using)
@@ -0,0 +1,58 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+
+from .authentication import CachedTokenAuthentication
+from .events import event_stream
+from .permissions import get_user_role
+
+
+def _authenticate(request):
+    """Session user, `Authorization: Token <key>` or `?token=<key>` (EventSource cannot set headers)."""
+
+    authenticator = CachedTokenAuthentication()
+    result = authenticator.authenticate(request)
+    if result is None and request.GET.get("token"):
+        result = authenticator.authenticate_credentials(request.GET["token"])
+    if result is not None:
+        user = result[0]
+    else:
+        user = request.user  # SessionMiddleware / AuthenticationMiddleware
+        if not user.is_authenticated:
+            return None, None
+    return user, get_user_role(user)
+
+
+@require_GET
+async def ticket_event_stream(request):
+    """
+    Server-Sent Events: ticket.created / updated / assigned / status_changed / deleted,
+    comment.created / updated / deleted.
+    GET /api/events/
+
+    Only events for tickets the user can see; internal comments only for TECHNICIAN / ADMIN.
+    Needs an ASGI server (uvicorn backend.asgi:application).
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Event stream requires the ASGI server (backend.asgi:application)."},
+            status=503,
+        )
+
+    try:
+        user, role = await sync_to_async(_authenticate)(request)
+    except exceptions.AuthenticationFailed as exc:
+        return JsonResponse({"detail": str(exc.detail)}, status=401)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    response = StreamingHttpResponse(
+        event_stream(user, role, getattr(settings, "EVENT_STREAM_HEARTBEAT", 15)),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx: do not buffer the stream
+    return response
@@ -0,0 +1,243 @@
+"""In-process broadcast of ticket changes for the SSE stream (/api/events/).
+
+Views and commands call ``publish_ticket_event`` / ``publish_comment_event``
+after a change; the event is handed to ``hub`` once the surrounding
+transaction commits. The hub fans it out on the event loop that serves the
+streams: one ``call_soon_threadsafe`` per loop, then a visibility check and
+a ``put_nowait`` per subscriber - no threads or sockets per client.
+
+Every subscriber has a bounded queue (``settings.EVENT_STREAM_QUEUE_SIZE``).
+A client that does not keep up is not allowed to grow memory: its queue is
+dropped and the stream ends with a ``resync`` event, after which the browser
+reconnects (EventSource does that on its own) and reloads what it shows.
+
+Visibility follows ``can_view_ticket`` (state before *or* after the change,
+so a technician learns that a ticket was reassigned away); internal comments
+only reach TECHNICIAN / ADMIN. Events are per process: with several server
+processes each one only sees the changes it made itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import threading
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .models import Comment
+from .permissions import can_view_ticket
+
+_UNCHANGED = object()
+
+
+def _queue_size() -> int:
+    return getattr(settings, "EVENT_STREAM_QUEUE_SIZE", 100)
+
+
+@dataclass(frozen=True)
+class TicketEvent:
+    seq: int
+    kind: str
+    created_by_id: int
+    assigned_to_id: int | None
+    previous_assigned_to_id: object = _UNCHANGED
+    internal: bool = False
+    data: dict = field(default_factory=dict)
+
+    def encode(self) -> bytes:
+        payload = json.dumps(self.data, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return f"id: {self.seq}\nevent: {self.kind}\ndata: {payload}\n\n".encode()
+
+    def visible_to(self, user, role: str) -> bool:
+        if self.internal and role not in ("TECHNICIAN", "ADMIN"):
+            return False
+        after = SimpleNamespace(created_by_id=self.created_by_id, assigned_to_id=self.assigned_to_id)
+        if can_view_ticket(user, after):
+            return True
+        if self.previous_assigned_to_id is _UNCHANGED:
+            return False
+        before = SimpleNamespace(
+            created_by_id=self.created_by_id, assigned_to_id=self.previous_assigned_to_id
+        )
+        return can_view_ticket(user, before)
+
+
+class Subscription:
+    """One open stream. Lives on (and is only touched from) its event loop."""
+
+    __slots__ = ("user", "role", "queue", "close_reason")
+
+    def __init__(self, user, role: str):
+        self.user = user
+        self.role = role
+        self.queue = asyncio.Queue(maxsize=_queue_size())
+        self.close_reason = None
+
+    def offer(self, event: TicketEvent, message: bytes) -> None:
+        if self.close_reason is not None or not event.visible_to(self.user, self.role):
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.close("resync")
+
+    def close(self, reason: str) -> None:
+        if self.close_reason is not None:
+            return
+        self.close_reason = reason
+        # free the backlog and wake the reader; it sends `reason` and stops
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class EventHub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[asyncio.AbstractEventLoop, set[Subscription]] = {}
+        self._seq = itertools.count(1)
+
+    def subscribe(self, user, role: str) -> Subscription:
+        """Register a stream; call from the event loop that will read it."""
+
+        subscription = Subscription(user, role)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(loop, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for loop, subscriptions in list(self._subscribers.items()):
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[loop]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def _dispatch(self, callback, *args) -> None:
+        with self._lock:
+            loops = list(self._subscribers)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(callback, loop, *args)
+            except RuntimeError:
+                # loop already closed (server shutdown)
+                with self._lock:
+                    self._subscribers.pop(loop, None)
+
+    def _snapshot(self, loop):
+        with self._lock:
+            return tuple(self._subscribers.get(loop, ()))
+
+    def publish(self, event: TicketEvent) -> None:
+        """Thread-safe; encodes once and fans out on every subscriber loop."""
+
+        self._dispatch(self._fanout, event, event.encode())
+
+    def _fanout(self, loop, event, message):
+        for subscription in self._snapshot(loop):
+            subscription.offer(event, message)
+
+    def disconnect_user(self, user_id: int, reason: str = "reauthenticate") -> None:
+        """End the streams of a user (logout, role change, deactivation)."""
+
+        self._dispatch(self._disconnect, user_id, reason)
+
+    def _disconnect(self, loop, user_id, reason):
+        for subscription in self._snapshot(loop):
+            if subscription.user.pk == user_id:
+                subscription.close(reason)
+
+    def next_seq(self) -> int:
+        return next(self._seq)
+
+
+hub = EventHub()
+
+
+# ---- publishing helpers (sync code: views, commands) ----
+
+def _ticket_data(ticket) -> dict:
+    return {
+        "id": ticket.pk,
+        "status": ticket.status,
+        "priority": ticket.priority,
+        "created_by": ticket.created_by_id,
+        "assigned_to": ticket.assigned_to_id,
+        "updated_at": ticket.updated_at,
+    }
+
+
+def _publish_on_commit(event: TicketEvent) -> None:
+    transaction.on_commit(lambda: hub.publish(event))
+
+
+def publish_ticket_event(kind, ticket, previous_assigned_to_id=_UNCHANGED, **extra) -> None:
+    """Queue ``ticket.<kind>`` (created / updated / assigned / status_changed / deleted)."""
+
+    _publish_on_commit(
+        TicketEvent(
+            seq=hub.next_seq(),
+            kind=f"ticket.{kind}",
+            created_by_id=ticket.created_by_id,
+            assigned_to_id=ticket.assigned_to_id,
+            previous_assigned_to_id=previous_assigned_to_id,
+            data={**_ticket_data(ticket), **extra},
+        )
+    )
+
+
+def publish_comment_event(kind, comment, ticket) -> None:
+    """Queue ``comment.<kind>`` (created / updated / deleted); ``ticket`` = comment's ticket."""
+
+    _publish_on_commit(
+        TicketEvent(
+            seq=hub.next_seq(),
+            kind=f"comment.{kind}",
+            created_by_id=ticket.created_by_id,
+            assigned_to_id=ticket.assigned_to_id,
+            internal=comment.visibility != Comment.VISIBILITY_PUBLIC,
+            data={
+                "id": comment.pk,
+                "ticket": ticket.pk,
+                "author": comment.author_id,
+                "visibility": comment.visibility,
+            },
+        )
+    )
+
+
+# ---- stream ----
+
+async def event_stream(user, role: str, heartbeat: float):
+    """Async iterator of SSE chunks for one subscriber.
+
+    Subscribes on first iteration, so a client that disconnects before the
+    body starts never leaves a subscription behind.
+    """
+
+    subscription = hub.subscribe(user, role)
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                async with asyncio.timeout(heartbeat):
+                    message = await subscription.queue.get()
+            except TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if message is None:
+                yield f"event: {subscription.close_reason}\ndata: {{}}\n\n".encode()
+                return
+            yield message
+    finally:
+        hub.unsubscribe(subscription)
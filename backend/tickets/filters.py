@@ -1,4 +1,5 @@
-from django.db.models import Q
+from .permissions import is_support_or_admin
+from .search import apply_ticket_search
 
 class TicketFilter:
     def __init__(self, params, user):
@@ -31,9 +32,12 @@ class TicketFilter:
             queryset = queryset.filter(created_by_id=created_by_val)
 
         if search_val:
-            queryset = queryset.filter(
-                Q(title__icontains=search_val)
-                | Q(description__icontains=search_val)
+            # Full-text (FTS5) over title/description + comments, ranked by relevance.
+            # Internal comments are searchable only for support/admin.
+            queryset = apply_ticket_search(
+                queryset,
+                search_val,
+                include_internal=is_support_or_admin(self.user),
             )
 
         return queryset
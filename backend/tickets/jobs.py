@@ -0,0 +1,199 @@
+"""Background jobs: a transactional outbox and the worker's building blocks.
+
+``enqueue`` only inserts a ``Job`` row. Called inside the write transaction
+of a change (``write_transaction`` in views / commands), the job exists if
+and only if the change was committed - nothing is sent for a rolled back
+request and nothing is lost when the process dies right after the commit.
+The request pays for one INSERT; the work itself runs in ``manage.py
+run_jobs``.
+
+The worker claims a batch of ready jobs (``claim_jobs``: PENDING, ``run_after``
+passed, oldest first) in one ``BEGIN IMMEDIATE`` transaction, runs them on a
+thread pool and records the outcome of the whole batch in one more
+(``finish_jobs``). A failed job is retried after an exponentially growing,
+jittered delay (``retry_delay``); after ``max_attempts`` - or at once for
+``PermanentJobError`` / an unknown kind - it stays DEAD with the error, for
+inspection in the admin and ``run_jobs --requeue-dead``. A claim is a lease:
+jobs of a worker that died are claimed again after ``JOB_LEASE_SECONDS``.
+
+Delivery is at least once: a handler may run again after a crash or an
+expired lease, so handlers must tolerate repeats.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .db import write_transaction
+from .models import Job
+
+HANDLERS: dict[str, Callable[[dict], None]] = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help; the job goes straight to DEAD."""
+
+
+def register(kind: str):
+    """Decorator: ``handler(payload)`` runs the jobs of ``kind``."""
+
+    def decorator(handler):
+        HANDLERS[kind] = handler
+        return handler
+
+    return decorator
+
+
+def _max_attempts() -> int:
+    return getattr(settings, "JOB_MAX_ATTEMPTS", 5)
+
+
+def lease_seconds() -> int:
+    return getattr(settings, "JOB_LEASE_SECONDS", 300)
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before attempt ``attempts + 1``: base * 2^(attempts-1), capped, +-25% jitter."""
+
+    base = getattr(settings, "JOB_RETRY_BASE_SECONDS", 10)
+    cap = getattr(settings, "JOB_RETRY_MAX_SECONDS", 3600)
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    # jitter: jobs that failed together (e.g. SMTP down) do not retry together
+    return delay * random.uniform(0.75, 1.25)
+
+
+# ---- producer side ----
+
+def enqueue(kind: str, payload: dict, *, delay: float = 0) -> Job:
+    """Insert a job; call inside the transaction of the change it belongs to."""
+
+    return Job.objects.create(
+        kind=kind,
+        payload=payload,
+        max_attempts=_max_attempts(),
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def enqueue_many(kind: str, payloads: Iterable[dict]) -> list[Job]:
+    now = timezone.now()
+    return Job.objects.bulk_create(
+        Job(kind=kind, payload=payload, max_attempts=_max_attempts(), run_after=now)
+        for payload in payloads
+    )
+
+
+# ---- worker side ----
+
+def _expire_leases(now) -> None:
+    expired = Job.objects.filter(status=Job.STATUS_RUNNING, locked_until__lt=now)
+    # a job whose worker keeps dying with it must not be retried forever
+    expired.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.STATUS_DEAD,
+        locked_by="",
+        locked_until=None,
+        last_error="Lease expired (worker stopped while running the job).",
+        finished_at=now,
+    )
+    expired.update(status=Job.STATUS_PENDING, locked_by="", locked_until=None, run_after=now)
+
+
+def claim_jobs(worker: str, limit: int, lease: int | None = None) -> list[Job]:
+    """Take up to ``limit`` ready jobs for ``worker``; ``attempts`` counts this run."""
+
+    now = timezone.now()
+    lease = lease_seconds() if lease is None else lease
+    with write_transaction():
+        _expire_leases(now)
+        ids = list(
+            Job.objects.filter(status=Job.STATUS_PENDING, run_after__lte=now)
+            .order_by("run_after", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(id__in=ids).update(
+            status=Job.STATUS_RUNNING,
+            locked_by=worker,
+            locked_until=now + timedelta(seconds=lease),
+            attempts=F("attempts") + 1,
+        )
+        return list(Job.objects.filter(id__in=ids).order_by("run_after", "id"))
+
+
+def run_job(job: Job) -> tuple[str | None, bool]:
+    """Run the handler: ``(None, False)`` on success, else ``(error, permanent)``."""
+
+    handler = HANDLERS.get(job.kind)
+    if handler is None:
+        return f"No handler registered for job kind '{job.kind}'.", True
+    try:
+        handler(job.payload)
+    except PermanentJobError as exc:
+        return f"{type(exc).__name__}: {exc}", True
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}", False
+    return None, False
+
+
+def finish_jobs(worker: str, outcomes: list[tuple[Job, str | None, bool]]) -> dict[str, int]:
+    """Record a batch of ``run_job`` results in one transaction; returns counts per outcome."""
+
+    now = timezone.now()
+    counts = {"done": 0, "retried": 0, "dead": 0}
+    # only rows this worker still holds: after an expired lease the job is someone else's
+    held = Job.objects.filter(status=Job.STATUS_RUNNING, locked_by=worker)
+    with write_transaction():
+        done = [job.pk for job, error, _ in outcomes if error is None]
+        if done:
+            counts["done"] = held.filter(pk__in=done).update(
+                status=Job.STATUS_DONE,
+                locked_by="",
+                locked_until=None,
+                last_error="",
+                finished_at=now,
+            )
+        for job, error, permanent in outcomes:
+            if error is None:
+                continue
+            if permanent or job.attempts >= job.max_attempts:
+                values = {"status": Job.STATUS_DEAD, "finished_at": now}
+                key = "dead"
+            else:
+                run_after = now + timedelta(seconds=retry_delay(job.attempts))
+                values = {"status": Job.STATUS_PENDING, "run_after": run_after}
+                key = "retried"
+            counts[key] += held.filter(pk=job.pk).update(
+                locked_by="", locked_until=None, last_error=error, **values
+            )
+    return counts
+
+
+def requeue_dead(ids: Iterable[int] | None = None) -> int:
+    """Give dead jobs a fresh set of attempts (all of them, or only ``ids``)."""
+
+    jobs = Job.objects.filter(status=Job.STATUS_DEAD)
+    if ids is not None:
+        jobs = jobs.filter(pk__in=list(ids))
+    with write_transaction():
+        return jobs.update(
+            status=Job.STATUS_PENDING,
+            attempts=0,
+            run_after=timezone.now(),
+            finished_at=None,
+        )
+
+
+def purge_done(older_than: timedelta) -> int:
+    """Delete DONE jobs finished more than ``older_than`` ago."""
+
+    cutoff = timezone.now() - older_than
+    with write_transaction():
+        deleted, _ = Job.objects.filter(status=Job.STATUS_DONE, finished_at__lt=cutoff).delete()
+    return deleted
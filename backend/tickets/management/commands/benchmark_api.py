@@ -0,0 +1,435 @@
+import asyncio
+import json
+import logging
+import math
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+import django
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from backend.tickets.models import Category, Comment, Ticket
+from backend.tickets import urls as api_urls
+from backend.tickets.permissions import get_user_role
+from backend.tickets.views import _visible_ticket_qs
+
+ROLES = ("ADMIN", "TECHNICIAN", "USER")
+
+# Metrics held to --threshold against the baseline, with an absolute noise floor
+# (differences below it are ignored). Query counts must simply not grow.
+COMPARED_METRICS = {
+    "p95_ms": 1.0,
+    "peak_kib": 64.0,
+}
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    path: str
+    body: dict | None = None
+    write: bool = False  # run inside a transaction that is rolled back
+    slow: bool = False  # uses --slow-iterations (full scans, password hashing)
+    stream: bool = False  # SSE through the ASGI app: connect, read the first event, disconnect
+
+
+class _QueryCounter:
+    """``connection.execute_wrapper`` that counts statements.
+
+    CaptureQueriesContext cannot be used: the test client fires
+    ``request_started``, which resets ``connection.queries_log`` mid-capture.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _percentile(sorted_values, pct):
+    # nearest-rank percentile
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every /api/ endpoint in-process as ADMIN, TECHNICIAN and USER: "
+        "p50/p95/p99 latency, SQL query count and peak memory, written to a JSON report. "
+        "With --baseline, compare against an earlier report and fail on regressions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30, help="Timed calls per endpoint.")
+        parser.add_argument("--warmup", type=int, default=3, help="Untimed calls per endpoint first.")
+        parser.add_argument(
+            "--slow-iterations",
+            type=int,
+            default=3,
+            help="Timed calls for slow endpoints (full list, export, password hashing); no warmup.",
+        )
+        parser.add_argument("--prefix", default="load", help="Username prefix used by generate_load_data.")
+        parser.add_argument("--password", default="load1234", help="Password of the generated users.")
+        parser.add_argument(
+            "--generate",
+            type=int,
+            metavar="TICKETS",
+            help="Run generate_load_data with this many tickets when no generated users exist.",
+        )
+        parser.add_argument("--only", help="Run only endpoints whose name contains this text.")
+        parser.add_argument("--output", default="benchmark-report.json", help="JSON report path.")
+        parser.add_argument("--baseline", help="Earlier report to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed relative increase of p95 latency / peak memory (default 0.2 = 20%%).",
+        )
+
+    # ---- dataset / actors ----
+
+    def _ensure_dataset(self, options):
+        User = get_user_model()
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            return
+        if not options["generate"]:
+            raise CommandError(
+                f"No users with prefix '{prefix}_'. Run generate_load_data first or pass --generate N."
+            )
+        call_command(
+            "generate_load_data",
+            tickets=options["generate"],
+            comments=options["generate"] * 2,
+            users=max(100, options["generate"] // 200),
+            prefix=prefix,
+            stdout=self.stdout,
+        )
+
+    def _actors(self, prefix):
+        User = get_user_model()
+        actors = {}
+        for role in ROLES:
+            user = (
+                User.objects.filter(username__startswith=f"{prefix}_{role.lower()}_", is_active=True)
+                .order_by("pk")
+                .first()
+            )
+            if user is None or get_user_role(user) != role:
+                raise CommandError(f"No generated {role} user with prefix '{prefix}_'.")
+            token, _ = Token.objects.get_or_create(user=user)
+            actors[role] = (user, token.key)
+        return actors
+
+    def _login_case(self, actors, password):
+        return Case("auth login", "post", "/api/auth/login/", {
+            "username": actors["USER"][0].username, "password": password,
+        }, write=True, slow=True)
+
+    def _cases(self, role, user, actors, prefix):
+        visible = _visible_ticket_qs(user)
+        ticket = visible.exclude(status="CLOSED").first() or visible.first()
+        if ticket is None:
+            raise CommandError(f"{role} user {user.username} sees no tickets.")
+        comment = Comment.objects.filter(ticket=ticket).order_by("pk").first()
+        category = Category.objects.order_by("pk").first()
+        technician = actors["TECHNICIAN"][0]
+        bulk_ids = list(visible.exclude(status="CLOSED").values_list("pk", flat=True)[:20])
+        other_user = (
+            get_user_model().objects.filter(username__startswith=f"{prefix}_user_")
+            .exclude(pk=user.pk)
+            .order_by("-pk")
+            .first()
+        )
+        due = (timezone.now() + timedelta(days=7)).date().isoformat()
+        t = ticket.pk
+
+        cases = [
+            Case("health", "get", "/api/health/"),
+            Case("auth me", "get", "/api/auth/me/"),
+            Case("auth logout", "post", "/api/auth/logout/", write=True),
+            Case("user list", "get", "/api/users/"),
+            Case("user create", "post", "/api/users/", {
+                "username": "bench_new_user", "email": "bench_new_user@example.com",
+                "password": "bench12345", "role": "USER",
+            }, write=True, slow=True),
+            Case("technician list", "get", "/api/users/technicians/"),
+            Case("ticket list (full)", "get", "/api/tickets/?page_size=all", slow=True),
+            Case("ticket list (page)", "get", "/api/tickets/?page_size=50"),
+            Case("ticket list (page, count)", "get", "/api/tickets/?page_size=50&with_count=1"),
+            Case("ticket list (filtered)", "get", "/api/tickets/?status=OPEN&priority=HIGH&page_size=50"),
+            Case("ticket list (search)", "get", "/api/tickets/?search=vpn&page_size=50"),
+            Case("ticket create", "post", "/api/tickets/", {
+                "title": "Benchmark ticket", "description": "Created by the API benchmark.",
+                "priority": "MEDIUM", "category": category.pk if category else None, "due_date": due,
+            }, write=True),
+            Case("ticket detail", "get", f"/api/tickets/{t}/"),
+            Case("ticket update", "patch", f"/api/tickets/{t}/", {"title": "Benchmark title"}, write=True),
+            Case("ticket delete", "delete", f"/api/tickets/{t}/", write=True),
+            Case("ticket status", "patch", f"/api/tickets/{t}/status/", {"status": "IN_PROGRESS"}, write=True),
+            Case("ticket status history", "get", f"/api/tickets/{t}/status-history/"),
+            Case("ticket assign", "patch", f"/api/tickets/{t}/assign/", {"assigned_to": technician.pk}, write=True),
+            Case("ticket stats", "get", "/api/tickets/stats/"),
+            Case("ticket at-risk", "get", "/api/tickets/at-risk/"),
+            Case("ticket at-risk (breached)", "get", "/api/tickets/at-risk/?breached=true&within=1440"),
+            Case("ticket export (csv)", "get", "/api/tickets/export/?format=csv", slow=True),
+            Case("ticket export (ndjson)", "get", "/api/tickets/export/?format=ndjson", slow=True),
+            Case("ticket bulk update", "post", "/api/tickets/bulk/", {
+                "ids": bulk_ids or [t], "priority": "HIGH",
+            }, write=True),
+            Case("category list", "get", "/api/categories/"),
+            Case("category create", "post", "/api/categories/", {"name": "Benchmark category"}, write=True),
+            Case("comment list", "get", f"/api/tickets/{t}/comments/"),
+            Case("comment create", "post", f"/api/tickets/{t}/comments/", {"message": "Benchmark comment"}, write=True),
+            Case("metrics", "get", "/api/metrics/"),
+            Case("event stream (first event)", "get", "/api/events/", stream=True),
+        ]
+        if other_user is not None:
+            cases += [
+                Case("user detail", "get", f"/api/users/{other_user.pk}/"),
+                Case("user update", "patch", f"/api/users/{other_user.pk}/", {"is_active": True}, write=True),
+                Case("user delete", "delete", f"/api/users/{other_user.pk}/", write=True),
+            ]
+        if category is not None:
+            cases += [
+                Case("category detail", "get", f"/api/categories/{category.pk}/"),
+                Case("category update", "patch", f"/api/categories/{category.pk}/", {"description": "x"}, write=True),
+                Case("category delete", "delete", f"/api/categories/{category.pk}/", write=True),
+            ]
+        if comment is not None:
+            cases += [
+                Case("comment detail", "get", f"/api/comments/{comment.pk}/"),
+                Case("comment update", "patch", f"/api/comments/{comment.pk}/", {"message": "Edited"}, write=True),
+                Case("comment delete", "delete", f"/api/comments/{comment.pk}/", write=True),
+            ]
+        return cases
+
+    def _unmeasured_routes(self, cases):
+        """Names of /api/ routes no case reaches (new endpoints need a case here)."""
+
+        measured = {resolve(case.path.partition("?")[0]).url_name for case in cases}
+        return sorted(
+            pattern.name for pattern in api_urls.urlpatterns if pattern.name not in measured
+        )
+
+    # ---- measuring ----
+
+    async def _first_event(self, path, authorization):
+        """GET an event stream like a browser would, disconnect after the first body chunk."""
+
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"localhost"), (b"authorization", authorization.encode())],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        result = {"status": None}
+        received = asyncio.Event()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await received.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                result["status"] = message["status"]
+            elif message["type"] == "http.response.body" and (
+                message.get("body") or not message.get("more_body", False)
+            ):
+                received.set()
+
+        await self.asgi_app(scope, receive, send)
+        return result["status"]
+
+    def _call(self, client, case):
+        if case.stream:
+            return async_to_sync(self._first_event)(case.path, client.defaults["HTTP_AUTHORIZATION"])
+
+        kwargs = {}
+        if case.body is not None:
+            kwargs = {"data": json.dumps(case.body), "content_type": "application/json"}
+
+        def run():
+            response = getattr(client, case.method)(case.path, **kwargs)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+            return response.status_code
+
+        if not case.write:
+            return run()
+        with transaction.atomic():
+            status = run()
+            transaction.set_rollback(True)
+        return status
+
+    def _measure(self, client, case, iterations, warmup):
+        for _ in range(warmup):
+            self._call(client, case)
+
+        # one probe call for query count and memory (tracing would distort timings)
+        queries = _QueryCounter()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            with connection.execute_wrapper(queries):
+                status = self._call(client, case)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            self._call(client, case)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+
+        return {
+            "status": status,
+            "iterations": iterations,
+            "queries": queries.count,
+            "peak_kib": round((peak - before) / 1024, 1),
+            "p50_ms": round(_percentile(timings, 50), 3),
+            "p95_ms": round(_percentile(timings, 95), 3),
+            "p99_ms": round(_percentile(timings, 99), 3),
+            "max_ms": round(timings[-1], 3),
+        }
+
+    def _run(self, options):
+        actors = self._actors(options["prefix"])
+        results = {}
+
+        # (django.setup() again: configures logging, so before the level below)
+        self.asgi_app = get_asgi_application()
+        # expected 403/404 answers would otherwise log one warning per call
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+
+        anonymous = Client(SERVER_NAME="localhost")
+        login = self._login_case(actors, options["password"])
+        results[f"ANONYMOUS {login.name}"] = self._measure(
+            anonymous, login, options["slow_iterations"], warmup=0
+        )
+        all_cases = [login]
+
+        for role in ROLES:
+            user, token_key = actors[role]
+            client = Client(SERVER_NAME="localhost", HTTP_AUTHORIZATION=f"Token {token_key}")
+            cases = self._cases(role, user, actors, options["prefix"])
+            all_cases.extend(cases)
+            for case in cases:
+                if options["only"] and options["only"] not in case.name:
+                    continue
+                iterations = options["slow_iterations"] if case.slow else options["iterations"]
+                warmup = 0 if case.slow else options["warmup"]
+                result = self._measure(client, case, max(1, iterations), warmup)
+                result["endpoint"] = f"{case.method.upper()} {case.path}"
+                results[f"{role} {case.name}"] = result
+                self.stdout.write(
+                    f"  {role:<10} {case.name:<28} {result['status']}  "
+                    f"p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+                    f"{result['queries']:3d} queries  {result['peak_kib']:9.1f} KiB"
+                )
+        for name in self._unmeasured_routes(all_cases):
+            self.stdout.write(self.style.WARNING(f"No benchmark case for route '{name}'"))
+        return results
+
+    # ---- baseline comparison ----
+
+    def _compare(self, report, baseline, threshold):
+        regressions = []
+        for key, current in report["results"].items():
+            previous = baseline["results"].get(key)
+            if previous is None:
+                continue
+            if current["status"] != previous["status"]:
+                regressions.append(f"{key}: status {previous['status']} -> {current['status']}")
+            if current["queries"] > previous["queries"]:
+                regressions.append(f"{key}: queries {previous['queries']} -> {current['queries']}")
+            for metric, noise_floor in COMPARED_METRICS.items():
+                old, new = previous[metric], current[metric]
+                if new > old * (1 + threshold) and new - old > noise_floor:
+                    regressions.append(f"{key}: {metric} {old} -> {new} (+{(new / old - 1) * 100 if old else 100:.0f}%)")
+
+        missing = sorted(set(baseline["results"]) - set(report["results"]))
+        for key in missing:
+            self.stdout.write(self.style.WARNING(f"Not measured (present in baseline): {key}"))
+        if baseline.get("dataset") != report["dataset"]:
+            self.stdout.write(self.style.WARNING(
+                f"Dataset differs from baseline: {baseline.get('dataset')} vs {report['dataset']}"
+            ))
+        return regressions
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            baseline_path = Path(options["baseline"])
+            if not baseline_path.exists():
+                raise CommandError(f"Baseline not found: {baseline_path}")
+            baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+
+        self._ensure_dataset(options)
+        started = time.monotonic()
+        results = self._run(options)
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+            },
+            "dataset": {
+                "users": get_user_model().objects.count(),
+                "tickets": Ticket.objects.count(),
+                "comments": Comment.objects.count(),
+            },
+            "iterations": options["iterations"],
+            "slow_iterations": options["slow_iterations"],
+            "results": results,
+        }
+        Path(options["output"]).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        self.stdout.write(
+            f"{len(results)} measurements in {time.monotonic() - started:.1f}s, report: {options['output']}"
+        )
+
+        if baseline is None:
+            return
+        regressions = self._compare(report, baseline, options["threshold"])
+        if regressions:
+            for line in regressions:
+                self.stdout.write(self.style.ERROR(f"REGRESSION {line}"))
+            raise CommandError(f"{len(regressions)} regression(s) against {options['baseline']}.")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
@@ -0,0 +1,231 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from backend.tickets.permissions import get_user_role
+from backend.tickets.views import _visible_ticket_qs
+
+from .benchmark_api import ROLES, _percentile
+
+MODES = ("sync", "async")
+
+
+class Command(BaseCommand):
+    help = (
+        "Load the read endpoints (ticket list / detail, comment list, stats, health) with "
+        "many simultaneous clients through the ASGI application, once with the native "
+        "async views and once with the sync DRF views (ASYNC_READ_VIEWS), and compare "
+        "throughput, latency percentiles and worker threads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--clients",
+            default="1,10,50,200",
+            help="Comma-separated numbers of simultaneous clients (default 1,10,50,200).",
+        )
+        parser.add_argument("--requests", type=int, default=20, help="Requests per client per run.")
+        parser.add_argument(
+            "--users-per-role", type=int, default=10, help="Distinct users (tokens) per role."
+        )
+        parser.add_argument("--prefix", default="load", help="Username prefix used by generate_load_data.")
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    # ---- actors ----
+
+    def _actors(self, prefix, per_role):
+        """[(role, token key, [paths])] for up to ``per_role`` generated users per role."""
+
+        User = get_user_model()
+        actors = []
+        for role in ROLES:
+            users = User.objects.filter(
+                username__startswith=f"{prefix}_{role.lower()}_", is_active=True
+            ).order_by("pk")[:per_role]
+            for user in users:
+                if get_user_role(user) != role:
+                    continue
+                ticket_id = _visible_ticket_qs(user).values_list("pk", flat=True).first()
+                if ticket_id is None:
+                    continue
+                token, _ = Token.objects.get_or_create(user=user)
+                actors.append((role, token.key, self._paths(role, ticket_id)))
+        if not actors:
+            raise CommandError(
+                f"No generated users with prefix '{prefix}_'. Run generate_load_data first."
+            )
+        return actors
+
+    def _paths(self, role, ticket_id):
+        paths = [
+            "/api/tickets/?page_size=50",
+            f"/api/tickets/{ticket_id}/",
+            f"/api/tickets/{ticket_id}/comments/",
+            "/api/health/",
+        ]
+        if role != "USER":
+            paths.append("/api/tickets/stats/")
+        return paths
+
+    # ---- ASGI client ----
+
+    async def _get(self, app, path, token):
+        """One GET through the ASGI app, like a server would send it: (status, body bytes)."""
+
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", b"localhost"),
+                (b"authorization", f"Token {token}".encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        result = {"status": None, "size": 0}
+        finished = asyncio.Event()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                result["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                result["size"] += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    finished.set()
+
+        await app(scope, receive, send)
+        finished.set()
+        return result["status"], result["size"]
+
+    async def _client(self, app, token, paths, requests, latencies, failures):
+        for path in itertools.islice(itertools.cycle(paths), requests):
+            started = time.perf_counter()
+            status, _size = await self._get(app, path, token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                failures.append(f"{status} {path}")
+
+    async def _sample_threads(self, peak, stop):
+        while not stop.is_set():
+            peak[0] = max(peak[0], threading.active_count())
+            try:
+                await asyncio.wait_for(stop.wait(), 0.005)
+            except TimeoutError:
+                pass
+
+    async def _round(self, app, actors, clients, requests):
+        latencies, failures = [], []
+        peak_threads = [threading.active_count()]
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(self._sample_threads(peak_threads, stop))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            self._client(app, token, paths, requests, latencies, failures)
+            for (_role, token, paths) in itertools.islice(itertools.cycle(actors), clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await sampler
+        latencies.sort()
+        return {
+            "clients": clients,
+            "requests": len(latencies),
+            "failed": len(failures),
+            "seconds": round(elapsed, 3),
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(_percentile(latencies, 50), 2),
+            "p95_ms": round(_percentile(latencies, 95), 2),
+            "p99_ms": round(_percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "peak_threads": peak_threads[0],
+            "sample_failures": sorted(set(failures))[:5],
+        }
+
+    async def _run(self, levels, actors, requests):
+        app = get_asgi_application()
+        results = []
+        for mode in MODES:
+            with override_settings(ASYNC_READ_VIEWS=mode == "async"):
+                # warm caches (token snapshots, roles, SQLite pages) before timing
+                await self._round(app, actors, len(actors), len(actors[0][2]))
+
+        for clients in levels:
+            for mode in MODES:
+                with override_settings(ASYNC_READ_VIEWS=mode == "async"):
+                    result = await self._round(app, actors, clients, requests)
+                result["mode"] = mode
+                results.append(result)
+                self.stdout.write(
+                    f"  {clients:5d} clients  {mode:<5}  {result['rps']:8.1f} req/s  "
+                    f"p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+                    f"p99 {result['p99_ms']:8.2f}ms  threads {result['peak_threads']:4d}  "
+                    f"failed {result['failed']}"
+                )
+                for failure in result["sample_failures"]:
+                    self.stdout.write(self.style.WARNING(f"      {failure}"))
+        return results
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(part) for part in options["clients"].split(",") if part.strip()]
+        except ValueError:
+            raise CommandError("--clients must be a comma-separated list of integers.")
+        if not levels or min(levels) < 1 or options["requests"] < 1:
+            raise CommandError("--clients and --requests must be positive.")
+
+        actors = self._actors(options["prefix"], options["users_per_role"])
+        logging.getLogger("django.request").setLevel(logging.ERROR)
+
+        self.stdout.write(
+            f"{len(actors)} users, {options['requests']} requests per client, "
+            f"database: {connection.vendor}"
+        )
+        results = asyncio.run(self._run(levels, actors, options["requests"]))
+
+        for clients in levels:
+            by_mode = {r["mode"]: r for r in results if r["clients"] == clients}
+            speedup = by_mode["async"]["rps"] / by_mode["sync"]["rps"] if by_mode["sync"]["rps"] else 0
+            self.stdout.write(f"  {clients:5d} clients: async / sync throughput x{speedup:.2f}")
+
+        if options["output"]:
+            report = {
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "users": len(actors),
+                "requests_per_client": options["requests"],
+                "results": results,
+            }
+            path = Path(options["output"])
+            path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Report: {path}"))
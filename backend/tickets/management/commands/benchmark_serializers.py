@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.tickets.models import Ticket
+from backend.tickets.representation import render_tickets, ticket_rows
+from backend.tickets.serializers import TicketSerializer
+
+
+def _timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return result, statistics.median(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ticket list rendering throughput: TicketSerializer on model instances "
+        "vs. the values_list read path (representation.render_tickets). "
+        "Both timings include the database fetch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1000, 10000],
+            help="Row counts to benchmark (default: 1000 10000).",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (median is reported).")
+
+    def handle(self, *args, **options):
+        base_qs = Ticket.objects.select_related("created_by", "assigned_to", "category").order_by(
+            "-created_at", "-id"
+        )
+        available = base_qs.count()
+        repeat = max(1, options["repeat"])
+
+        for size in options["rows"]:
+            if size > available:
+                raise CommandError(
+                    f"Only {available} tickets in the database, need {size} (see generate_load_data)."
+                )
+            qs = base_qs[:size]
+
+            serialized, slow = _timed(lambda: TicketSerializer(list(qs), many=True).data, repeat)
+            rendered, fast = _timed(lambda: render_tickets(ticket_rows(base_qs)[:size]), repeat)
+
+            if [dict(item) for item in serialized] != rendered:
+                raise CommandError(f"Read path output differs from TicketSerializer at {size} rows.")
+
+            self.stdout.write(
+                f"{size:>7} rows  TicketSerializer {slow * 1000:8.1f} ms ({size / slow:9.0f} rows/s)   "
+                f"read path {fast * 1000:8.1f} ms ({size / fast:9.0f} rows/s)   x{slow / fast:.1f}"
+            )
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from backend.tickets.management.utils import missing_triggers
+from backend.tickets.permissions import get_user_role
+from backend.tickets.query_plans import ROLES, global_cases, plan_problems, role_cases
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN QUERY PLAN on the ticket/comment querysets used by the API against the "
+        "current database and fail on full table scans and on list pages that sort instead of "
+        "reading an index in order (same checks as the test suite, on real data); also fails when "
+        "the search index / stats rollup / comment counter triggers are missing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run ANALYZE first so the planner uses real table statistics.",
+        )
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan.")
+
+    def _role_users(self):
+        User = get_user_model()
+        found = {}
+        for user in User.objects.filter(is_active=True).order_by("pk")[:500]:
+            found.setdefault(get_user_role(user), user)
+            if len(found) == len(ROLES):
+                break
+        return found
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("check_query_plans understands SQLite plans only.")
+
+        missing = missing_triggers(connection)
+        if missing:
+            raise CommandError(
+                f"Missing triggers: {', '.join(missing)}. The search index, stats rollup or comment "
+                "counters are not maintained; run rebuild_search_index, reconcile_ticket_stats "
+                "and reconcile_comment_counters."
+            )
+
+        users = self._role_users()
+        missing = [role for role in ROLES if role not in users]
+        if missing:
+            raise CommandError(
+                f"No active {', '.join(missing)} user in the database; the plans of every role "
+                "are checked (seed_demo_data or generate_load_data creates them)."
+            )
+
+        if options["analyze"]:
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        cases = [(None, case) for case in global_cases()]
+        for role in ROLES:
+            cases.extend((role, case) for case in role_cases(role, users[role]))
+
+        failures = []
+        for role, case in cases:
+            title = f"[{role}] {case.label}" if role else case.label
+            if options["verbose_plans"]:
+                self.stdout.write(f"{title}\n{case.queryset.explain()}\n")
+            problems = plan_problems(case)
+            if problems:
+                failures.append((title, problems))
+
+        if failures:
+            for title, problems in failures:
+                self.stdout.write(self.style.ERROR(f"BAD PLAN: {title}"))
+                for line in problems:
+                    self.stdout.write(f"    {line}")
+            raise CommandError(f"{len(failures)} of {len(cases)} query plans need a full scan or a sort.")
+
+        self.stdout.write(self.style.SUCCESS(f"{len(cases)} query plans checked, no full scans or sorted pages."))
@@ -0,0 +1,97 @@
+import gzip
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = {
+    ".js", ".mjs", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml", ".wasm", ".ico",
+}
+VARIANT_SUFFIXES = (".gz", ".br")
+
+
+def _gzip(data: bytes) -> bytes:
+    # mtime=0: the same input always gives the same bytes
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write .gz (and .br when the brotli package is installed) next to every compressible "
+        "file in FRONTEND_DIST_DIR, for backend.spa.static_asset. Run after `npm run build`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-size", type=int, default=512, help="Skip files smaller than this (bytes)."
+        )
+        parser.add_argument(
+            "--force", action="store_true", help="Recompress even if a variant is up to date."
+        )
+
+    def handle(self, *args, **options):
+        dist_dir = getattr(settings, "FRONTEND_DIST_DIR", None)
+        if not dist_dir or not Path(dist_dir).is_dir():
+            raise CommandError(f"FRONTEND_DIST_DIR not found: {dist_dir}")
+
+        compressors = [(".gz", _gzip)]
+        if brotli is not None:
+            compressors.append((".br", _brotli))
+        else:
+            self.stdout.write(self.style.WARNING("brotli not installed: writing .gz only."))
+
+        started = time.monotonic()
+        written = skipped = 0
+        original_total = compressed_total = 0
+        for path in sorted(Path(dist_dir).rglob("*")):
+            if not path.is_file() or path.suffix in VARIANT_SUFFIXES:
+                continue
+            if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+                continue
+            source_stat = path.stat()
+            if source_stat.st_size < options["min_size"]:
+                continue
+
+            data = None
+            for suffix, compress in compressors:
+                target = path.with_name(path.name + suffix)
+                if (
+                    not options["force"]
+                    and target.exists()
+                    and target.stat().st_mtime_ns >= source_stat.st_mtime_ns
+                ):
+                    skipped += 1
+                    continue
+                if data is None:
+                    data = path.read_bytes()
+                compressed = compress(data)
+                if len(compressed) >= len(data):
+                    # no gain: drop a stale variant so the original is served
+                    target.unlink(missing_ok=True)
+                    continue
+                tmp = target.with_name(target.name + ".tmp")
+                tmp.write_bytes(compressed)
+                os.replace(tmp, target)
+                written += 1
+                original_total += len(data)
+                compressed_total += len(compressed)
+                self.stdout.write(
+                    f"  {target.relative_to(dist_dir)}  {len(data):>9} -> {len(compressed):>9} bytes"
+                )
+
+        ratio = compressed_total / original_total * 100 if original_total else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Done in {time.monotonic() - started:.1f}s: {written} written "
+            f"({ratio:.0f}% of original size), {skipped} up to date."
+        ))
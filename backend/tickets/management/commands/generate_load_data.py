@@ -0,0 +1,263 @@
+import random
+import time
+from array import array
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from backend.tickets.management.utils import deferred_index_maintenance, preserve_timestamps
+from backend.tickets.models import Category, Ticket, Comment
+from backend.tickets.sla import backfill_sla
+
+CATEGORIES = [
+    # (name, description, weight)
+    ("Network", "Issues related to VPN, Wi-Fi, LAN, connectivity.", 25),
+    ("Accounts & Access", "Password resets, locked accounts, permissions.", 30),
+    ("Hardware", "Laptops, printers, monitors and other devices.", 20),
+    ("Security", "Incidents, alerts, suspicious activity.", 5),
+    ("Devices", "Mobile devices, peripherals.", 10),
+    ("Administration", "Onboarding, offboarding, general IT requests.", 10),
+]
+STATUS_WEIGHTS = [("OPEN", 25), ("IN_PROGRESS", 20), ("RESOLVED", 25), ("CLOSED", 30)]
+PRIORITY_WEIGHTS = [("LOW", 30), ("MEDIUM", 45), ("HIGH", 20), ("CRITICAL", 5)]
+ROLE_SHARE = {"ADMIN": 0.03, "TECHNICIAN": 0.12}
+
+SUBJECTS = ["VPN", "Printer", "Laptop", "Password", "E-mail", "Wi-Fi", "Monitor", "Account", "Phone", "Badge"]
+PROBLEMS = ["not working", "very slow", "needs reset", "shows an error", "cannot connect", "keeps crashing"]
+SENTENCES = [
+    "The issue started this morning after the update.",
+    "It happens on every attempt, restarting did not help.",
+    "Several people in my team see the same problem.",
+    "Please check this as soon as possible, it blocks my work.",
+    "I attached the error message from the application log.",
+    "The device was working fine until yesterday.",
+]
+COMMENTS_PUBLIC = ["Any update on this?", "It works again, thanks!", "Still broken for me.", "I will be available after 2 PM."]
+COMMENTS_INTERNAL = ["Checked logs, looks like a driver issue.", "Escalated to the network team.", "Waiting for vendor response.", "Known issue, workaround applied."]
+
+
+def _weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return lambda: rng.choices(values, weights)[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large, reproducible synthetic dataset (users, tickets, comments) "
+        "for load tests and benchmarks. All inserts use bulk operations."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--tickets", type=int, default=100_000)
+        parser.add_argument("--comments", type=int, default=200_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--prefix", default="load", help="Username prefix of generated users")
+        parser.add_argument("--password", default="load1234", help="Password of every generated user")
+        parser.add_argument(
+            "--anchor",
+            help="Reference date YYYY-MM-DD (tickets are spread over the year before it). "
+            "Default: today. Fix it for byte-identical datasets.",
+        )
+        parser.add_argument(
+            "--keep-triggers",
+            action="store_true",
+            help=(
+                "Maintain search index / stats rollup / comment counters row by row "
+                "instead of rebuilding at the end."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Users with prefix '{prefix}_' already exist, use another --prefix.")
+
+        self.rng = random.Random(options["seed"])
+        self.batch_size = max(1, options["batch_size"])
+        if options["anchor"]:
+            anchor_day = datetime.strptime(options["anchor"], "%Y-%m-%d")
+            self.anchor = timezone.make_aware(anchor_day)
+        else:
+            self.anchor = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if connection.vendor == "sqlite":
+            with connection.cursor() as cursor:
+                # synthetic data: durability of each batch does not matter
+                cursor.execute("PRAGMA synchronous = OFF")
+
+        started = time.monotonic()
+        if options["keep_triggers"]:
+            self._generate(options)
+        else:
+            with deferred_index_maintenance(connection, self.stdout):
+                self._generate(options)
+
+        self.stdout.write(self.style.SUCCESS(f"Done in {time.monotonic() - started:.1f}s."))
+
+    def _generate(self, options):
+        with preserve_timestamps(Ticket, Comment):
+            staff = self._create_users(options)
+            categories = self._create_categories()
+            tickets = self._create_tickets(options["tickets"], staff, categories)
+            self._create_comments(options["comments"], tickets, staff)
+
+    # ---- users ----
+
+    def _create_users(self, options):
+        User = get_user_model()
+        count = max(3, options["users"])
+        n_admin = max(1, round(count * ROLE_SHARE["ADMIN"]))
+        n_tech = max(1, round(count * ROLE_SHARE["TECHNICIAN"]))
+        roles = ["ADMIN"] * n_admin + ["TECHNICIAN"] * n_tech + ["USER"] * (count - n_admin - n_tech)
+
+        password = make_password(options["password"])  # hash once, reuse for everyone
+        prefix = options["prefix"]
+        users = [
+            User(
+                username=f"{prefix}_{role.lower()}_{i:07d}",
+                email=f"{prefix}_{i:07d}@example.com",
+                password=password,
+                is_staff=role == "ADMIN",
+                date_joined=self.anchor - timedelta(days=400),
+            )
+            for i, role in enumerate(roles)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=self.batch_size)
+            groups = {
+                name: Group.objects.get_or_create(name=name)[0] for name in ("ADMIN", "TECHNICIAN")
+            }
+            Membership = User.groups.through
+            Membership.objects.bulk_create(
+                [
+                    Membership(user_id=user.pk, group_id=groups[role].pk)
+                    for user, role in zip(users, roles)
+                    if role in groups
+                ],
+                batch_size=self.batch_size,
+            )
+
+        self.requester_ids = [user.pk for user, role in zip(users, roles) if role == "USER"]
+        staff = [user.pk for user, role in zip(users, roles) if role != "USER"]
+        self.stdout.write(f"Users: {n_admin} admin, {n_tech} technician, {len(self.requester_ids)} user")
+        return staff
+
+    def _create_categories(self):
+        ids = []
+        for name, description, weight in CATEGORIES:
+            category, _ = Category.objects.get_or_create(name=name, defaults={"description": description})
+            ids.append((category.pk, weight))
+        return ids
+
+    # ---- tickets ----
+
+    def _create_tickets(self, count, staff, categories):
+        rng = self.rng
+        pick_status = _weighted(rng, STATUS_WEIGHTS)
+        pick_priority = _weighted(rng, PRIORITY_WEIGHTS)
+        pick_category = _weighted(rng, categories)
+        # Skewed workload: a few technicians get most tickets (Zipf-like weights)
+        staff_weights = [1.0 / (rank + 1) ** 1.1 for rank in range(len(staff))]
+
+        # compact per-ticket columns (ids, creator, assignee, created) for comment generation
+        ticket_ids = array("q")
+        created_by = array("q")
+        assigned_to = array("q")
+        created_ts = array("d")
+        done = 0
+        started = time.monotonic()
+
+        while done < count:
+            batch = []
+            for _ in range(min(self.batch_size, count - done)):
+                status = pick_status()
+                created = self.anchor - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+                assignee = None
+                if status != "OPEN" or rng.random() < 0.4:
+                    assignee = rng.choices(staff, staff_weights)[0]
+                due_date = None
+                if rng.random() < 0.6:
+                    due_date = (created + timedelta(days=rng.randint(1, 21))).date()
+                updated = created
+                if status != "OPEN":
+                    updated = min(self.anchor, created + timedelta(hours=rng.randint(1, 240)))
+
+                batch.append(
+                    Ticket(
+                        title=f"{rng.choice(SUBJECTS)} {rng.choice(PROBLEMS)}",
+                        description=" ".join(rng.sample(SENTENCES, k=rng.randint(1, 3))),
+                        status=status,
+                        priority=pick_priority(),
+                        created_by_id=rng.choice(self.requester_ids),
+                        assigned_to_id=assignee,
+                        category_id=pick_category() if rng.random() < 0.9 else None,
+                        due_date=due_date,
+                        created_at=created,
+                        updated_at=updated,
+                    )
+                )
+
+            with transaction.atomic():
+                Ticket.objects.bulk_create(batch, batch_size=self.batch_size)
+                backfill_sla(Ticket.objects.filter(pk__in=[ticket.pk for ticket in batch]))
+            for ticket in batch:
+                ticket_ids.append(ticket.pk)
+                created_by.append(ticket.created_by_id)
+                assigned_to.append(ticket.assigned_to_id or 0)
+                created_ts.append(ticket.created_at.timestamp())
+            done += len(batch)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f"  tickets: {done}/{count} ({done / elapsed:.0f}/s)")
+
+        return ticket_ids, created_by, assigned_to, created_ts
+
+    # ---- comments ----
+
+    def _create_comments(self, count, tickets, staff):
+        ticket_ids, created_by, assigned_to, created_ts = tickets
+        if not count or not ticket_ids:
+            return
+        rng = self.rng
+        done = 0
+        started = time.monotonic()
+        n_tickets = len(ticket_ids)
+
+        while done < count:
+            batch = []
+            for _ in range(min(self.batch_size, count - done)):
+                index = rng.randrange(n_tickets)
+                internal = rng.random() < 0.3
+                if internal:
+                    author = assigned_to[index] or rng.choice(staff)
+                    message = rng.choice(COMMENTS_INTERNAL)
+                else:
+                    author = created_by[index] if rng.random() < 0.6 else (assigned_to[index] or created_by[index])
+                    message = rng.choice(COMMENTS_PUBLIC)
+                created = datetime.fromtimestamp(
+                    created_ts[index] + rng.randint(60, 14 * 24 * 3600), tz=self.anchor.tzinfo
+                )
+                created = min(created, self.anchor)
+                batch.append(
+                    Comment(
+                        ticket_id=ticket_ids[index],
+                        author_id=author,
+                        message=message,
+                        visibility=Comment.VISIBILITY_INTERNAL if internal else Comment.VISIBILITY_PUBLIC,
+                        created_at=created,
+                        updated_at=created,
+                    )
+                )
+
+            with transaction.atomic():
+                Comment.objects.bulk_create(batch, batch_size=self.batch_size)
+            done += len(batch)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f"  comments: {done}/{count} ({done / elapsed:.0f}/s)")
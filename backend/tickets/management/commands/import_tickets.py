@@ -0,0 +1,215 @@
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from backend.tickets.management.utils import preserve_timestamps
+from backend.tickets.models import Category, Ticket, Comment, ImportCheckpoint
+from backend.tickets.sla import backfill_sla
+
+STATUSES = {key for key, _ in Ticket.STATUS_CHOICES}
+PRIORITIES = {key for key, _ in Ticket.PRIORITY_CHOICES}
+VISIBILITIES = {key for key, _ in Comment.VISIBILITY_CHOICES}
+
+
+def _parse_dt(value, default):
+    if not value:
+        return default
+    parsed = parse_datetime(str(value))
+    if parsed is None:
+        raise ValueError(f"invalid datetime {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tickets (and comments) from CSV or JSONL in bulk_create batches. "
+        "Resumable: the last imported row is stored in the database with every batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file (.csv or .jsonl)")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Default: from file extension")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint name (default: absolute path of the input file)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore an existing checkpoint and start from the first row.",
+        )
+        parser.add_argument(
+            "--default-user",
+            help="Username used when created_by is unknown (otherwise the row is skipped).",
+        )
+
+    # ---- input ----
+
+    def _records(self, path: Path, fmt: str):
+        """Yield (row_number, raw row) streaming the input file (parsed later)."""
+
+        with path.open(encoding="utf-8", newline="") as fh:
+            if fmt == "csv":
+                yield from enumerate(csv.DictReader(fh), start=1)
+            else:
+                yield from enumerate(fh, start=1)
+
+    # ---- lookups ----
+
+    def _load_maps(self):
+        User = get_user_model()
+        self.users = {}
+        for pk, username, email in User.objects.values_list("id", "username", "email").iterator():
+            self.users[username] = pk
+            if email:
+                self.users.setdefault(email.lower(), pk)
+        self.categories = dict(Category.objects.values_list("name", "id"))
+
+    def _user_id(self, value):
+        if value in (None, ""):
+            return None
+        value = str(value)
+        return self.users.get(value) or self.users.get(value.lower())
+
+    def _category_id(self, name):
+        if not name:
+            return None
+        if name not in self.categories:
+            self.categories[name] = Category.objects.create(name=name).pk
+        return self.categories[name]
+
+    # ---- row mapping ----
+
+    def _build(self, record, now):
+        created_by = self._user_id(record.get("created_by")) or self.default_user_id
+        if created_by is None:
+            raise ValueError(f"unknown created_by {record.get('created_by')!r}")
+
+        created_at = _parse_dt(record.get("created_at"), now)
+        ticket = Ticket(
+            title=(record.get("title") or "").strip()[:200] or "(no title)",
+            description=record.get("description") or "",
+            status=record.get("status") if record.get("status") in STATUSES else "OPEN",
+            priority=record.get("priority") if record.get("priority") in PRIORITIES else "MEDIUM",
+            created_by_id=created_by,
+            assigned_to_id=self._user_id(record.get("assigned_to")),
+            category_id=self._category_id(record.get("category")),
+            due_date=parse_date(record["due_date"]) if record.get("due_date") else None,
+            created_at=created_at,
+            updated_at=_parse_dt(record.get("updated_at"), created_at),
+        )
+
+        comments = []
+        for item in record.get("comments") or []:
+            author = self._user_id(item.get("author")) or created_by
+            comment_created = _parse_dt(item.get("created_at"), created_at)
+            visibility = item.get("visibility")
+            comments.append(
+                Comment(
+                    author_id=author,
+                    message=item.get("message") or "",
+                    visibility=visibility if visibility in VISIBILITIES else Comment.VISIBILITY_PUBLIC,
+                    created_at=comment_created,
+                    updated_at=comment_created,
+                )
+            )
+        return ticket, comments
+
+    # ---- main ----
+
+    def _flush(self, batch, last_row, source: str):
+        tickets = [ticket for ticket, _ in batch]
+        with transaction.atomic():
+            Ticket.objects.bulk_create(tickets, batch_size=self.batch_size)
+            backfill_sla(Ticket.objects.filter(pk__in=[ticket.pk for ticket in tickets]))
+            comments = []
+            for ticket, ticket_comments in batch:
+                for comment in ticket_comments:
+                    comment.ticket_id = ticket.pk
+                    comments.append(comment)
+            Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+            # same transaction as the rows: a crash loses the batch and its
+            # offset together, the next run resumes right after the last commit
+            ImportCheckpoint.objects.update_or_create(source=source, defaults={"last_row": last_row})
+        return len(tickets), len(comments)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        fmt = options["format"] or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+        if fmt == "csv":
+            self.stdout.write("CSV input: comments are only imported from JSONL.")
+        self.batch_size = max(1, options["batch_size"])
+        source = options["checkpoint"] or str(path.resolve())
+
+        skip_rows = 0
+        if not options["restart"]:
+            checkpoint = ImportCheckpoint.objects.filter(source=source).first()
+            if checkpoint is not None:
+                skip_rows = checkpoint.last_row
+                self.stdout.write(f"Resuming after row {skip_rows} (checkpoint {source!r}).")
+
+        self._load_maps()
+        self.default_user_id = None
+        if options["default_user"]:
+            self.default_user_id = self._user_id(options["default_user"])
+            if self.default_user_id is None:
+                raise CommandError(f"Unknown --default-user {options['default_user']!r}")
+
+        started = time.monotonic()
+        now = timezone.now()
+        total_tickets = total_comments = errors = 0
+        batch = []
+        last_row = skip_rows
+
+        with preserve_timestamps(Ticket, Comment):
+            for number, record in self._records(path, fmt):
+                if number <= skip_rows:
+                    continue
+                last_row = number
+                try:
+                    if fmt == "jsonl":
+                        if not record.strip():
+                            continue
+                        record = json.loads(record)
+                    batch.append(self._build(record, now))
+                except (ValueError, TypeError, KeyError, AttributeError) as exc:
+                    errors += 1
+                    self.stderr.write(f"row {number}: {exc}")
+                    continue
+
+                if len(batch) >= self.batch_size:
+                    n_tickets, n_comments = self._flush(batch, last_row, source)
+                    total_tickets += n_tickets
+                    total_comments += n_comments
+                    batch = []
+                    elapsed = max(time.monotonic() - started, 1e-6)
+                    self.stdout.write(
+                        f"  row {last_row}: {total_tickets} tickets, {total_comments} comments "
+                        f"({total_tickets / elapsed:.0f} tickets/s)"
+                    )
+
+            if batch or last_row > skip_rows:
+                n_tickets, n_comments = self._flush(batch, last_row, source)
+                total_tickets += n_tickets
+                total_comments += n_comments
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {total_tickets} tickets and {total_comments} comments "
+                f"in {elapsed:.1f}s ({total_tickets / elapsed:.0f} tickets/s), {errors} row(s) skipped."
+            )
+        )
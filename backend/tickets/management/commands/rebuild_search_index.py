@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from backend.tickets.search import (
+    COMMENT_FTS_TABLE,
+    TICKET_FTS_TABLE,
+    ensure_search_schema,
+)
+
+INDEXES = [
+    # (fts table, source table, indexed columns)
+    (TICKET_FTS_TABLE, "tickets_ticket", ["title", "description"]),
+    (COMMENT_FTS_TABLE, "tickets_comment", ["message", "ticket_id", "visibility"]),
+]
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index (tickets + comments) from scratch in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            self.stdout.write("Full-text index is only used with SQLite, nothing to do.")
+            return
+
+        batch_size = max(1, options["batch_size"])
+        ensure_search_schema(connection)
+
+        for fts_table, source_table, columns in INDEXES:
+            started = time.monotonic()
+            cols = ", ".join(columns)
+            total = 0
+            last_id = 0
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('delete-all')")
+
+                while True:
+                    # each batch in its own short transaction, keyset over id
+                    with transaction.atomic():
+                        cursor.execute(
+                            f"SELECT MAX(id), COUNT(*) FROM ("
+                            f"SELECT id FROM {source_table} WHERE id > %s ORDER BY id LIMIT %s)",
+                            [last_id, batch_size],
+                        )
+                        max_id, count = cursor.fetchone()
+                        if not count:
+                            break
+                        cursor.execute(
+                            f"INSERT INTO {fts_table}(rowid, {cols}) "
+                            f"SELECT id, {cols} FROM {source_table} WHERE id > %s AND id <= %s",
+                            [last_id, max_id],
+                        )
+                    total += count
+                    last_id = max_id
+                    self.stdout.write(f"  {fts_table}: {total} rows indexed")
+
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('optimize')")
+
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                self.style.SUCCESS(f"{fts_table}: {total} rows in {elapsed:.1f}s")
+            )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from backend.tickets.counters import (
+    COUNTER_FIELDS,
+    comment_counter_drift,
+    ensure_comment_counter_triggers,
+    rebuild_comment_counters,
+)
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-ticket comment counters from comments and report any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drift, do not rewrite the counters.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            drift = comment_counter_drift()
+        else:
+            ensure_comment_counter_triggers(connection)
+            drift = rebuild_comment_counters()
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Comment counters are consistent."))
+            return
+
+        self.stdout.write(self.style.WARNING(f"Drift on {len(drift)} ticket(s):"))
+        for ticket_id, (stored, expected) in sorted(drift.items())[:50]:
+            changes = ", ".join(
+                f"{name}: {old} -> {new}"
+                for name, old, new in zip(COUNTER_FIELDS, stored, expected)
+                if old != new
+            )
+            self.stdout.write(f"  ticket {ticket_id}: {changes}")
+        if len(drift) > 50:
+            self.stdout.write(f"  ... and {len(drift) - 50} more")
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS("Counters rebuilt."))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from backend.tickets.stats import (
+    compute_expected_rollup,
+    ensure_stats_triggers,
+    rebuild_rollup,
+)
+from backend.tickets.models import TicketStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the TicketStats rollup from tickets and report any drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drift, do not rewrite the rollup.",
+        )
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            expected = compute_expected_rollup()
+            stored = {
+                (r.assignee_key, r.status, r.priority, r.category_key): r.ticket_count
+                for r in TicketStats.objects.all()
+            }
+            drift = {
+                key: (stored.get(key, 0), expected.get(key, 0))
+                for key in set(expected) | set(stored)
+                if stored.get(key, 0) != expected.get(key, 0)
+            }
+        else:
+            ensure_stats_triggers(connection)
+            drift = rebuild_rollup()
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("TicketStats rollup is consistent."))
+            return
+
+        self.stdout.write(self.style.WARNING(f"Drift in {len(drift)} rollup row(s):"))
+        for (assignee, status_val, priority, category), (stored_n, expected_n) in sorted(drift.items()):
+            self.stdout.write(
+                f"  assignee={assignee} status={status_val} priority={priority} "
+                f"category={category}: stored={stored_n} expected={expected_n}"
+            )
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS("Rollup rebuilt."))
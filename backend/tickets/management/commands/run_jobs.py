@@ -0,0 +1,123 @@
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from backend.tickets.jobs import (
+    claim_jobs,
+    finish_jobs,
+    lease_seconds,
+    purge_done,
+    requeue_dead,
+    run_job,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs (e-mail notifications about ticket changes). Claims batches of "
+        "ready jobs, runs them on a thread pool and records the results; failed jobs are "
+        "retried with exponential backoff and end up DEAD after JOB_MAX_ATTEMPTS. Runs until "
+        "interrupted (SIGINT / SIGTERM finish the current batch first) unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Jobs run in parallel.")
+        parser.add_argument(
+            "--batch-size", type=int, default=20, help="Jobs claimed per transaction."
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when no job is ready.",
+        )
+        parser.add_argument(
+            "--lease",
+            type=int,
+            default=None,
+            help="Seconds a claimed job is reserved for this worker (default: JOB_LEASE_SECONDS).",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit as soon as no job is ready."
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="Move DEAD jobs back to PENDING with fresh attempts, then exit.",
+        )
+        parser.add_argument(
+            "--purge-done",
+            type=int,
+            metavar="DAYS",
+            help="Delete DONE jobs finished more than DAYS days ago, then exit.",
+        )
+
+    def _stop(self, signum, frame):
+        self.stopping.set()
+
+    def _run(self, job):
+        try:
+            return job, *run_job(job)
+        finally:
+            # pool threads keep their own connections; drop them like a request would
+            close_old_connections()
+
+    def handle(self, *args, **options):
+        if options["requeue_dead"]:
+            count = requeue_dead()
+            self.stdout.write(self.style.SUCCESS(f"Requeued {count} dead job(s)."))
+            return
+        if options["purge_done"] is not None:
+            count = purge_done(timedelta(days=options["purge_done"]))
+            self.stdout.write(self.style.SUCCESS(f"Deleted {count} finished job(s)."))
+            return
+        if options["threads"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--threads and --batch-size must be positive.")
+
+        worker = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        lease = options["lease"] or lease_seconds()
+        self.stopping = threading.Event()
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        totals = {"done": 0, "retried": 0, "dead": 0}
+        self.stdout.write(f"Worker {worker}: {options['threads']} threads, lease {lease}s")
+        try:
+            with ThreadPoolExecutor(
+                max_workers=options["threads"], thread_name_prefix="job"
+            ) as pool:
+                while not self.stopping.is_set():
+                    jobs = claim_jobs(worker, options["batch_size"], lease)
+                    if not jobs:
+                        if options["once"]:
+                            break
+                        self.stopping.wait(options["poll_interval"])
+                        continue
+                    started = time.perf_counter()
+                    # a stop request lets the claimed batch finish
+                    outcomes = list(pool.map(self._run, jobs))
+                    counts = finish_jobs(worker, outcomes)
+                    for key, value in counts.items():
+                        totals[key] += value
+                    self.stdout.write(
+                        f"{len(jobs)} job(s) in {(time.perf_counter() - started) * 1000:.0f}ms: "
+                        f"{counts['done']} done, {counts['retried']} retried, {counts['dead']} dead"
+                    )
+                    for job, error, _ in outcomes:
+                        if error is not None:
+                            self.stdout.write(self.style.WARNING(f"  #{job.pk} {job.kind}: {error}"))
+        finally:
+            connections.close_all()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stopped: {totals['done']} done, {totals['retried']} retried, {totals['dead']} dead."
+            )
+        )
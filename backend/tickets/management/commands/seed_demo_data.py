@@ -4,6 +4,7 @@ from django.contrib.auth.models import Group
 from django.utils import timezone
 
 from backend.tickets.models import Category, Ticket, Comment
+from backend.tickets.sla import backfill_sla
 
 class Command(BaseCommand):
     help = "Seed demo data for tickets app"
@@ -123,6 +124,9 @@ class Command(BaseCommand):
             },
         )
 
+        # SLA deadlines (created outside the API)
+        backfill_sla(Ticket.objects.filter(pk__in=[t.pk for t in (ticket1, ticket2, ticket3, ticket4, ticket5)]))
+
         # Comments
         Comment.objects.get_or_create(
             ticket=ticket1,
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from backend.tickets.models import Ticket
+from backend.tickets.sla import ACTIVE_STATUSES, recompute_deadlines, sweep_breaches
+
+
+class Command(BaseCommand):
+    help = (
+        "Flag SLA breaches: every OPEN / IN_PROGRESS ticket whose response or resolve deadline "
+        "has passed gets response_breached_at / resolve_breached_at, in bulk, and an "
+        "'sla_breached' notification job. Only the tickets with a running clock past its "
+        "deadline are read (index range scans). With --interval it keeps sweeping."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every N seconds until interrupted (default: sweep once).",
+        )
+        parser.add_argument(
+            "--recompute",
+            action="store_true",
+            help="First recompute the deadlines of active tickets from the current SLA policies.",
+        )
+
+    def handle(self, *args, **options):
+        if options["recompute"]:
+            now = timezone.now()
+            count = recompute_deadlines(
+                Ticket.objects.filter(status__in=ACTIVE_STATUSES), updated_at=now
+            )
+            self.stdout.write(f"Recomputed deadlines of {count} active ticket(s).")
+
+        interval = options["interval"]
+        try:
+            while True:
+                started = time.perf_counter()
+                flagged = sweep_breaches()
+                self.stdout.write(
+                    f"{len(flagged['response'])} response and {len(flagged['resolve'])} resolve "
+                    f"breach(es) flagged in {(time.perf_counter() - started) * 1000:.0f}ms"
+                )
+                if interval <= 0:
+                    return
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,283 @@
+import itertools
+import json
+import logging
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connection, connections
+from django.test import Client, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from backend.tickets.db import sqlite_pragmas
+from backend.tickets.models import Job, Ticket
+from backend.tickets.permissions import get_user_role
+
+from .benchmark_api import _percentile
+
+# What Django + SQLite do without the profile: rollback journal, fsync on every
+# commit, 2 MB page cache, no mmap, deferred transactions, a new connection per
+# request. busy_timeout is left at Python's default (5 s) in both profiles.
+DEFAULT_PROFILE = {
+    "pragmas": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+    },
+    "immediate": False,
+    "conn_max_age": 0,
+}
+
+# one round per thread: 5 writes + 1 read, like an agent working a ticket
+ROUND = (
+    ("create_ticket", True),
+    ("comment", True),
+    ("status:IN_PROGRESS", True),
+    ("list", False),
+    ("comment", True),
+    ("status:RESOLVED", True),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run ticket creation, comment creation and status changes through the API from many "
+        "threads at once, first with SQLite defaults (rollback journal, deferred transactions, "
+        "no persistent connections) and then with the configured profile (SQLITE_PRAGMAS, "
+        "BEGIN IMMEDIATE, CONN_MAX_AGE), and compare 'database is locked' errors and write "
+        "throughput. Created tickets and their queued notifications are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent writer threads.")
+        parser.add_argument("--rounds", type=int, default=10, help="Rounds (6 requests) per thread.")
+        parser.add_argument(
+            "--profile",
+            choices=("both", "default", "configured"),
+            default="both",
+            help="Which profile(s) to run.",
+        )
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    # ---- setup ----
+
+    def _admin_tokens(self):
+        User = get_user_model()
+        tokens = []
+        for user in User.objects.filter(is_active=True).order_by("-is_superuser", "pk")[:200]:
+            if get_user_role(user) == "ADMIN":
+                tokens.append(Token.objects.get_or_create(user=user)[0].key)
+            if len(tokens) >= 20:
+                break
+        if not tokens:
+            raise CommandError("No active ADMIN user. Create one (createsuperuser) first.")
+        return tokens
+
+    def _configured_profile(self):
+        settings_dict = connection.settings_dict
+        return {
+            "pragmas": sqlite_pragmas(),
+            "immediate": (settings_dict["OPTIONS"].get("transaction_mode") or "").upper() == "IMMEDIATE",
+            "conn_max_age": settings_dict["CONN_MAX_AGE"],
+        }
+
+    # ---- one thread ----
+
+    def _worker(self, token, marker, rounds, barrier, result):
+        client = Client(SERVER_NAME="localhost", HTTP_AUTHORIZATION=f"Token {token}")
+        ticket_id = None
+        barrier.wait()
+        try:
+            for number in range(rounds):
+                for op, is_write in ROUND:
+                    if op == "create_ticket":
+                        ticket_id = None
+                    if is_write and op != "create_ticket" and ticket_id is None:
+                        result["skipped"] += 1  # the ticket could not be created
+                        continue
+                    # what a server does around every request
+                    close_old_connections()
+                    started = time.perf_counter()
+                    try:
+                        ok, value = self._request(client, op, ticket_id, f"{marker} {number}")
+                    except OperationalError as exc:
+                        key = "locked" if "locked" in str(exc) else "errors"
+                        result[key] += 1
+                        result["samples"].add(str(exc))
+                        continue
+                    except Exception as exc:
+                        result["errors"] += 1
+                        result["samples"].add(f"{type(exc).__name__}: {exc}")
+                        continue
+                    finally:
+                        close_old_connections()
+                    elapsed = (time.perf_counter() - started) * 1000
+                    if not ok:
+                        result["errors"] += 1
+                        result["samples"].add(f"HTTP {value} {op}")
+                        continue
+                    if op == "create_ticket":
+                        ticket_id = value
+                    if is_write:
+                        result["writes"] += 1
+                        result["write_latencies"].append(elapsed)
+                    else:
+                        result["reads"] += 1
+        finally:
+            connections.close_all()
+
+    def _request(self, client, op, ticket_id, title):
+        """(True, created ticket id or None) on success, (False, HTTP status) otherwise."""
+
+        if op == "create_ticket":
+            response = client.post(
+                "/api/tickets/",
+                {"title": title, "description": "Concurrent write stress test.", "priority": "LOW"},
+                content_type="application/json",
+            )
+            if response.status_code != 201:
+                return False, response.status_code
+            return True, response.json()["id"]
+        if op == "comment":
+            response = client.post(
+                f"/api/tickets/{ticket_id}/comments/",
+                {"message": "Working on it."},
+                content_type="application/json",
+            )
+            expected = 201
+        elif op.startswith("status:"):
+            response = client.patch(
+                f"/api/tickets/{ticket_id}/status/",
+                {"status": op.partition(":")[2]},
+                content_type="application/json",
+            )
+            expected = 200
+        else:
+            response = client.get("/api/tickets/?page_size=20")
+            expected = 200
+        if response.status_code != expected:
+            return False, response.status_code
+        return True, None
+
+    # ---- one profile ----
+
+    def _run_profile(self, name, profile, tokens, threads, rounds):
+        marker = f"stress-{uuid.uuid4().hex[:8]}"
+        connections.close_all()
+        settings_dict = connection.settings_dict
+        saved_max_age = settings_dict["CONN_MAX_AGE"]
+        saved_options = settings_dict["OPTIONS"]
+        # settings_dict is shared by the per-thread connection wrappers
+        settings_dict["CONN_MAX_AGE"] = profile["conn_max_age"]
+        settings_dict["OPTIONS"] = {
+            **saved_options, "transaction_mode": "IMMEDIATE" if profile["immediate"] else None
+        }
+        results = [
+            {
+                "writes": 0, "reads": 0, "locked": 0, "errors": 0, "skipped": 0,
+                "write_latencies": [], "samples": set(),
+            }
+            for _ in range(threads)
+        ]
+        try:
+            with override_settings(SQLITE_PRAGMAS=profile["pragmas"]):
+                # switching the journal mode needs the only open connection
+                connection.ensure_connection()
+                connection.close()
+
+                barrier = threading.Barrier(threads + 1)
+                workers = [
+                    threading.Thread(
+                        target=self._worker,
+                        args=(token, marker, rounds, barrier, results[index]),
+                    )
+                    for index, token in zip(range(threads), itertools.cycle(tokens))
+                ]
+                for worker in workers:
+                    worker.start()
+                barrier.wait()
+                started = time.perf_counter()
+                for worker in workers:
+                    worker.join()
+                elapsed = time.perf_counter() - started
+        finally:
+            settings_dict["CONN_MAX_AGE"] = saved_max_age
+            settings_dict["OPTIONS"] = saved_options
+            connections.close_all()
+            created = Ticket.objects.filter(title__startswith=marker)
+            # the notifications they queued (never sent: no worker is running)
+            Job.objects.filter(payload__ticket__in=list(created.values_list("id", flat=True))).delete()
+            created.delete()
+
+        latencies = sorted(itertools.chain.from_iterable(r["write_latencies"] for r in results))
+        writes = sum(r["writes"] for r in results)
+        summary = {
+            "profile": name,
+            "threads": threads,
+            "writes": writes,
+            "reads": sum(r["reads"] for r in results),
+            "locked": sum(r["locked"] for r in results),
+            "errors": sum(r["errors"] for r in results),
+            "skipped": sum(r["skipped"] for r in results),
+            "seconds": round(elapsed, 3),
+            "writes_per_s": round(writes / elapsed, 1) if elapsed else 0,
+            "write_p50_ms": round(_percentile(latencies, 50), 2) if latencies else None,
+            "write_p95_ms": round(_percentile(latencies, 95), 2) if latencies else None,
+            "write_max_ms": round(latencies[-1], 2) if latencies else None,
+            "sample_failures": sorted(set().union(*(r["samples"] for r in results)))[:5],
+        }
+        self.stdout.write(
+            f"  {name:<10}  {summary['writes_per_s']:8.1f} writes/s  "
+            f"p50 {summary['write_p50_ms'] or 0:8.2f}ms  p95 {summary['write_p95_ms'] or 0:8.2f}ms  "
+            f"max {summary['write_max_ms'] or 0:8.2f}ms  locked {summary['locked']:4d}  "
+            f"other errors {summary['errors']}  skipped {summary['skipped']}"
+        )
+        for failure in summary["sample_failures"]:
+            self.stdout.write(self.style.WARNING(f"      {failure}"))
+        return summary
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(f"Only meaningful on SQLite (database is {connection.vendor}).")
+        if options["threads"] < 1 or options["rounds"] < 1:
+            raise CommandError("--threads and --rounds must be positive.")
+
+        tokens = self._admin_tokens()
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+        profiles = []
+        if options["profile"] in ("both", "default"):
+            profiles.append(("default", DEFAULT_PROFILE))
+        if options["profile"] in ("both", "configured"):
+            profiles.append(("configured", self._configured_profile()))
+
+        self.stdout.write(
+            f"{options['threads']} threads x {options['rounds']} rounds "
+            f"({len(ROUND)} requests each, {sum(w for _, w in ROUND)} writes)"
+        )
+        results = [
+            self._run_profile(name, profile, tokens, options["threads"], options["rounds"])
+            for name, profile in profiles
+        ]
+        if len(results) == 2 and results[0]["writes_per_s"]:
+            ratio = results[1]["writes_per_s"] / results[0]["writes_per_s"]
+            self.stdout.write(
+                f"  configured / default write throughput x{ratio:.2f}, "
+                f"locked errors {results[0]['locked']} -> {results[1]['locked']}"
+            )
+
+        if options["output"]:
+            report = {
+                "created_at": timezone.now().isoformat(),
+                "pragmas": sqlite_pragmas(),
+                "results": results,
+            }
+            path = Path(options["output"])
+            path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Report: {path}"))
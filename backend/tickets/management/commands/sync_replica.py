@@ -0,0 +1,69 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from backend.tickets.routers import replica_alias
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the replica (settings.REPLICA_DATABASE_ALIAS) "
+        "with SQLite's online backup API - a local stand-in for replication. Readers of the "
+        "replica see the previous copy until the new one is complete. With --interval it "
+        "keeps copying, so the replica lags the primary by at most that many seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Repeat every N seconds until interrupted (default: copy once).",
+        )
+
+    def _database_path(self, alias):
+        connection = connections[alias]
+        if connection.vendor != "sqlite":
+            raise CommandError(f"'{alias}' is not an SQLite database ({connection.vendor}).")
+        if connection.is_in_memory_db():
+            raise CommandError(f"'{alias}' is an in-memory database.")
+        return str(connection.settings_dict["NAME"])
+
+    def _copy(self, source_path, replica_path):
+        started = time.perf_counter()
+        source = sqlite3.connect(source_path)
+        try:
+            replica = sqlite3.connect(replica_path, timeout=30)
+            try:
+                # pages=-1: one step, i.e. one consistent snapshot of the primary
+                source.backup(replica, pages=-1)
+            finally:
+                replica.close()
+        finally:
+            source.close()
+        return time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError(
+                "No replica configured: add DATABASES['replica'] (see REPLICA_DATABASE_ALIAS "
+                "in backend/settings.py)."
+            )
+        source_path = self._database_path(DEFAULT_DB_ALIAS)
+        replica_path = self._database_path(alias)
+        if source_path == replica_path:
+            raise CommandError("The replica must be a different file than the primary.")
+
+        interval = options["interval"]
+        try:
+            while True:
+                elapsed = self._copy(source_path, replica_path)
+                self.stdout.write(f"{source_path} -> {replica_path} in {elapsed * 1000:.0f}ms")
+                if interval <= 0:
+                    return
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,103 @@
+"""Helpers shared by the bulk data management commands."""
+
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+@contextmanager
+def preserve_timestamps(*models):
+    """Let bulk_create keep created_at/updated_at from the source system.
+
+    auto_now / auto_now_add would otherwise overwrite them with "now".
+    """
+
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def maintenance_triggers() -> list[str]:
+    """Names of the SQL triggers that keep the FTS index, stats rollup and comment counters."""
+
+    from backend.tickets.counters import DROP_TRIGGER_SQL as COUNTER_DROP_SQL
+    from backend.tickets.search import DROP_SQL as FTS_DROP_SQL
+    from backend.tickets.stats import DROP_TRIGGER_SQL as STATS_DROP_SQL
+
+    return [
+        sql.rsplit(" ", 1)[1]
+        for sql in (*FTS_DROP_SQL, *STATS_DROP_SQL, *COUNTER_DROP_SQL)
+        if sql.startswith("DROP TRIGGER")
+    ]
+
+
+def missing_triggers(connection) -> list[str]:
+    """Maintenance triggers absent from the database (always ``[]`` outside SQLite)."""
+
+    if connection.vendor != "sqlite":
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        present = {name for (name,) in cursor.fetchall()}
+    return [name for name in maintenance_triggers() if name not in present]
+
+
+@contextmanager
+def deferred_index_maintenance(connection, stdout=None):
+    """Drop the full-text, rollup and comment counter triggers for a bulk load,
+    rebuild afterwards.
+
+    Per-row trigger work dominates large inserts; rebuilding the FTS index,
+    the TicketStats rollup and the comment counters once at the end is much
+    cheaper.
+
+    Everything runs in one transaction (the loader's own ``atomic`` blocks
+    become savepoints). SQLite DDL is transactional: other connections keep
+    seeing the triggers, cannot write while they are gone (they wait for the
+    lock) and a load that fails or is killed rolls back together with the
+    dropped triggers. Nothing is committed until the indexes are rebuilt.
+    """
+
+    from backend.tickets.counters import (
+        drop_comment_counter_triggers,
+        ensure_comment_counter_triggers,
+        rebuild_comment_counters,
+    )
+    from backend.tickets.search import (
+        DROP_SQL as FTS_DROP_SQL,
+        ensure_search_schema,
+        rebuild_search_index,
+    )
+    from backend.tickets.stats import drop_stats_triggers, ensure_stats_triggers, rebuild_rollup
+
+    if connection.vendor != "sqlite":
+        yield
+        return
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            # keep the FTS tables, drop only their triggers
+            for sql in FTS_DROP_SQL:
+                if sql.startswith("DROP TRIGGER"):
+                    cursor.execute(sql)
+        drop_stats_triggers(connection)
+        drop_comment_counter_triggers(connection)
+
+        yield
+
+        if stdout is not None:
+            stdout.write("Rebuilding full-text index, stats rollup and comment counters...")
+        ensure_search_schema(connection)
+        ensure_stats_triggers(connection)
+        ensure_comment_counter_triggers(connection)
+        rebuild_search_index(connection)
+        rebuild_rollup()
+        rebuild_comment_counters()
@@ -0,0 +1,300 @@
+"""Request and SQL metrics in Prometheus text format.
+
+``RequestMetricsMiddleware`` times every request and counts its SQL
+statements through an execute wrapper installed on every database
+connection; results are kept in an
+in-process registry labelled by URL route name (``ticket-list-create``,
+``ticket-detail`` ...), so label cardinality stays bounded no matter which
+ids appear in the path. ``/api/metrics/`` renders the registry.
+
+Per request the overhead is a couple of ``perf_counter`` calls, one wrapper
+call per query and one short lock. Values are per process: with several
+workers, scrape each one (or aggregate in Prometheus).
+
+Streaming responses (export) are timed until the headers are ready; their
+size is recorded once the body has been sent. File responses are left
+untouched (wsgi.file_wrapper / sendfile) and counted by Content-Length.
+
+The middleware is sync and async capable. The current request's timer
+lives in a context variable rather than on ``connection``: async views run
+their queries on ``sync_to_async`` threads, each with its own connection,
+and context variables follow the request there.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+UNRESOLVED_ROUTE = "unresolved"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot: +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by label tuples, guarded by one lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}  # (route, method, status) -> count
+            self.latency = {}  # (route, method) -> _Histogram
+            self.queries = {}  # route -> _Histogram
+            self.query_seconds = {}  # route -> float
+            self.response_size = {}  # route -> _Histogram
+
+    def _histogram(self, table, key, buckets):
+        histogram = table.get(key)
+        if histogram is None:
+            histogram = table[key] = _Histogram(buckets)
+        return histogram
+
+    def record_request(self, route, method, status, seconds, query_count, query_seconds, size):
+        with self._lock:
+            key = (route, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self._histogram(self.latency, (route, method), LATENCY_BUCKETS).observe(seconds)
+            self._histogram(self.queries, route, QUERY_COUNT_BUCKETS).observe(query_count)
+            self.query_seconds[route] = self.query_seconds.get(route, 0.0) + query_seconds
+            if size is not None:
+                self._histogram(self.response_size, route, SIZE_BUCKETS).observe(size)
+
+    def record_size(self, route, size):
+        with self._lock:
+            self._histogram(self.response_size, route, SIZE_BUCKETS).observe(size)
+
+    # ---- exposition ----
+
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            _counter(
+                lines,
+                "helpdesk_http_requests_total",
+                "HTTP requests by route, method and status code.",
+                {("route", "method", "status"): self.requests},
+            )
+            _histograms(
+                lines,
+                "helpdesk_http_request_duration_seconds",
+                "Request latency (until the response headers are ready).",
+                ("route", "method"),
+                self.latency,
+            )
+            _histograms(
+                lines,
+                "helpdesk_db_queries_per_request",
+                "SQL statements executed per request.",
+                ("route",),
+                self.queries,
+            )
+            _counter(
+                lines,
+                "helpdesk_db_query_seconds_total",
+                "Time spent executing SQL.",
+                {("route",): self.query_seconds},
+            )
+            _histograms(
+                lines,
+                "helpdesk_http_response_size_bytes",
+                "Response body size.",
+                ("route",),
+                self.response_size,
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values if isinstance(values, tuple) else (values,)))
+    if extra:
+        pairs.append(extra)
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _counter(lines, name, help_text, tables):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for label_names, table in tables.items():
+        for key, value in sorted(table.items()):
+            lines.append(f"{name}{{{_labels(label_names, key)}}} {_number(value)}")
+
+
+def _histograms(lines, name, help_text, label_names, table):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(table.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            labels = _labels(label_names, key, ("le", _number(bound)))
+            lines.append(f"{name}_bucket{{{labels}}} {cumulative}")
+        labels = _labels(label_names, key, ("le", "+Inf"))
+        lines.append(f"{name}_bucket{{{labels}}} {histogram.count}")
+        labels = _labels(label_names, key)
+        lines.append(f"{name}_sum{{{labels}}} {_number(histogram.total)}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+registry = MetricsRegistry()
+
+
+class _QueryTimer:
+    """Statement count and duration of one request."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+_current_timer: ContextVar[_QueryTimer | None] = ContextVar("metrics_query_timer", default=None)
+
+
+def _timed_execute(execute, sql, params, many, context):
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.count += 1
+        timer.seconds += time.perf_counter() - started
+
+
+def _install_wrapper(conn) -> None:
+    if _timed_execute not in conn.execute_wrappers:
+        conn.execute_wrappers.append(_timed_execute)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _install_wrapper(connection)
+
+
+connection_created.connect(_on_connection_created, dispatch_uid="metrics_timed_execute")
+
+
+def _route_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED_ROUTE
+    return match.url_name or match.view_name or UNRESOLVED_ROUTE
+
+
+def _counting(chunks, route):
+    size = 0
+    try:
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        registry.record_size(route, size)
+
+
+async def _acounting(chunks, route):
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        registry.record_size(route, size)
+
+
+class RequestMetricsMiddleware:
+    """Records latency, status, SQL count/time and response size per route."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "METRICS_ENABLED", True)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        # connections opened before this module was imported have no wrapper yet
+        _install_wrapper(connection)
+        timer = _QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        return self._record(request, response, time.perf_counter() - started, timer)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        timer = _QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        return self._record(request, response, time.perf_counter() - started, timer)
+
+    def _record(self, request, response, elapsed, timer):
+        route = _route_name(request)
+        size = None
+        if getattr(response, "file_to_stream", None) is not None:
+            # FileResponse: replacing streaming_content would drop file_to_stream
+            # and with it the server's sendfile path; the length is in the header
+            if response.has_header("Content-Length"):
+                size = int(response["Content-Length"])
+        elif response.streaming:
+            counting = _acounting if response.is_async else _counting
+            response.streaming_content = counting(response.streaming_content, route)
+        else:
+            size = len(response.content)
+
+        registry.record_request(
+            route, request.method, response.status_code, elapsed, timer.count, timer.seconds, size
+        )
+        return response
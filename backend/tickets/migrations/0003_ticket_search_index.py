@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from backend.tickets.search import (
+    drop_search_schema,
+    ensure_search_schema,
+    rebuild_search_index,
+)
+
+
+def create_search_index(apps, schema_editor):
+    ensure_search_schema(schema_editor.connection)
+    rebuild_search_index(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    drop_search_schema(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0002_comment_visibility'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:31
+
+from django.db import migrations, models
+
+from backend.tickets.stats import drop_stats_triggers, ensure_stats_triggers, rebuild_rollup
+
+
+def install_rollup(apps, schema_editor):
+    ensure_stats_triggers(schema_editor.connection)
+    rebuild_rollup(
+        stats_model=apps.get_model("tickets", "TicketStats"),
+        ticket_model=apps.get_model("tickets", "Ticket"),
+    )
+
+
+def remove_rollup(apps, schema_editor):
+    drop_stats_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_ticket_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assignee_key', models.BigIntegerField(default=0)),
+                ('status', models.CharField(max_length=20)),
+                ('priority', models.CharField(max_length=10)),
+                ('category_key', models.BigIntegerField(default=0)),
+                ('ticket_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('assignee_key', 'status', 'priority', 'category_key'), name='ticketstats_unique_key')],
+            },
+        ),
+        migrations.RunPython(install_rollup, remove_rollup),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Foreign keys whose own index duplicates the leading column of a composite index
+COMPOSITE_LED_FKS = [
+    ("comment", "ticket"),
+    ("ticket", "assigned_to"),
+    ("ticket", "category"),
+    ("ticket", "created_by"),
+]
+
+
+def drop_fk_indexes(apps, schema_editor):
+    # A plain AlterField(db_index=False) makes SQLite rebuild both tables,
+    # which drops the full-text and rollup triggers; dropping the
+    # index by name changes nothing else.
+    for model_name, field_name in COMPOSITE_LED_FKS:
+        model = apps.get_model("tickets", model_name)
+        column = model._meta.get_field(field_name).column
+        for name in schema_editor._constraint_names(
+            model, [column], index=True, type_=models.Index.suffix
+        ):
+            schema_editor.execute(schema_editor._delete_index_sql(model, name))
+
+
+def create_fk_indexes(apps, schema_editor):
+    for model_name, field_name in COMPOSITE_LED_FKS:
+        model = apps.get_model("tickets", model_name)
+        field = model._meta.get_field(field_name)
+        schema_editor.execute(schema_editor._create_index_sql(model, fields=[field]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_ticket_stats_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='comment',
+                    name='ticket',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='tickets.ticket'),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='assigned_to',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_tickets', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='category',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tickets', to='tickets.category'),
+                ),
+                migrations.AlterField(
+                    model_name='ticket',
+                    name='created_by',
+                    field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='created_tickets', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(drop_fk_indexes, create_fk_indexes),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['ticket', '-created_at', '-id'], name='comment_ticket_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['-created_at', '-id'], name='ticket_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['assigned_to', '-created_at', '-id'], name='ticket_assignee_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['created_by', '-created_at', '-id'], name='ticket_creator_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['assigned_to', 'status', '-created_at', '-id'], name='ticket_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['created_by', 'status', '-created_at', '-id'], name='ticket_creator_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='ticket_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['priority', '-created_at', '-id'], name='ticket_priority_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='ticket_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['due_date', 'status'], name='ticket_due_status_idx'),
+        ),
+        # LoginView looks users up by case-insensitive email (LOWER(email) = LOWER(%s)).
+        # auth_user belongs to contrib.auth, so the functional index is created here.
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS tickets_auth_user_email_lower_idx ON auth_user (LOWER(email))",
+            "DROP INDEX IF EXISTS tickets_auth_user_email_lower_idx",
+        ),
+    ]
@@ -0,0 +1,33 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+from backend.tickets.search import ensure_search_schema
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Adding a NOT NULL column makes SQLite rebuild tickets_comment,
+    # which drops the full-text triggers defined on it.
+    ensure_search_schema(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0006_ticket_status_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
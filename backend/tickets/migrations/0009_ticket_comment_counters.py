@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:20
+
+from django.db import migrations, models
+
+from backend.tickets.counters import (
+    drop_comment_counter_triggers,
+    ensure_comment_counter_triggers,
+    rebuild_comment_counters,
+)
+from backend.tickets.search import ensure_search_schema
+from backend.tickets.stats import ensure_stats_triggers
+
+
+def restore_ticket_triggers(apps, schema_editor):
+    # Adding NOT NULL columns with a default makes SQLite rebuild
+    # tickets_ticket, which drops the full-text and rollup triggers on it.
+    ensure_search_schema(schema_editor.connection)
+    ensure_stats_triggers(schema_editor.connection)
+
+
+def install_counters(apps, schema_editor):
+    restore_ticket_triggers(apps, schema_editor)
+    ensure_comment_counter_triggers(schema_editor.connection)
+    rebuild_comment_counters(
+        ticket_model=apps.get_model("tickets", "Ticket"),
+        comment_model=apps.get_model("tickets", "Comment"),
+    )
+
+
+def remove_counters(apps, schema_editor):
+    drop_comment_counter_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0008_import_checkpoint'),
+    ]
+
+    operations = [
+        # reverse runs last, after RemoveField has rebuilt tickets_ticket again
+        migrations.RunPython(migrations.RunPython.noop, restore_ticket_triggers),
+        migrations.AddField(
+            model_name='ticket',
+            name='internal_comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='last_comment_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='last_public_comment_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='public_comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(install_counters, remove_counters),
+    ]
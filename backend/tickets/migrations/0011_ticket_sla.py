@@ -0,0 +1,98 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from backend.tickets.search import ensure_search_schema
+from backend.tickets.sla import DEFAULT_POLICIES, backfill_sla
+from backend.tickets.stats import ensure_stats_triggers
+
+
+def install_sla(apps, schema_editor):
+    # nullable columns are added in place, but keep the ticket triggers certain
+    ensure_search_schema(schema_editor.connection)
+    ensure_stats_triggers(schema_editor.connection)
+
+    SlaPolicy = apps.get_model("tickets", "SlaPolicy")
+    Ticket = apps.get_model("tickets", "Ticket")
+    SlaPolicy.objects.bulk_create(
+        SlaPolicy(priority=priority, response_minutes=response, resolve_minutes=resolve)
+        for priority, (response, resolve) in DEFAULT_POLICIES.items()
+    )
+    backfill_sla(
+        Ticket.objects.all(),
+        policy_model=SlaPolicy,
+        status_event_model=apps.get_model("tickets", "TicketStatusEvent"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0010_job_queue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlaPolicy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('priority', models.CharField(choices=[('LOW', 'Low'), ('MEDIUM', 'Medium'), ('HIGH', 'High'), ('CRITICAL', 'Critical')], max_length=10)),
+                ('response_minutes', models.PositiveIntegerField()),
+                ('resolve_minutes', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolve_breached_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='resolve_due_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='responded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='response_breached_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='response_due_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['responded_at', 'status', 'response_breached_at', 'response_due_at'], name='ticket_response_sla_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status', 'resolve_breached_at', 'resolve_due_at'], name='ticket_resolve_sla_idx'),
+        ),
+        migrations.AddField(
+            model_name='slapolicy',
+            name='category',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='sla_policies', to='tickets.category'),
+        ),
+        migrations.AddConstraint(
+            model_name='slapolicy',
+            constraint=models.UniqueConstraint(fields=('priority', 'category'), name='slapolicy_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='slapolicy',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('priority',), name='slapolicy_default_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='slapolicy',
+            constraint=models.CheckConstraint(condition=models.Q(('response_minutes__lte', models.F('resolve_minutes'))), name='slapolicy_response_before_resolve'),
+        ),
+        migrations.RunPython(install_sla, migrations.RunPython.noop),
+    ]
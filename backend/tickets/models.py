@@ -5,6 +5,7 @@ class Category(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -32,27 +33,98 @@ class Ticket(models.Model):
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
-        related_name="created_tickets"
+        related_name="created_tickets",
+        db_index=False,  # leading column of ticket_creator_*_idx
     )
     assigned_to = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        related_name="assigned_tickets"
+        related_name="assigned_tickets",
+        db_index=False,  # leading column of ticket_assignee_*_idx
     )
     category = models.ForeignKey(
         Category,
         on_delete=models.SET_NULL,
         null=True,
         blank=True,
-        related_name="tickets"
+        related_name="tickets",
+        db_index=False,  # leading column of ticket_category_created_idx
     )
     due_date = models.DateField(null=True, blank=True)
 
+    # Maintained by SQL triggers on tickets_comment (counters.py), never by save()
+    public_comment_count = models.IntegerField(default=0, editable=False)
+    internal_comment_count = models.IntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_public_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # SLA (sla.py): deadlines from the SlaPolicy of priority + category, stored
+    # on create and recomputed when either changes. The other three are set
+    # once, by UPDATE: first support response and breaches noticed by the
+    # status change / comment that came too late or by `sla_sweep`.
+    response_due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    resolve_due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    responded_at = models.DateTimeField(null=True, blank=True, editable=False)
+    response_breached_at = models.DateTimeField(null=True, blank=True, editable=False)
+    resolve_breached_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    COMMENT_COUNTER_FIELDS = frozenset(
+        {"public_comment_count", "internal_comment_count", "last_comment_at", "last_public_comment_at"}
+    )
+    SLA_EVENT_FIELDS = frozenset({"responded_at", "response_breached_at", "resolve_breached_at"})
+
+    class Meta:
+        # Match the hot query shapes: visibility filter (assigned_to / created_by)
+        # + optional status/priority/category filter, ordered by -created_at, -id.
+        # The trailing -id makes the index order the full list order: no sort
+        # step for pages (the implicit rowid suffix is ascending).
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="ticket_created_idx"),
+            models.Index(fields=["assigned_to", "-created_at", "-id"], name="ticket_assignee_created_idx"),
+            models.Index(fields=["created_by", "-created_at", "-id"], name="ticket_creator_created_idx"),
+            models.Index(
+                fields=["assigned_to", "status", "-created_at", "-id"], name="ticket_assignee_status_idx"
+            ),
+            models.Index(
+                fields=["created_by", "status", "-created_at", "-id"], name="ticket_creator_status_idx"
+            ),
+            models.Index(fields=["status", "-created_at", "-id"], name="ticket_status_created_idx"),
+            models.Index(fields=["priority", "-created_at", "-id"], name="ticket_priority_created_idx"),
+            models.Index(fields=["category", "-created_at", "-id"], name="ticket_category_created_idx"),
+            models.Index(fields=["due_date", "status"], name="ticket_due_status_idx"),
+            # SLA clocks still running (sla.py): equality / IN on the leading
+            # columns, then a range on the deadline
+            models.Index(
+                fields=["responded_at", "status", "response_breached_at", "response_due_at"],
+                name="ticket_response_sla_idx",
+            ),
+            models.Index(
+                fields=["status", "resolve_breached_at", "resolve_due_at"],
+                name="ticket_resolve_sla_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"[{self.status}] {self.title}"
 
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            # writing back the counters / SLA events loaded with this instance
+            # would undo comments or SLA updates made since then
+            skipped = self.COMMENT_COUNTER_FIELDS | self.SLA_EVENT_FIELDS
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped
+            ]
+        super().save(*args, **kwargs)
+
 class Comment(models.Model):
     VISIBILITY_PUBLIC = "PUBLIC"
     VISIBILITY_INTERNAL = "INTERNAL"
@@ -65,7 +137,8 @@ class Comment(models.Model):
     ticket = models.ForeignKey(
         Ticket,
         on_delete=models.CASCADE,
-        related_name="comments"
+        related_name="comments",
+        db_index=False,  # leading column of comment_ticket_created_idx
     )
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -79,6 +152,163 @@ class Comment(models.Model):
         default=VISIBILITY_PUBLIC,
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["ticket", "-created_at", "-id"], name="comment_ticket_created_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.ticket}"
+
+class TicketStats(models.Model):
+    """Rollup of ticket counts per (assignee, status, priority, category).
+
+    Maintained by SQL triggers on ``tickets_ticket`` (see ``stats.py``), so it
+    changes in the same transaction as the ticket row itself.
+    ``0`` in ``assignee_key``/``category_key`` means "unassigned"/"no category".
+    """
+
+    assignee_key = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20)
+    priority = models.CharField(max_length=10)
+    category_key = models.BigIntegerField(default=0)
+    ticket_count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["assignee_key", "status", "priority", "category_key"],
+                name="ticketstats_unique_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.assignee_key}/{self.status}/{self.priority}/{self.category_key}: {self.ticket_count}"
+
+class TicketStatusEvent(models.Model):
+    """Append-only status transition history (written by ChangeTicketStatusCommand)."""
+
+    ticket = models.ForeignKey(
+        Ticket,
+        on_delete=models.CASCADE,
+        related_name="status_events",
+        db_index=False,
+    )
+    from_status = models.CharField(max_length=20)
+    to_status = models.CharField(max_length=20)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Covering index: the timeline is read from the index alone.
+            models.Index(
+                fields=["ticket", "created_at", "from_status", "to_status", "changed_by"],
+                name="status_event_timeline_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.ticket_id}: {self.from_status} -> {self.to_status}"
+
+class Job(models.Model):
+    """Background job (outbox row), written in the same transaction as the change.
+
+    Claimed and run by ``manage.py run_jobs`` (see ``jobs.py``). A failed job
+    goes back to PENDING with a later ``run_after`` until ``max_attempts`` is
+    reached, then stays DEAD (dead letter) with the last error.
+    """
+
+    STATUS_PENDING = "PENDING"
+    STATUS_RUNNING = "RUNNING"
+    STATUS_DONE = "DONE"
+    STATUS_DEAD = "DEAD"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_DEAD, "Dead"),
+    ]
+
+    kind = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_after = models.DateTimeField()
+    # RUNNING: who holds the job and until when (an expired lease is claimed again)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # claim: status = PENDING AND run_after <= now ORDER BY run_after, id;
+            # expired leases: status = RUNNING (few rows)
+            models.Index(fields=["status", "run_after"], name="job_claim_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} [{self.status}]"
+
+class SlaPolicy(models.Model):
+    """Response / resolve targets for a priority, optionally for one category.
+
+    A ticket uses the policy of its category if there is one, else the
+    category-less policy of its priority (see ``sla.py``); none = no SLA.
+    """
+
+    priority = models.CharField(max_length=10, choices=Ticket.PRIORITY_CHOICES)
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="sla_policies",
+    )
+    response_minutes = models.PositiveIntegerField()
+    resolve_minutes = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["priority", "category"], name="slapolicy_unique"),
+            # NULLs are distinct in a UNIQUE index: one default policy per priority
+            models.UniqueConstraint(
+                fields=["priority"],
+                condition=models.Q(category__isnull=True),
+                name="slapolicy_default_unique",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(response_minutes__lte=models.F("resolve_minutes")),
+                name="slapolicy_response_before_resolve",
+            ),
+        ]
+
+    def __str__(self):
+        scope = self.category or "any category"
+        return f"{self.priority} / {scope}: respond {self.response_minutes}m, resolve {self.resolve_minutes}m"
+
+class ImportCheckpoint(models.Model):
+    """Last input row of an ``import_tickets`` source whose batch is committed.
+
+    Written in the same transaction as the batch, so the imported tickets and
+    the resume offset can never disagree.
+    """
+
+    source = models.CharField(max_length=500, unique=True)
+    last_row = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source}: row {self.last_row}"
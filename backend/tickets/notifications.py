@@ -0,0 +1,171 @@
+"""E-mail notifications about ticket changes (the first background job).
+
+Views and commands call ``notify_ticket`` / ``notify_tickets`` inside the
+write transaction of the change; that only enqueues a job (``jobs.py``).
+``run_jobs`` then loads the ticket as it is at that moment and mails:
+
+- the creator and the assignee (on reassignment also the previous one),
+- except the user who made the change - apart from ``created``, where the
+  creator gets a receipt,
+- only TECHNICIAN / ADMIN for internal comments,
+- only users with an e-mail address.
+
+``sla_breached`` (queued by ``sla_sweep``) goes to the assignee only, or to
+the admins while the ticket is unassigned.
+
+Mail goes through ``settings.EMAIL_BACKEND`` (the file backend locally, so
+nothing leaves the machine). A ticket or comment deleted before the job
+runs means there is nothing to tell; the job just finishes.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .jobs import PermanentJobError, enqueue, enqueue_many, register
+from .models import Comment, Ticket
+from .permissions import is_admin_user, is_support_or_admin
+
+JOB_KIND = "notifications.ticket"
+
+EVENTS = ("created", "status_changed", "assigned", "comment_created", "sla_breached")
+
+
+def notifications_enabled() -> bool:
+    return getattr(settings, "TICKET_NOTIFICATIONS_ENABLED", True)
+
+
+def _payload(event: str, ticket, actor, extra: dict) -> dict:
+    return {
+        "event": event,
+        "ticket": ticket.pk,
+        "actor": actor.pk if actor is not None else None,
+        **extra,
+    }
+
+
+def notify_ticket(event: str, ticket, actor, **extra) -> None:
+    """Enqueue a notification; ``extra`` e.g. ``from_status``/``to_status``, ``comment``."""
+
+    if notifications_enabled():
+        enqueue(JOB_KIND, _payload(event, ticket, actor, extra))
+
+
+def notify_tickets(notifications) -> None:
+    """Enqueue many ``(event, ticket, actor, extra)`` notifications with one INSERT."""
+
+    if notifications_enabled():
+        enqueue_many(
+            JOB_KIND,
+            (_payload(event, ticket, actor, extra) for event, ticket, actor, extra in notifications),
+        )
+
+
+# ---- job handler ----
+
+def _status_label(status) -> str:
+    return dict(Ticket.STATUS_CHOICES).get(status, status or "?")
+
+
+def _subject(event: str, ticket: Ticket, payload: dict) -> str:
+    what = {
+        "created": "Ticket received",
+        "status_changed": f"Status changed to {_status_label(payload.get('to_status'))}",
+        "assigned": "Ticket assigned",
+        "comment_created": "New comment",
+        "sla_breached": f"SLA {payload.get('target', '')} deadline missed",
+    }[event]
+    return f"[Ticket #{ticket.pk}] {what}: {ticket.title}"
+
+
+def _body(event: str, ticket: Ticket, payload: dict, comment: Comment | None) -> str:
+    lines = []
+    if event == "created":
+        lines.append("Your ticket has been received.")
+    elif event == "status_changed":
+        # the transition this job is about; the ticket may have moved on since
+        lines.append(
+            f"Status: {_status_label(payload.get('from_status'))}"
+            f" -> {_status_label(payload.get('to_status'))}"
+        )
+    elif event == "assigned":
+        assignee = ticket.assigned_to.get_username() if ticket.assigned_to else "nobody"
+        lines.append(f"Assigned to: {assignee}")
+    elif event == "sla_breached":
+        due = ticket.response_due_at if payload.get("target") == "response" else ticket.resolve_due_at
+        when = f"{timezone.localtime(due):%Y-%m-%d %H:%M}" if due else "?"
+        lines.append(f"The {payload.get('target')} deadline ({when}) has passed.")
+    elif comment is not None:
+        lines.append(f"{comment.author.get_username()} wrote:")
+        lines.append("")
+        lines.append(comment.message)
+    lines += [
+        "",
+        f"Ticket #{ticket.pk}: {ticket.title}",
+        f"Status: {ticket.get_status_display()}, priority: {ticket.get_priority_display()}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _admins() -> list:
+    User = get_user_model()
+    candidates = User.objects.filter(
+        Q(is_superuser=True) | Q(groups__name="ADMIN"), is_active=True
+    ).distinct()
+    return [user for user in candidates if is_admin_user(user)]
+
+
+def _recipients(event: str, ticket: Ticket, payload: dict, comment: Comment | None) -> list:
+    if event == "sla_breached":
+        users = [ticket.assigned_to] if ticket.assigned_to else _admins()
+    else:
+        users = [ticket.created_by, ticket.assigned_to]
+    previous = payload.get("previous_assigned_to")
+    if event == "assigned" and previous and previous != ticket.assigned_to_id:
+        users.append(get_user_model().objects.filter(pk=previous).first())
+
+    actor_id = None if event == "created" else payload.get("actor")
+    internal = comment is not None and comment.visibility != Comment.VISIBILITY_PUBLIC
+    recipients = {}
+    for user in users:
+        if user is None or user.pk == actor_id or not user.is_active or not user.email:
+            continue
+        if internal and not is_support_or_admin(user):
+            continue
+        recipients[user.pk] = user
+    return list(recipients.values())
+
+
+@register(JOB_KIND)
+def send_ticket_notification(payload: dict) -> None:
+    event = payload.get("event")
+    if event not in EVENTS:
+        raise PermanentJobError(f"Unknown notification event {event!r}.")
+    ticket = (
+        Ticket.objects.select_related("created_by", "assigned_to")
+        .filter(pk=payload["ticket"])
+        .first()
+    )
+    if ticket is None:
+        return
+    comment = None
+    if event == "comment_created":
+        comment = Comment.objects.select_related("author").filter(pk=payload["comment"]).first()
+        if comment is None:
+            return
+
+    messages = [
+        EmailMessage(
+            subject=_subject(event, ticket, payload),
+            body=_body(event, ticket, payload, comment),
+            to=[user.email],
+        )
+        for user in _recipients(event, ticket, payload, comment)
+    ]
+    if messages:
+        # one connection for all recipients; an error fails (and retries) the job
+        get_connection().send_messages(messages)
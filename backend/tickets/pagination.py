@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .search import RANK_ANNOTATION
+
+
+class TicketCursorPagination(BasePagination):
+    """Keyset pagination over ``(created_at, id)``, newest first.
+
+    Each page is fetched with ``WHERE (created_at, id) < (cursor)`` instead of
+    OFFSET, so deep pages cost the same as the first one. The cursor is an
+    opaque base64 token holding the last row's sort key.
+
+    Lists are paginated by default: without parameters the first page of
+    ``default_page_size`` rows is returned. ``?page_size=all`` opts out and
+    returns the whole list (scripts, legacy clients).
+
+    Query params:
+      - page_size: rows per page (default 50, max 500), or ``all``
+      - cursor: token from the previous page's ``next`` link
+      - with_count=1: include total ``count`` (extra COUNT query, off by default)
+
+    Search results (``apply_ticket_search``) are ranked by relevance, which
+    is no stable sort key (bm25 changes as the index grows): they come as
+    one page of the ``page_size`` best matches, without ``next``, and a
+    ``cursor`` is rejected.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "with_count"
+    default_page_size = 50
+    max_page_size = 500
+    invalid_cursor_message = "Invalid cursor"
+    ranked_cursor_message = "Search results are a single page ranked by relevance; refine the search instead."
+    # page_size value that turns pagination off
+    unpaginated_page_size = "all"
+    # False: only ?page_size= / ?cursor= paginate
+    paginate_by_default = True
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        if params.get(self.page_size_query_param) == self.unpaginated_page_size:
+            return False
+        return (
+            self.paginate_by_default
+            or self.cursor_query_param in params
+            or self.page_size_query_param in params
+        )
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            size = int(raw) if raw else self.default_page_size
+        except ValueError:
+            size = self.default_page_size
+        return max(1, min(size, self.max_page_size))
+
+    def encode_cursor(self, created_at: datetime, pk: int) -> str:
+        raw = json.dumps([created_at.isoformat(), pk], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, token: str) -> tuple[datetime, int]:
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(created_at), int(pk)
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def after_cursor(queryset, created_at: datetime, pk: int):
+        """Rows strictly after (created_at, pk) in (-created_at, -id) order.
+
+        The redundant ``created_at <= X`` gives SQLite a range on the
+        created_at indexes; the OR alone would not use them.
+        """
+
+        return queryset.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(id__lt=pk)
+        )
+
+    def _page_queryset(self, queryset, request):
+        """Set up page state; return (page queryset, count queryset or None).
+
+        ``queryset`` may also be a list of disjoint querysets (e.g. a
+        technician's own and unassigned tickets). Each part is read in the
+        order of its own index and the parts are merged by one
+        ``UNION ALL ... ORDER BY ... LIMIT``, which SQLite runs as a merge
+        of ordered streams instead of sorting all matching rows.
+        """
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        parts = list(queryset) if isinstance(queryset, (list, tuple)) else [queryset]
+        token = request.query_params.get(self.cursor_query_param)
+        cursor = self.decode_cursor(token) if token else None
+
+        self.count = None
+        count_qs = None
+        if request.query_params.get(self.count_query_param) in ("1", "true", "True"):
+            count_qs = self._combine([part.order_by() for part in parts])
+
+        self.ranked = RANK_ANNOTATION in parts[0].query.annotations
+        if self.ranked:
+            if cursor is not None:
+                raise ValidationError({self.cursor_query_param: self.ranked_cursor_message})
+            page_qs = self._combine(parts).order_by(RANK_ANNOTATION, "-created_at", "-id")
+            return page_qs[: self.page_size], count_qs
+
+        if cursor is not None:
+            parts = [self.after_cursor(part, *cursor) for part in parts]
+        if len(parts) == 1:
+            page_qs = parts[0].order_by("-created_at", "-id")
+        else:
+            # compound SELECTs take no ORDER BY in their parts (SQLite)
+            page_qs = self._combine([part.order_by() for part in parts]).order_by(
+                "-created_at", "-id"
+            )
+        return page_qs[: self.page_size + 1], count_qs
+
+    @staticmethod
+    def _combine(parts):
+        return parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+
+    def _finish_page(self, rows):
+        self.has_next = not self.ranked and len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        self.next_cursor = None
+        if self.has_next:
+            last = rows[-1]
+            # model instances and named values_list rows both expose these
+            self.next_cursor = self.encode_cursor(last.created_at, last.id)
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        page_qs, count_qs = self._page_queryset(queryset, request)
+        if count_qs is not None:
+            self.count = count_qs.count()
+        return self._finish_page(list(page_qs))
+
+    async def apaginate_queryset(self, queryset, request):
+        """``paginate_queryset`` on the async ORM (for the async read views)."""
+
+        if not self.is_requested(request):
+            return None
+
+        page_qs, count_qs = self._page_queryset(queryset, request)
+        if count_qs is not None:
+            self.count = await count_qs.acount()
+        return self._finish_page([row async for row in page_qs])
+
+    def get_paginated_data(self, data) -> dict:
+        payload = {"next": self.get_next_link()}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return payload
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+
+class CommentCursorPagination(TicketCursorPagination):
+    """The same keyset over one ticket's comments, newest first.
+
+    ``ticket_id = ? AND (created_at, id) < cursor`` is a range on
+    ``comment_ticket_created_idx``. Opt-in (``?page_size=`` / ``?cursor=``):
+    a thread is short and the SPA loads it whole.
+    """
+
+    paginate_by_default = False
@@ -1,14 +1,83 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
 from .models import Ticket, Comment
 
 
-def user_in_groups(user, group_names: list[str]) -> bool:
-    if not user.is_authenticated:
-        return False
-    return user.groups.filter(name__in=group_names).exists()
+ROLE_GROUPS = ("ADMIN", "TECHNICIAN")
+
+# Process-level role cache: user_id -> (role, expires_at), least recently
+# used first; at most ROLE_CACHE_MAX_ENTRIES users.
+# Requests additionally memoize the role on the user instance itself.
+_role_cache: OrderedDict[int, tuple[str, float]] = OrderedDict()
+_role_cache_lock = threading.Lock()
+_ROLE_ATTR = "_helpdesk_role"
+
+
+def _role_cache_ttl() -> float:
+    return getattr(settings, "ROLE_CACHE_TTL", 60)
+
+
+def _role_cache_size() -> int:
+    return getattr(settings, "ROLE_CACHE_MAX_ENTRIES", 10000)
+
+
+def _role_from_group_names(names) -> str:
+    if "ADMIN" in names:
+        return "ADMIN"
+    if "TECHNICIAN" in names:
+        return "TECHNICIAN"
+    return "USER"
+
+
+def _role_groups_qs(user):
+    # single query: fetch only the role-relevant group names
+    return user.groups.filter(name__in=ROLE_GROUPS).values_list("name", flat=True)
+
+
+def _resolve_role_from_groups(user) -> str:
+    return _role_from_group_names(set(_role_groups_qs(user)))
+
+
+def _known_role(user) -> str | None:
+    """Role from the instance memo, superuser flag or process cache (no query)."""
+
+    if not user or not getattr(user, "is_authenticated", False):
+        return "ANON"
+
+    role = getattr(user, _ROLE_ATTR, None)
+    if role is not None:
+        return role
+
+    if getattr(user, "is_superuser", False):
+        role = "ADMIN"
+    else:
+        with _role_cache_lock:
+            cached = _role_cache.get(user.pk)
+            if cached is not None:
+                _role_cache.move_to_end(user.pk)
+        if cached is None or cached[1] <= time.monotonic():
+            return None
+        role = cached[0]
+
+    setattr(user, _ROLE_ATTR, role)
+    return role
+
+
+def _remember_role(user, role: str) -> str:
+    with _role_cache_lock:
+        _role_cache[user.pk] = (role, time.monotonic() + _role_cache_ttl())
+        _role_cache.move_to_end(user.pk)
+        while len(_role_cache) > _role_cache_size():
+            _role_cache.popitem(last=False)
+    setattr(user, _ROLE_ATTR, role)
+    return role
 
 
 def get_user_role(user) -> str:
@@ -18,15 +87,76 @@ def get_user_role(user) -> str:
       1) ADMIN (group ADMIN or superuser)
       2) TECHNICIAN (group TECHNICIAN)
       3) USER (default)
+
+    The role is resolved at most once per user instance (i.e. once per
+    request for ``request.user``) and shared between requests through a
+    process-level cache that expires after ``settings.ROLE_CACHE_TTL``.
     """
 
-    if not user or not getattr(user, "is_authenticated", False):
-        return "ANON"
-    if getattr(user, "is_superuser", False) or user_in_groups(user, ["ADMIN"]):
-        return "ADMIN"
-    if user_in_groups(user, ["TECHNICIAN"]):
-        return "TECHNICIAN"
-    return "USER"
+    role = _known_role(user)
+    if role is not None:
+        return role
+    return _remember_role(user, _resolve_role_from_groups(user))
+
+
+async def aget_user_role(user) -> str:
+    """``get_user_role`` for async views (async ORM on a cache miss).
+
+    Afterwards the role is memoized on ``user``, so the sync helpers
+    (``is_admin_user``, ``can_view_ticket`` ...) no longer touch the database.
+    """
+
+    role = _known_role(user)
+    if role is not None:
+        return role
+    names = {name async for name in _role_groups_qs(user)}
+    return _remember_role(user, _role_from_group_names(names))
+
+
+def set_cached_role(user, role: str) -> None:
+    """Attach an already known role to a user instance (skips resolution)."""
+
+    setattr(user, _ROLE_ATTR, role)
+
+
+def invalidate_user_role(user) -> None:
+    """Drop cached role for the user (call after changing group membership)."""
+
+    with _role_cache_lock:
+        _role_cache.pop(user.pk, None)
+    if hasattr(user, _ROLE_ATTR):
+        delattr(user, _ROLE_ATTR)
+
+
+def clear_role_cache() -> None:
+    with _role_cache_lock:
+        _role_cache.clear()
+
+
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """``m2m_changed`` receiver for ``User.groups``: drop the affected cached roles.
+
+    Catches every membership change, not only the API's (Django admin,
+    shell, ``group.user_set.add(...)``).
+    """
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        invalidate_user_role(instance)
+    elif pk_set:
+        with _role_cache_lock:
+            for pk in pk_set:
+                _role_cache.pop(pk, None)
+    else:
+        # group.user_set.clear(): the members are gone already
+        clear_role_cache()
+
+
+def group_changed(sender, **kwargs):
+    """``post_save`` / ``post_delete`` receiver for ``Group`` (rename, delete)."""
+
+    clear_role_cache()
 
 
 def is_admin_user(user) -> bool:
@@ -0,0 +1,213 @@
+"""EXPLAIN QUERY PLAN checks for the querysets the API runs.
+
+``global_cases`` / ``role_cases`` build the querysets as the views do
+(list pages through ``TicketCursorPagination``, comment pages, counters,
+SLA queues, job claims) and ``plan_problems`` reads SQLite's plan for each:
+
+- ``SCAN <table>`` without an index is always a problem (small lookup
+  tables excepted, ``ALLOWED_SCANS``);
+- ``SCAN <table> USING INDEX`` (a walk over the whole index) is accepted
+  only for list pages: they walk in list order and stop at the LIMIT;
+- ``USE TEMP B-TREE`` on a list page means every match is sorted before
+  the first row is returned; pages must come out of an index in order.
+
+Used by the test suite (own fixtures) and by ``check_query_plans`` (real
+data, optionally after ``ANALYZE``).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.request import Request
+
+from .models import Job, Ticket
+from .pagination import CommentCursorPagination, TicketCursorPagination
+from .representation import ticket_rows
+from .sla import ACTIVE_STATUSES, at_risk_filter, breached_filter, next_deadline
+from .views import (
+    CommentListCreateAPIView,
+    CommentRetrieveUpdateDestroyAPIView,
+    _filtered_ticket_parts,
+    _visible_ticket_qs,
+)
+
+_SCAN_RE = re.compile(r"\bSCAN (\S+)(.*)$")
+
+# Tiny lookup tables where a scan is expected and harmless.
+ALLOWED_SCANS = {"auth_group", "tickets_category", "tickets_ticketstats"}
+
+LIST_PARAMS = [
+    {},
+    {"status": "OPEN"},
+    {"priority": "HIGH"},
+    {"status": "OPEN", "priority": "HIGH"},
+    {"category": "1"},
+    {"assigned_to": "1"},
+    {"created_by": "me"},
+    {"created_by": "1"},
+    {"search": "vpn"},
+]
+
+ROLES = ("ADMIN", "TECHNICIAN", "USER")
+
+
+@dataclass
+class PlanCase:
+    label: str
+    queryset: object
+    # a LIMITed page in list order: may walk an index, must not sort
+    list_page: bool = False
+
+
+def _request(params=None) -> Request:
+    return Request(RequestFactory().get("/", params or {}))
+
+
+def _build_view(view_class, user, params=None, **kwargs):
+    view = view_class()
+    request = _request(params)
+    request.user = user
+    view.request = request
+    view.kwargs = kwargs
+    view.format_kwarg = None
+    return view
+
+
+def _page(paginator, queryset, params):
+    page_qs, _count_qs = paginator._page_queryset(queryset, _request(params))
+    return page_qs
+
+
+def plan_problems(case: PlanCase) -> list[str]:
+    """Offending plan lines of ``case`` (empty when the plan is fine)."""
+
+    problems = []
+    for line in case.queryset.explain().splitlines():
+        if "USE TEMP B-TREE" in line and case.list_page:
+            problems.append(line.strip())
+            continue
+        match = _SCAN_RE.search(line)
+        if not match:
+            continue
+        table, rest = match.groups()
+        if table.startswith("(") or "VIRTUAL TABLE" in rest or table in ALLOWED_SCANS:
+            continue
+        if "USING" not in rest or not case.list_page:
+            problems.append(line.strip())
+    return problems
+
+
+def global_cases() -> list[PlanCase]:
+    User = get_user_model()
+    now = timezone.now()
+    return [
+        PlanCase(
+            "login email lookup",
+            User.objects.annotate(email_lower=Lower("email")).filter(
+                email_lower=Lower(Value("someone@example.com"))
+            ),
+        ),
+        PlanCase(
+            "job claim (run_jobs)",
+            Job.objects.filter(status=Job.STATUS_PENDING, run_after__lte=now)
+            .order_by("run_after", "id")
+            .values_list("id", flat=True)[:20],
+        ),
+        PlanCase(
+            "expired job leases",
+            Job.objects.filter(status=Job.STATUS_RUNNING, locked_until__lt=now),
+        ),
+        PlanCase(
+            "SLA sweep (response)",
+            Ticket.objects.filter(
+                responded_at__isnull=True,
+                status__in=ACTIVE_STATUSES,
+                response_breached_at__isnull=True,
+                response_due_at__lt=now,
+            ).values_list("id", flat=True),
+        ),
+        PlanCase(
+            "SLA sweep (resolve)",
+            Ticket.objects.filter(
+                resolve_breached_at__isnull=True,
+                status__in=ACTIVE_STATUSES,
+                resolve_due_at__lt=now,
+            ).values_list("id", flat=True),
+        ),
+    ]
+
+
+def role_cases(role: str, user) -> list[PlanCase]:
+    now = timezone.now()
+    cursor = {"page_size": "50", "cursor": TicketCursorPagination().encode_cursor(now, 1)}
+    paginator = TicketCursorPagination()
+
+    cases = []
+    for params in LIST_PARAMS:
+        parts = [ticket_rows(part) for part in _filtered_ticket_parts(user, params)]
+        cases.append(
+            PlanCase(
+                f"ticket list page {params}",
+                _page(paginator, parts, {"page_size": "50"}),
+                # full-text matches come from the FTS index, in no created_at order
+                list_page="search" not in params,
+            )
+        )
+    parts = [ticket_rows(part) for part in _filtered_ticket_parts(user, {})]
+    cases.append(PlanCase("ticket list (keyset page)", _page(paginator, parts, cursor), list_page=True))
+
+    visible = _visible_ticket_qs(user)
+    # COUNT(*) reads no joined columns: explain the counters without select_related
+    counted = visible.order_by().values("pk")
+    cases.append(PlanCase("ticket detail", visible.order_by().filter(pk=1)))
+    cases.append(
+        PlanCase(
+            "overdue counter",
+            counted.filter(due_date__isnull=False, due_date__lt=now.date()).exclude(
+                status__in=["RESOLVED", "CLOSED"]
+            ),
+        )
+    )
+    if role != "USER":
+        horizon = now + timedelta(hours=1)
+        for include_breached in (False, True):
+            # ordered by deadline over the (small) at-risk set: sorting is expected
+            cases.append(
+                PlanCase(
+                    f"SLA at-risk queue (breached={include_breached})",
+                    visible.filter(at_risk_filter(horizon, include_breached))
+                    .annotate(sla_deadline=next_deadline())
+                    .order_by("sla_deadline", "id")[:100],
+                )
+            )
+        cases.append(PlanCase("SLA breach counter", counted.filter(breached_filter())))
+
+    ticket = visible.first()
+    if ticket is not None:
+        comments = _build_view(CommentListCreateAPIView, user, ticket_id=ticket.pk).get_queryset()
+        comment_paginator = CommentCursorPagination()
+        cases.append(
+            PlanCase(
+                "comment list page",
+                _page(comment_paginator, comments, {"page_size": "50"}),
+                list_page=True,
+            )
+        )
+        cases.append(
+            PlanCase(
+                "comment list (keyset page)",
+                _page(comment_paginator, comments, cursor),
+                list_page=True,
+            )
+        )
+    comment_detail = _build_view(CommentRetrieveUpdateDestroyAPIView, user).get_queryset()
+    cases.append(PlanCase("comment detail", comment_detail.filter(pk=1)))
+    return cases
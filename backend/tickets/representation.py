@@ -0,0 +1,318 @@
+"""Read-only ticket rendering straight from ``values_list`` rows.
+
+``TicketSerializer`` builds a serializer field tree per ticket (plus two
+nested ``UserBriefSerializer`` instances) and instantiates full model
+objects for the ticket, both users and the category. For reads none of
+that is needed: ``TICKET_ROW_FIELDS`` fetches the same data as flat tuples
+in one query and ``render_tickets`` turns them into the exact JSON shape
+of ``TicketSerializer(...).data``.
+
+Writes (create / update / status / assign) keep using ``TicketSerializer``
+and its validators; only list and detail GETs take this path. Keep the two
+in sync when a field is added to the serializer.
+
+Sparse fieldsets: ``?fields=id,title,status`` limits the output keys and
+the SQL projection to what was asked for (user / category joins disappear
+when no field needs them); the nested user objects are only included when
+named in ``?expand=created_by_user,assigned_to_user`` (or in ``fields``).
+Without ``fields`` the full shape is returned.
+
+Comment counters are plain ticket columns (see ``counters.py``). Users who
+cannot see internal comments get ``internal_comment_count: null`` and the
+time of the last *public* comment as ``last_comment_at``
+(``include_internal=False``).
+"""
+
+from __future__ import annotations
+
+from django.db.models import Count, Max, Sum
+from django.utils import timezone
+from rest_framework import ISO_8601
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import DateField, DateTimeField
+from rest_framework.settings import api_settings
+
+# Order matters: render_ticket unpacks rows positionally.
+TICKET_ROW_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "created_at",
+    "updated_at",
+    "created_by_id",
+    "created_by__username",
+    "created_by__email",
+    "assigned_to_id",
+    "assigned_to__username",
+    "assigned_to__email",
+    "category_id",
+    "due_date",
+    "public_comment_count",
+    "internal_comment_count",
+    "last_comment_at",
+    "last_public_comment_at",
+    "response_due_at",
+    "resolve_due_at",
+    "responded_at",
+    "response_breached_at",
+    "resolve_breached_at",
+)
+
+
+# Output key -> (lookups it reads, kind). Same keys and order as TicketSerializer.
+TICKET_FIELDS = {
+    "id": (("id",), "value"),
+    "title": (("title",), "value"),
+    "description": (("description",), "value"),
+    "status": (("status",), "value"),
+    "priority": (("priority",), "value"),
+    "created_at": (("created_at",), "datetime"),
+    "updated_at": (("updated_at",), "datetime"),
+    "created_by": (("created_by_id",), "value"),
+    "created_by_user": (("created_by_id", "created_by__username", "created_by__email"), "user"),
+    "assigned_to": (("assigned_to_id",), "value"),
+    "assigned_to_user": (("assigned_to_id", "assigned_to__username", "assigned_to__email"), "user"),
+    "category": (("category_id",), "value"),
+    "due_date": (("due_date",), "date"),
+    "public_comment_count": (("public_comment_count",), "value"),
+    "internal_comment_count": (("internal_comment_count",), "internal_count"),
+    "last_comment_at": (("last_comment_at", "last_public_comment_at"), "last_comment"),
+    "response_due_at": (("response_due_at",), "datetime"),
+    "resolve_due_at": (("resolve_due_at",), "datetime"),
+    "responded_at": (("responded_at",), "datetime"),
+    "response_breached_at": (("response_breached_at",), "datetime"),
+    "resolve_breached_at": (("resolve_breached_at",), "datetime"),
+}
+EXPANDABLE_FIELDS = ("created_by_user", "assigned_to_user")
+
+# Always fetched: cursor pagination and ETags need them
+_REQUIRED_LOOKUPS = ("id", "created_at", "updated_at")
+
+# Columns changed without touching updated_at (comment triggers, SLA updates)
+_COUNTER_LOOKUPS = (
+    "public_comment_count", "internal_comment_count", "last_comment_at", "last_public_comment_at",
+    "responded_at", "response_breached_at", "resolve_breached_at",
+)
+
+
+def _list_state_aggregates() -> dict:
+    return {
+        "n": Count("id"),
+        "last": Max("updated_at"),
+        "public_comments": Sum("public_comment_count"),
+        "internal_comments": Sum("internal_comment_count"),
+        "last_comment": Max("last_comment_at"),
+        # set once, to "now": a new value is always the new maximum
+        "last_response": Max("responded_at"),
+        "last_response_breach": Max("response_breached_at"),
+        "last_resolve_breach": Max("resolve_breached_at"),
+    }
+
+
+def ticket_list_state(queryset) -> dict:
+    """Aggregate validator of an unpaginated ticket list: changes whenever a listed row would.
+
+    ``updated_at`` does not move when comments are added or SLA events are
+    recorded, so the counters and SLA timestamps are part of it too (same
+    scan, no extra query). The row count catches deletions, which leave
+    ``Max(updated_at)`` as it was. Pages use ``ticket_page_state`` instead.
+    """
+
+    return queryset.order_by().aggregate(**_list_state_aggregates())
+
+
+async def aticket_list_state(queryset) -> dict:
+    return await queryset.order_by().aaggregate(**_list_state_aggregates())
+
+
+def ticket_row_state(row) -> tuple:
+    """Counter and SLA event columns of a ``ticket_rows`` row for its ETag (None when not selected)."""
+
+    return tuple(getattr(row, lookup, None) for lookup in _COUNTER_LOOKUPS)
+
+
+def ticket_page_state(rows) -> list[tuple]:
+    """Validator parts of a fetched list page: id, ``updated_at`` and counters per row.
+
+    Built from the rows the page already read, so a paginated request costs
+    no aggregate over every visible ticket.
+    """
+
+    return [(row.id, row.updated_at, *ticket_row_state(row)) for row in rows]
+
+
+def _split(value) -> list[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def requested_ticket_fields(params) -> tuple[str, ...] | None:
+    """Output keys selected by ``?fields=`` / ``?expand=``, or None for the full shape."""
+
+    fields = _split(params.get("fields"))
+    expand = _split(params.get("expand"))
+    if not fields:
+        return None
+
+    errors = {}
+    unknown = [name for name in fields if name not in TICKET_FIELDS]
+    if unknown:
+        errors["fields"] = f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(TICKET_FIELDS)}."
+    unknown = [name for name in expand if name not in EXPANDABLE_FIELDS]
+    if unknown:
+        errors["expand"] = f"Unknown expansion(s): {', '.join(unknown)}. Allowed: {', '.join(EXPANDABLE_FIELDS)}."
+    if errors:
+        raise ValidationError(errors)
+
+    selected = set(fields) | set(expand)
+    return tuple(name for name in TICKET_FIELDS if name in selected)
+
+
+def ticket_rows(queryset, keys=None):
+    """Named ``values_list`` rows (``row.id``, ``row.created_at`` ...) for ``queryset``.
+
+    With ``keys`` (from ``requested_ticket_fields``) only the columns those
+    keys need are selected, plus id and the timestamps.
+    """
+
+    if keys is None:
+        return queryset.values_list(*TICKET_ROW_FIELDS, named=True)
+
+    lookups = list(_REQUIRED_LOOKUPS)
+    for key in keys:
+        for lookup in TICKET_FIELDS[key][0]:
+            if lookup not in lookups:
+                lookups.append(lookup)
+    return queryset.values_list(*lookups, named=True)
+
+
+def datetime_formatter():
+    """Same output as DRF ``DateTimeField.to_representation``, without the field."""
+
+    if api_settings.DATETIME_FORMAT != ISO_8601:
+        return DateTimeField().to_representation
+
+    tz = timezone.get_current_timezone()
+
+    def format_datetime(value):
+        if value is None:
+            return None
+        value = value.astimezone(tz).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return format_datetime
+
+
+def date_formatter():
+    if api_settings.DATE_FORMAT != ISO_8601:
+        return DateField().to_representation
+    return lambda value: value.isoformat() if value is not None else None
+
+
+def render_ticket(row, format_datetime, format_date, include_internal=True):
+    (
+        pk, title, description, status, priority, created_at, updated_at,
+        created_by_id, created_by_username, created_by_email,
+        assigned_to_id, assigned_to_username, assigned_to_email,
+        category_id, due_date,
+        public_comment_count, internal_comment_count, last_comment_at, last_public_comment_at,
+        response_due_at, resolve_due_at, responded_at, response_breached_at, resolve_breached_at,
+    ) = row
+    return {
+        "id": pk,
+        "title": title,
+        "description": description,
+        "status": status,
+        "priority": priority,
+        "created_at": format_datetime(created_at),
+        "updated_at": format_datetime(updated_at),
+        "created_by": created_by_id,
+        "created_by_user": {
+            "id": created_by_id,
+            "username": created_by_username,
+            "email": created_by_email,
+        },
+        "assigned_to": assigned_to_id,
+        "assigned_to_user": (
+            {"id": assigned_to_id, "username": assigned_to_username, "email": assigned_to_email}
+            if assigned_to_id is not None
+            else None
+        ),
+        "category": category_id,
+        "due_date": format_date(due_date),
+        "public_comment_count": public_comment_count,
+        "internal_comment_count": internal_comment_count if include_internal else None,
+        "last_comment_at": format_datetime(
+            last_comment_at if include_internal else last_public_comment_at
+        ),
+        "response_due_at": format_datetime(response_due_at),
+        "resolve_due_at": format_datetime(resolve_due_at),
+        "responded_at": format_datetime(responded_at),
+        "response_breached_at": format_datetime(response_breached_at),
+        "resolve_breached_at": format_datetime(resolve_breached_at),
+    }
+
+
+def ticket_renderer(keys=None, include_internal=True):
+    """Return ``render(row) -> dict`` for rows from ``ticket_rows(queryset, keys)``."""
+
+    if keys is not None:
+        return sparse_renderer(keys, include_internal)
+
+    format_datetime = datetime_formatter()
+    format_date = date_formatter()
+    return lambda row: render_ticket(row, format_datetime, format_date, include_internal)
+
+
+def render_tickets(rows, keys=None, include_internal=True) -> list[dict]:
+    """Render rows from ``ticket_rows(queryset, keys)`` (same ``keys``)."""
+
+    render = ticket_renderer(keys, include_internal)
+    return [render(row) for row in rows]
+
+
+def sparse_renderer(keys, include_internal=True):
+    """Return ``render(row) -> dict`` for rows from ``ticket_rows(..., keys)``."""
+
+    format_datetime = datetime_formatter()
+    format_date = date_formatter()
+    getters = []
+    for key in keys:
+        lookups, kind = TICKET_FIELDS[key]
+        if kind == "user":
+            pk, username, email = lookups
+
+            def getter(row, pk=pk, username=username, email=email):
+                if getattr(row, pk) is None:
+                    return None
+                return {"id": getattr(row, pk), "username": getattr(row, username), "email": getattr(row, email)}
+
+        elif kind == "datetime":
+            def getter(row, attr=lookups[0]):
+                return format_datetime(getattr(row, attr))
+
+        elif kind == "date":
+            def getter(row, attr=lookups[0]):
+                return format_date(getattr(row, attr))
+
+        elif kind == "internal_count":
+            def getter(row, attr=lookups[0]):
+                return getattr(row, attr) if include_internal else None
+
+        elif kind == "last_comment":
+            def getter(row, attr=lookups[0 if include_internal else 1]):
+                return format_datetime(getattr(row, attr))
+
+        else:
+            def getter(row, attr=lookups[0]):
+                return getattr(row, attr)
+
+        getters.append((key, getter))
+
+    def render(row):
+        return {key: getter(row) for key, getter in getters}
+
+    return render
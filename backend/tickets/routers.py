@@ -0,0 +1,191 @@
+"""Read replica routing.
+
+Only the read-heavy endpoints (ticket / comment lists, stats, technician
+list, export) read from ``settings.REPLICA_DATABASE_ALIAS``; they opt in
+with ``ReplicaReadMixin`` (DRF views) or ``async_read_view(read_replica=True)``,
+which put the alias into a context variable for the duration of the request.
+``ReplicaRouter.db_for_read`` returns that variable, so every other read (auth,
+roles, detail views, reads inside writes) and every write stays on
+``default``.
+
+A replica lags behind the primary. After a successful write request
+(``ReplicaPinMiddleware``) the user is pinned to the primary for
+``REPLICA_PIN_SECONDS``, so they always see their own changes; other users
+may see them only after the next replication. The pin lives in the
+``default`` cache - with several server processes that has to be a shared
+cache.
+
+Without the replica alias in ``DATABASES`` all of this is a no-op.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+_read_alias: ContextVar[str | None] = ContextVar("tickets_read_alias", default=None)
+
+
+def replica_alias() -> str | None:
+    """The configured replica alias, or None when there is no replica."""
+
+    alias = getattr(settings, "REPLICA_DATABASE_ALIAS", None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def current_read_alias() -> str | None:
+    return _read_alias.get()
+
+
+@contextmanager
+def reading_from(alias: str | None):
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+# =========================
+# read-your-writes pinning
+# =========================
+
+def _pin_cache():
+    return caches["default"]
+
+
+def _pin_key(user_id) -> str:
+    return f"replica-pin:{user_id}"
+
+
+def _pin_seconds() -> int:
+    return getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+
+def pin_to_primary(user) -> None:
+    if replica_alias() is None or _pin_seconds() <= 0:
+        return
+    _pin_cache().set(_pin_key(user.pk), True, _pin_seconds())
+
+
+def _replica_candidate(request) -> bool:
+    return replica_alias() is not None and request.method in SAFE_METHODS
+
+
+def read_alias_for(request) -> str | None:
+    """Replica alias for a safe request of a user without a recent write, else None."""
+
+    if not _replica_candidate(request):
+        return None
+    user = request.user
+    if user.is_authenticated and _pin_cache().get(_pin_key(user.pk)):
+        return None
+    return replica_alias()
+
+
+async def aread_alias_for(request) -> str | None:
+    if not _replica_candidate(request):
+        return None
+    user = request.user
+    if user.is_authenticated:
+        cache = _pin_cache()
+        if isinstance(cache, LocMemCache):
+            # in-process dict: no I/O, no reason to leave the event loop
+            pinned = cache.get(_pin_key(user.pk))
+        else:
+            pinned = await cache.aget(_pin_key(user.pk))
+        if pinned:
+            return None
+    return replica_alias()
+
+
+class ReplicaPinMiddleware:
+    """Pin the user to the primary after every successful non-safe request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self._is_write(request, response):
+            self._pin(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._is_write(request, response):
+            # request.user may still be a lazy session lookup (sync ORM)
+            await sync_to_async(self._pin)(request)
+        return response
+
+    def _is_write(self, request, response) -> bool:
+        return (
+            replica_alias() is not None
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        )
+
+    def _pin(self, request) -> None:
+        # DRF sets the token-authenticated user on the underlying HttpRequest
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user)
+
+
+class ReplicaReadMixin:
+    """DRF view mixin: safe requests read from the replica (see ``read_alias_for``)."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # after authentication: the pin is per user
+        self._read_alias_token = _read_alias.set(read_alias_for(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_read_alias_token", None)
+        if token is not None:
+            self._read_alias_token = None
+            _read_alias.reset(token)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+# =========================
+# router
+# =========================
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # never follow a replica-loaded instance's _state.db
+        return DEFAULT_DB_ALIAS if replica_alias() else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        replica = replica_alias()
+        if replica is None:
+            return None
+        aliases = {DEFAULT_DB_ALIAS, replica}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # the replica gets schema and data from the primary (sync_replica)
+        if db == replica_alias():
+            return False
+        return None
@@ -0,0 +1,213 @@
+"""Full-text ticket search backed by SQLite FTS5.
+
+The index lives in two external-content FTS5 tables created by migration
+0003 and kept in sync by SQL triggers on ``tickets_ticket`` and
+``tickets_comment`` (so ``bulk_create``/``QuerySet.update`` stay in sync too):
+
+- ``tickets_ticket_fts``: title + description, rowid = ticket id
+- ``tickets_comment_fts``: message, rowid = comment id (ticket_id and
+  visibility stored UNINDEXED for filtering)
+
+On other database backends search falls back to ``icontains``.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Comment
+
+TICKET_FTS_TABLE = "tickets_ticket_fts"
+COMMENT_FTS_TABLE = "tickets_comment_fts"
+
+# annotation holding the bm25 rank (lower = better); pagination orders by it
+RANK_ANNOTATION = "search_rank"
+
+# bm25 column weights: a hit in the title counts more than in the description
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# Idempotent DDL. Re-run it from any migration that makes Django's SQLite
+# backend rebuild tickets_ticket / tickets_comment (the rebuild drops triggers).
+SCHEMA_SQL = [
+    # --- tickets: title + description ---
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tickets_ticket_fts USING fts5(
+        title,
+        description,
+        content='tickets_ticket',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_ticket_fts_ai AFTER INSERT ON tickets_ticket BEGIN
+        INSERT INTO tickets_ticket_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_ticket_fts_ad AFTER DELETE ON tickets_ticket BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_ticket_fts_au AFTER UPDATE OF title, description ON tickets_ticket
+    WHEN old.title IS NOT new.title OR old.description IS NOT new.description
+    BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO tickets_ticket_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # --- comments: message (+ ticket_id / visibility for filtering) ---
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tickets_comment_fts USING fts5(
+        message,
+        ticket_id UNINDEXED,
+        visibility UNINDEXED,
+        content='tickets_comment',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_comment_fts_ai AFTER INSERT ON tickets_comment BEGIN
+        INSERT INTO tickets_comment_fts(rowid, message, ticket_id, visibility)
+        VALUES (new.id, new.message, new.ticket_id, new.visibility);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_comment_fts_ad AFTER DELETE ON tickets_comment BEGIN
+        INSERT INTO tickets_comment_fts(tickets_comment_fts, rowid, message, ticket_id, visibility)
+        VALUES ('delete', old.id, old.message, old.ticket_id, old.visibility);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_comment_fts_au AFTER UPDATE OF message, ticket_id, visibility ON tickets_comment
+    WHEN old.message IS NOT new.message
+        OR old.ticket_id IS NOT new.ticket_id
+        OR old.visibility IS NOT new.visibility
+    BEGIN
+        INSERT INTO tickets_comment_fts(tickets_comment_fts, rowid, message, ticket_id, visibility)
+        VALUES ('delete', old.id, old.message, old.ticket_id, old.visibility);
+        INSERT INTO tickets_comment_fts(rowid, message, ticket_id, visibility)
+        VALUES (new.id, new.message, new.ticket_id, new.visibility);
+    END
+    """,
+]
+
+REBUILD_SQL = [
+    "INSERT INTO tickets_ticket_fts(tickets_ticket_fts) VALUES ('rebuild')",
+    "INSERT INTO tickets_comment_fts(tickets_comment_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS tickets_comment_fts_au",
+    "DROP TRIGGER IF EXISTS tickets_comment_fts_ad",
+    "DROP TRIGGER IF EXISTS tickets_comment_fts_ai",
+    "DROP TABLE IF EXISTS tickets_comment_fts",
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_au",
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_ad",
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_ai",
+    "DROP TABLE IF EXISTS tickets_ticket_fts",
+]
+
+
+def ensure_search_schema(connection) -> None:
+    """Create FTS tables and triggers if missing (no-op outside SQLite)."""
+
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for sql in SCHEMA_SQL:
+            cursor.execute(sql)
+
+
+def drop_search_schema(connection) -> None:
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for sql in DROP_SQL:
+            cursor.execute(sql)
+
+
+def rebuild_search_index(connection) -> None:
+    """Re-read every ticket/comment into the index in one statement per table."""
+
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for sql in REBUILD_SQL:
+            cursor.execute(sql)
+
+
+def is_fts_enabled(using: str = "default") -> bool:
+    return connections[using].vendor == "sqlite"
+
+
+def build_match_expression(text: str) -> str | None:
+    """Turn free text into an FTS5 query: every word must match as a prefix.
+
+    ``"vpn conn"`` -> ``"vpn"* "conn"*``. Quoting each token keeps FTS5
+    operators typed by the user (AND, NEAR, ``-`` ...) from being interpreted.
+    """
+
+    tokens = _TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def _icontains_search(queryset, text: str):
+    return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+
+def apply_ticket_search(queryset, text: str, include_internal: bool = False):
+    """Filter ``queryset`` to tickets matching ``text`` and order by relevance.
+
+    Matches ticket title/description and comment messages. Internal comments
+    are only searched when ``include_internal`` is True (support/admin).
+    Tickets matching only through comments are ranked after direct hits.
+    """
+
+    match = build_match_expression(text)
+    if match is None or not is_fts_enabled(queryset.db):
+        return _icontains_search(queryset, text)
+
+    comment_sql = (
+        f"SELECT ticket_id FROM {COMMENT_FTS_TABLE} WHERE {COMMENT_FTS_TABLE} MATCH %s"
+    )
+    comment_params = [match]
+    if not include_internal:
+        comment_sql += " AND visibility = %s"
+        comment_params.append(Comment.VISIBILITY_PUBLIC)
+
+    matching_ids = RawSQL(
+        f"SELECT rowid FROM {TICKET_FTS_TABLE} WHERE {TICKET_FTS_TABLE} MATCH %s "
+        f"UNION {comment_sql}",
+        [match, *comment_params],
+    )
+
+    table = queryset.model._meta.db_table
+    rank = RawSQL(
+        f"COALESCE((SELECT bm25({TICKET_FTS_TABLE}, %s, %s) FROM {TICKET_FTS_TABLE} "
+        f'WHERE {TICKET_FTS_TABLE} MATCH %s AND rowid = "{table}"."id"), 0.0)',
+        [TITLE_WEIGHT, DESCRIPTION_WEIGHT, match],
+    )
+
+    ordering = queryset.query.order_by
+    return (
+        queryset.filter(id__in=matching_ids)
+        .annotate(**{RANK_ANNOTATION: rank})
+        .order_by(RANK_ANNOTATION, *ordering)
+    )
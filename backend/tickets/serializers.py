@@ -4,7 +4,9 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from .models import Category, Ticket, Comment
-from .permissions import is_support_or_admin, get_user_role
+from .permissions import is_support_or_admin, get_user_role, invalidate_user_role
+from .authentication import invalidate_user_tokens
+from .events import hub
 
 class UserBriefSerializer(serializers.ModelSerializer):
     class Meta:
@@ -45,6 +47,14 @@ class TicketSerializer(serializers.ModelSerializer):
             "assigned_to_user",
             "category",
             "due_date",
+            "public_comment_count",
+            "internal_comment_count",
+            "last_comment_at",
+            "response_due_at",
+            "resolve_due_at",
+            "responded_at",
+            "response_breached_at",
+            "resolve_breached_at",
         ]
         read_only_fields = [
             "id",
@@ -52,8 +62,36 @@ class TicketSerializer(serializers.ModelSerializer):
             "updated_at",
             "created_by",
             "assigned_to",
+            "public_comment_count",
+            "internal_comment_count",
+            "last_comment_at",
+            "response_due_at",
+            "resolve_due_at",
+            "responded_at",
+            "response_breached_at",
+            "resolve_breached_at",
         ]
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get("request")
+        if request is not None and not is_support_or_admin(request.user):
+            # same rule as the comment list: no trace of internal comments
+            last_public = instance.last_public_comment_at
+            data["internal_comment_count"] = None
+            data["last_comment_at"] = (
+                self.fields["last_comment_at"].to_representation(last_public) if last_public else None
+            )
+        return data
+
+    def update(self, instance, validated_data):
+        # only the columns this request changes: status and assignment have
+        # their own compare-and-set UPDATEs that may have run since the read
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
     # ---- Business validators ----
 
     def validate_title(self, value):
@@ -97,6 +135,35 @@ class TicketAssignSerializer(serializers.Serializer):
         return value
 
 
+class TicketBulkUpdateSerializer(serializers.Serializer):
+    """Body of POST /api/tickets/bulk/.
+
+    { "ids": [1, 2, 3], "status": "CLOSED" }
+    { "ids": [1, 2, 3], "assigned_to": 5 }
+    { "ids": [1, 2, 3], "priority": "CRITICAL" }
+    (fields can be combined)
+    """
+
+    MAX_IDS = 500
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
+    status = serializers.ChoiceField(choices=Ticket.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Ticket.PRIORITY_CHOICES, required=False)
+    assigned_to = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_assigned_to(self, value):
+        return TicketAssignSerializer().validate_assigned_to(value)
+
+    def validate(self, attrs):
+        if not any(key in attrs for key in ("status", "priority", "assigned_to")):
+            raise ValidationError("Provide at least one of: status, priority, assigned_to.")
+        return attrs
+
+
 class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
@@ -162,6 +229,8 @@ class AdminUserSerializer(serializers.ModelSerializer):
         else:
             user_obj.is_staff = False
 
+        invalidate_user_role(user_obj)
+
     
     def create(self, validated_data):
         role = validated_data.pop("role", "USER")
@@ -194,4 +263,7 @@ class AdminUserSerializer(serializers.ModelSerializer):
             self._set_role(instance, role)
 
         instance.save()
+        # role / is_active / profile may have changed -> drop cached auth snapshots
+        invalidate_user_tokens(instance)
+        hub.disconnect_user(instance.pk)
         return instance
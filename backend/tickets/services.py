@@ -1,20 +1,234 @@
 from abc import ABC, abstractmethod
 from django.utils import timezone
-from .models import Ticket
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from .db import write_transaction
+from .events import publish_ticket_event
+from .models import Ticket, TicketStatusEvent
+from .notifications import notify_ticket, notify_tickets
+from .sla import recompute_deadlines, status_change_updates
+from .permissions import (
+    can_assign_ticket,
+    can_change_ticket_status,
+    can_edit_ticket,
+)
 
 class TicketCommand(ABC):
     @abstractmethod
     def execute(self):
         pass
 
+class TicketStatusConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Ticket status was changed by someone else. Reload and try again."
+    default_code = "status_conflict"
+
+
 class ChangeTicketStatusCommand(TicketCommand):
-    def __init__(self, ticket: Ticket, new_status: str, performed_by):
+    """Change status with a compare-and-set UPDATE and record the transition.
+
+    Only ``status``/``updated_at`` (and the SLA clocks the change stops, see
+    ``sla.py``) are written, and only if the row still has the status we read
+    (``WHERE id = ? AND status = <old>``). A concurrent change makes the
+    UPDATE match 0 rows -> ``TicketStatusConflict`` (409).
+    """
+
+    def __init__(self, ticket: Ticket, new_status: str, performed_by, *, by_support: bool = True):
         self.ticket = ticket
         self.new_status = new_status
         self.performed_by = performed_by
+        # False for an owner editing their ticket: not a support response
+        self.by_support = by_support
 
     def execute(self):
+        old_status = self.ticket.status
+        valid_statuses = {key for key, _ in Ticket.STATUS_CHOICES}
+        if self.new_status not in valid_statuses:
+            raise ValidationError({"status": "Invalid status."})
+        if old_status == "CLOSED" and self.new_status != "CLOSED":
+            raise ValidationError({"status": "Closed ticket cannot be reopened."})
+        if old_status == self.new_status:
+            return self.ticket
+
+        now = timezone.now()
+        with write_transaction():
+            updated = Ticket.objects.filter(pk=self.ticket.pk, status=old_status).update(
+                status=self.new_status,
+                updated_at=now,
+                **status_change_updates(self.new_status, now, by_support=self.by_support),
+            )
+            if not updated:
+                raise TicketStatusConflict()
+            TicketStatusEvent.objects.create(
+                ticket_id=self.ticket.pk,
+                from_status=old_status,
+                to_status=self.new_status,
+                changed_by=self.performed_by,
+                created_at=now,
+            )
+            self.ticket.refresh_from_db(fields=list(Ticket.SLA_EVENT_FIELDS))
+            notify_ticket(
+                "status_changed",
+                self.ticket,
+                self.performed_by,
+                from_status=old_status,
+                to_status=self.new_status,
+            )
+
         self.ticket.status = self.new_status
-        self.ticket.updated_at = timezone.now()
-        self.ticket.save()
+        self.ticket.updated_at = now
+        publish_ticket_event("status_changed", self.ticket, from_status=old_status)
         return self.ticket
+
+
+class BulkTicketUpdateCommand(TicketCommand):
+    """Apply the same status / assignment / priority change to many tickets.
+
+    Every ticket is checked with the same rules as the single-ticket endpoints
+    (visibility, can_change_ticket_status, can_assign_ticket, can_edit_ticket,
+    "closed cannot be reopened"). Allowed tickets are written with one UPDATE
+    inside a single transaction. Returns a per-id result list.
+
+    ``changes`` may contain ``status``, ``priority`` and ``assigned_to``
+    (already validated values, see ``TicketBulkUpdateSerializer``).
+    """
+
+    def __init__(self, queryset, ticket_ids: list[int], changes: dict, performed_by):
+        # queryset = tickets visible for performed_by
+        self.queryset = queryset
+        self.ticket_ids = list(dict.fromkeys(ticket_ids))
+        self.changes = changes
+        self.performed_by = performed_by
+
+    def _check(self, ticket: Ticket) -> str | None:
+        user = self.performed_by
+        if "status" in self.changes:
+            if not can_change_ticket_status(user, ticket):
+                return "You do not have permission to change status for this ticket."
+            if ticket.status == "CLOSED" and self.changes["status"] != "CLOSED":
+                return "Closed ticket cannot be reopened."
+        if "assigned_to" in self.changes:
+            if not can_assign_ticket(user, ticket, self.changes["assigned_to"]):
+                return "You do not have permission to (re)assign this ticket."
+        if "priority" in self.changes:
+            if not can_edit_ticket(user, ticket):
+                return "You do not have permission to edit this ticket."
+        return None
+
+    def _notifications(self, ticket: Ticket, values: dict):
+        """E-mail notifications for one updated ticket (before ``_publish`` applies ``values``)."""
+
+        if "status" in values and values["status"] != ticket.status:
+            yield (
+                "status_changed",
+                ticket,
+                self.performed_by,
+                {"from_status": ticket.status, "to_status": values["status"]},
+            )
+        if "assigned_to_id" in values and values["assigned_to_id"] != ticket.assigned_to_id:
+            yield (
+                "assigned",
+                ticket,
+                self.performed_by,
+                {"previous_assigned_to": ticket.assigned_to_id},
+            )
+
+    def _publish(self, ticket: Ticket, values: dict) -> None:
+        old_status = ticket.status
+        previous_assigned_to_id = ticket.assigned_to_id
+        for field, value in values.items():
+            setattr(ticket, field, value)
+
+        if "status" in values and values["status"] != old_status:
+            publish_ticket_event("status_changed", ticket, from_status=old_status)
+        elif "assigned_to_id" in values:
+            publish_ticket_event(
+                "assigned", ticket, previous_assigned_to_id=previous_assigned_to_id
+            )
+        else:
+            publish_ticket_event("updated", ticket)
+
+    def execute(self):
+        results = {}
+        with write_transaction():
+            tickets = self.queryset.select_related(None).filter(id__in=self.ticket_ids).only(
+                "id", "status", "priority", "assigned_to_id", "created_by_id"
+            )
+            allowed = []
+            by_id = {}
+            old_statuses = {}
+            for ticket in tickets:
+                error = self._check(ticket)
+                if error:
+                    results[ticket.id] = {"id": ticket.id, "ok": False, "error": error}
+                else:
+                    allowed.append(ticket.id)
+                    old_statuses[ticket.id] = ticket.status
+                    by_id[ticket.id] = ticket
+
+            if allowed:
+                now = timezone.now()
+                values = {"updated_at": now}
+                if "status" in self.changes:
+                    values["status"] = self.changes["status"]
+                if "priority" in self.changes:
+                    values["priority"] = self.changes["priority"]
+                if "assigned_to" in self.changes:
+                    values["assigned_to_id"] = self.changes["assigned_to"]
+
+                qs = Ticket.objects.filter(id__in=allowed)
+                reopening = values.get("status", "CLOSED") != "CLOSED"
+                if reopening:
+                    # re-check in SQL: a ticket closed meanwhile stays closed
+                    qs = qs.exclude(status="CLOSED")
+                sla_values = {}
+                if "status" in values:
+                    sla_values = status_change_updates(values["status"], now)
+                updated = qs.update(**values, **sla_values)
+
+                closed_meanwhile = set()
+                if reopening and updated != len(allowed):
+                    closed_meanwhile = set(
+                        Ticket.objects.filter(id__in=allowed, status="CLOSED")
+                        .values_list("id", flat=True)
+                    )
+
+                if "status" in self.changes:
+                    TicketStatusEvent.objects.bulk_create(
+                        TicketStatusEvent(
+                            ticket_id=ticket_id,
+                            from_status=old_statuses[ticket_id],
+                            to_status=self.changes["status"],
+                            changed_by=self.performed_by,
+                            created_at=now,
+                        )
+                        for ticket_id in allowed
+                        if ticket_id not in closed_meanwhile
+                        and old_statuses[ticket_id] != self.changes["status"]
+                    )
+
+                if "priority" in values:
+                    # deadlines follow the new priority (a second UPDATE: the
+                    # CASE over priority would still see the old value)
+                    recompute_deadlines(
+                        Ticket.objects.filter(id__in=allowed).exclude(id__in=closed_meanwhile)
+                    )
+
+                notifications = []
+                for ticket_id in allowed:
+                    if ticket_id in closed_meanwhile:
+                        results[ticket_id] = {
+                            "id": ticket_id,
+                            "ok": False,
+                            "error": "Closed ticket cannot be reopened.",
+                        }
+                    else:
+                        results[ticket_id] = {"id": ticket_id, "ok": True}
+                        notifications.extend(self._notifications(by_id[ticket_id], values))
+                        self._publish(by_id[ticket_id], values)
+                notify_tickets(notifications)
+
+        return [
+            results.get(ticket_id, {"id": ticket_id, "ok": False, "error": "Not found."})
+            for ticket_id in self.ticket_ids
+        ]
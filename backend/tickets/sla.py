@@ -0,0 +1,253 @@
+"""SLA deadlines per priority / category, stored on the ticket.
+
+Every ticket gets two deadlines when it is created - ``response_due_at``
+and ``resolve_due_at``, ``created_at`` plus the targets of its
+``SlaPolicy`` - and they are recomputed when its priority or category
+changes. A policy for the ticket's category wins over the category-less
+one of its priority; without a policy the deadlines stay NULL.
+
+The response clock stops at the first support action (status change, or a
+public comment by a TECHNICIAN / ADMIN): ``responded_at``. The resolve
+clock stops at RESOLVED / CLOSED. A clock stopped after its deadline sets
+the breach column in the same UPDATE; ``sla_sweep`` flags the clocks still
+running past their deadline, in bulk.
+
+All of these are plain columns with indexes built for the two queries
+(``ticket_response_sla_idx``, ``ticket_resolve_sla_idx``): the "IS NULL"
+columns first, then a range on the deadline. Tickets whose clock stopped
+or that are already flagged fall out of the range, so the sweep and the
+at-risk queue read only the tickets that matter - never the whole table.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db.models import Case, DateTimeField, ExpressionWrapper, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .db import write_transaction
+from .models import SlaPolicy, Ticket, TicketStatusEvent
+from .notifications import notify_tickets
+
+# Clocks run only while the ticket is being worked on.
+ACTIVE_STATUSES = ("OPEN", "IN_PROGRESS")
+
+# Initial policies (migration 0011), minutes: (response, resolve)
+DEFAULT_POLICIES = {
+    "CRITICAL": (60, 4 * 60),
+    "HIGH": (4 * 60, 24 * 60),
+    "MEDIUM": (8 * 60, 3 * 24 * 60),
+    "LOW": (24 * 60, 7 * 24 * 60),
+}
+
+
+def _timestamp(value):
+    return Value(value, output_field=DateTimeField())
+
+
+# ---- deadlines ----
+
+def _ordered_policies(policy_model=SlaPolicy) -> list:
+    # category-specific policies first: the first match wins
+    return sorted(policy_model.objects.all(), key=lambda policy: policy.category_id is None)
+
+
+def policy_for(priority: str, category_id: int | None, policy_model=SlaPolicy):
+    for policy in _ordered_policies(policy_model):
+        if policy.priority == priority and policy.category_id in (category_id, None):
+            return policy
+    return None
+
+
+def deadlines(priority: str, category_id: int | None, start) -> dict:
+    """``response_due_at`` / ``resolve_due_at`` for a ticket created at ``start``."""
+
+    policy = policy_for(priority, category_id)
+    if policy is None:
+        return {"response_due_at": None, "resolve_due_at": None}
+    return {
+        "response_due_at": start + timedelta(minutes=policy.response_minutes),
+        "resolve_due_at": start + timedelta(minutes=policy.resolve_minutes),
+    }
+
+
+def deadline_expressions(policy_model=SlaPolicy) -> dict:
+    """The same deadlines as SQL expressions over ``created_at`` / ``priority`` / ``category_id``."""
+
+    policies = _ordered_policies(policy_model)
+
+    def due(minutes_attr):
+        whens = []
+        for policy in policies:
+            match = {"priority": policy.priority}
+            if policy.category_id is not None:
+                match["category_id"] = policy.category_id
+            deadline = ExpressionWrapper(
+                F("created_at") + Value(timedelta(minutes=getattr(policy, minutes_attr))),
+                output_field=DateTimeField(),
+            )
+            whens.append(When(then=deadline, **match))
+        if not whens:
+            return _timestamp(None)
+        return Case(*whens, default=_timestamp(None), output_field=DateTimeField())
+
+    return {"response_due_at": due("response_minutes"), "resolve_due_at": due("resolve_minutes")}
+
+
+def recompute_deadlines(queryset, policy_model=SlaPolicy, **extra) -> int:
+    """Recompute the deadlines of ``queryset`` in one UPDATE (``extra``: more columns to set)."""
+
+    return queryset.update(**deadline_expressions(policy_model), **extra)
+
+
+def backfill_sla(queryset, policy_model=SlaPolicy, status_event_model=TicketStatusEvent) -> int:
+    """Deadlines and ``responded_at`` for tickets written around the API (migration, bulk loads).
+
+    A ticket already past OPEN was answered; the best known time is its
+    first status change, else ``updated_at``. Breaches are left to the sweep.
+    """
+
+    updated = recompute_deadlines(queryset, policy_model)
+    first_change = (
+        status_event_model.objects.filter(ticket=OuterRef("pk"))
+        .order_by("created_at")
+        .values("created_at")[:1]
+    )
+    queryset.filter(responded_at__isnull=True).exclude(status="OPEN").update(
+        responded_at=Coalesce(Subquery(first_change), F("updated_at"))
+    )
+    return updated
+
+
+def deadline_changes(ticket: Ticket, validated_data: dict) -> dict:
+    """New deadlines if an update changes the ticket's priority or category, else ``{}``."""
+
+    priority = validated_data.get("priority", ticket.priority)
+    category = validated_data.get("category", ticket.category)
+    category_id = category.pk if category is not None else None
+    if (priority, category_id) == (ticket.priority, ticket.category_id):
+        return {}
+    return deadlines(priority, category_id, ticket.created_at)
+
+
+# ---- stopping the clocks (column values for an UPDATE of the ticket) ----
+
+def response_updates(now) -> dict:
+    """First support response: stop the response clock, flag it if it was late."""
+
+    return {
+        "responded_at": Coalesce(F("responded_at"), _timestamp(now)),
+        "response_breached_at": Case(
+            When(
+                responded_at__isnull=True,
+                response_breached_at__isnull=True,
+                response_due_at__lt=now,
+                then=_timestamp(now),
+            ),
+            default=F("response_breached_at"),
+        ),
+    }
+
+
+def resolution_updates(now) -> dict:
+    return {
+        "resolve_breached_at": Case(
+            When(resolve_breached_at__isnull=True, resolve_due_at__lt=now, then=_timestamp(now)),
+            default=F("resolve_breached_at"),
+        ),
+    }
+
+
+def status_change_updates(new_status: str, now, *, by_support: bool = True) -> dict:
+    """SLA columns for an UPDATE that sets ``status = new_status``.
+
+    A status change by support counts as the response; leaving the active
+    statuses stops the resolve clock.
+    """
+
+    values = response_updates(now) if by_support else {}
+    if new_status not in ACTIVE_STATUSES:
+        values.update(resolution_updates(now))
+    return values
+
+
+def record_response(ticket_id: int, now=None) -> int:
+    now = now or timezone.now()
+    return Ticket.objects.filter(pk=ticket_id, responded_at__isnull=True).update(
+        **response_updates(now)
+    )
+
+
+# ---- breaches and the at-risk queue ----
+
+def _response_running() -> Q:
+    return Q(responded_at__isnull=True, status__in=ACTIVE_STATUSES)
+
+
+def breached_filter() -> Q:
+    """Active tickets with a flagged breach of a clock that is still running."""
+
+    return Q(_response_running(), response_breached_at__isnull=False) | Q(
+        resolve_breached_at__isnull=False, status__in=ACTIVE_STATUSES
+    )
+
+
+def at_risk_filter(horizon, include_breached: bool = False) -> Q:
+    """Running, unflagged clocks due before ``horizon``; with ``include_breached`` also flagged ones.
+
+    There is no lower bound: a deadline that passed since the last sweep
+    is still at risk (and the range stays small - the sweep flags it).
+    """
+
+    response = Q(_response_running(), response_breached_at__isnull=True, response_due_at__lt=horizon)
+    resolve = Q(
+        resolve_breached_at__isnull=True, status__in=ACTIVE_STATUSES, resolve_due_at__lt=horizon
+    )
+    condition = response | resolve
+    if include_breached:
+        condition |= breached_filter()
+    return condition
+
+
+def next_deadline():
+    """The deadline a ticket is racing against: response while unanswered, then resolve."""
+
+    return Case(
+        When(responded_at__isnull=True, response_due_at__isnull=False, then=F("response_due_at")),
+        default=F("resolve_due_at"),
+        output_field=DateTimeField(),
+    )
+
+
+def sweep_breaches(now=None) -> dict[str, list[int]]:
+    """Flag every running clock past its deadline; returns the newly flagged ticket ids.
+
+    Each newly flagged ticket also gets an ``sla_breached`` notification,
+    queued in the same transaction.
+    """
+
+    now = now or timezone.now()
+    with write_transaction():
+        response_qs = Ticket.objects.filter(
+            _response_running(), response_breached_at__isnull=True, response_due_at__lt=now
+        )
+        resolve_qs = Ticket.objects.filter(
+            resolve_breached_at__isnull=True, status__in=ACTIVE_STATUSES, resolve_due_at__lt=now
+        )
+        flagged = {
+            "response": list(response_qs.values_list("id", flat=True)),
+            "resolve": list(resolve_qs.values_list("id", flat=True)),
+        }
+        # by id: the rows just read, even if a deadline moves meanwhile
+        if flagged["response"]:
+            Ticket.objects.filter(pk__in=flagged["response"]).update(response_breached_at=now)
+        if flagged["resolve"]:
+            Ticket.objects.filter(pk__in=flagged["resolve"]).update(resolve_breached_at=now)
+        notify_tickets(
+            ("sla_breached", Ticket(pk=ticket_id), None, {"target": target})
+            for target, ticket_ids in flagged.items()
+            for ticket_id in ticket_ids
+        )
+    return flagged
@@ -0,0 +1,278 @@
+"""Ticket statistics rollup (``TicketStats``).
+
+The rollup is kept up to date by SQL triggers on ``tickets_ticket``: every
+insert, delete, or change of status / priority / category / assignee moves
+one unit between rollup rows inside the same statement. This covers the
+ORM ``save()``, ``QuerySet.update()``, ``bulk_create`` and cascading deletes
+alike (``ChangeTicketStatusCommand``, ``TicketAssignAPIView``, ...).
+
+Overdue tickets depend on the current date, so they are not rolled up and
+are counted directly from ``tickets_ticket``.
+"""
+
+from __future__ import annotations
+
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Ticket, TicketStats
+from .sla import breached_filter
+
+ROLLUP_TABLE = "tickets_ticketstats"
+
+_UPSERT_NEW = f"""
+    INSERT INTO {ROLLUP_TABLE}(assignee_key, status, priority, category_key, ticket_count)
+    VALUES (COALESCE(new.assigned_to_id, 0), new.status, new.priority, COALESCE(new.category_id, 0), 1)
+    ON CONFLICT(assignee_key, status, priority, category_key)
+    DO UPDATE SET ticket_count = ticket_count + 1;
+"""
+
+_DECREMENT_OLD = f"""
+    UPDATE {ROLLUP_TABLE} SET ticket_count = ticket_count - 1
+    WHERE assignee_key = COALESCE(old.assigned_to_id, 0)
+      AND status = old.status
+      AND priority = old.priority
+      AND category_key = COALESCE(old.category_id, 0);
+"""
+
+# Idempotent DDL. Re-run it from any migration that makes Django's SQLite
+# backend rebuild tickets_ticket (the rebuild drops triggers).
+TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_ticketstats_ai AFTER INSERT ON tickets_ticket BEGIN
+        {_UPSERT_NEW}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_ticketstats_ad AFTER DELETE ON tickets_ticket BEGIN
+        {_DECREMENT_OLD}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_ticketstats_au
+    AFTER UPDATE OF status, priority, category_id, assigned_to_id ON tickets_ticket
+    WHEN old.status IS NOT new.status
+        OR old.priority IS NOT new.priority
+        OR old.category_id IS NOT new.category_id
+        OR old.assigned_to_id IS NOT new.assigned_to_id
+    BEGIN
+        {_DECREMENT_OLD}
+        {_UPSERT_NEW}
+    END
+    """,
+]
+
+DROP_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS tickets_ticketstats_au",
+    "DROP TRIGGER IF EXISTS tickets_ticketstats_ad",
+    "DROP TRIGGER IF EXISTS tickets_ticketstats_ai",
+]
+
+
+def rollup_enabled(conn=None) -> bool:
+    return (conn or connection).vendor == "sqlite"
+
+
+def ensure_stats_triggers(conn) -> None:
+    if not rollup_enabled(conn):
+        return
+    with conn.cursor() as cursor:
+        for sql in TRIGGER_SQL:
+            cursor.execute(sql)
+
+
+def drop_stats_triggers(conn) -> None:
+    if not rollup_enabled(conn):
+        return
+    with conn.cursor() as cursor:
+        for sql in DROP_TRIGGER_SQL:
+            cursor.execute(sql)
+
+
+def _rollup_key(row) -> tuple:
+    return (row["assignee_key"], row["status"], row["priority"], row["category_key"])
+
+
+def compute_expected_rollup(ticket_model=Ticket) -> dict[tuple, int]:
+    """GROUP BY over tickets: the rollup as it should be."""
+
+    rows = (
+        ticket_model.objects.order_by()
+        .annotate(
+            assignee_key=Coalesce("assigned_to_id", 0, output_field=BigIntegerField()),
+            category_key=Coalesce("category_id", 0, output_field=BigIntegerField()),
+        )
+        .values("assignee_key", "status", "priority", "category_key")
+        .annotate(n=Count("id"))
+    )
+    return {_rollup_key(row): row["n"] for row in rows}
+
+
+def rebuild_rollup(stats_model=TicketStats, ticket_model=Ticket) -> dict[tuple, tuple[int, int]]:
+    """Recompute the rollup from tickets.
+
+    Returns drift found before the rebuild: ``{key: (stored, expected)}``.
+    """
+
+    with transaction.atomic():
+        expected = compute_expected_rollup(ticket_model)
+        stored = {
+            _rollup_key(row): row["ticket_count"]
+            for row in stats_model.objects.values(
+                "assignee_key", "status", "priority", "category_key", "ticket_count"
+            )
+        }
+
+        drift = {}
+        for key in set(expected) | set(stored):
+            if expected.get(key, 0) != stored.get(key, 0):
+                drift[key] = (stored.get(key, 0), expected.get(key, 0))
+
+        stats_model.objects.all().delete()
+        stats_model.objects.bulk_create(
+            stats_model(
+                assignee_key=key[0],
+                status=key[1],
+                priority=key[2],
+                category_key=key[3],
+                ticket_count=count,
+            )
+            for key, count in expected.items()
+        )
+    return drift
+
+
+def _rollup_rows(user, is_technician: bool):
+    rows = TicketStats.objects.filter(ticket_count__gt=0)
+    if is_technician:
+        # Technician sees own + unassigned tickets (same rule as _visible_ticket_qs)
+        rows = rows.filter(Q(assignee_key=user.id) | Q(assignee_key=0))
+    return rows.values("status", "priority").annotate(n=Sum("ticket_count"))
+
+
+def _overdue_qs(visible_qs):
+    return (
+        visible_qs.order_by()
+        .filter(due_date__isnull=False, due_date__lt=timezone.now().date())
+        .exclude(status__in=["RESOLVED", "CLOSED"])
+    )
+
+
+def _sla_breached_qs(visible_qs):
+    # flagged breaches of running clocks: two index range scans (sla.py)
+    return visible_qs.order_by().filter(breached_filter())
+
+
+def _rollup_payload(rows, overdue: int, sla_breached: int) -> dict:
+    by_status: dict[str, int] = {}
+    by_priority: dict[str, int] = {}
+    for row in rows:
+        by_status[row["status"]] = by_status.get(row["status"], 0) + row["n"]
+        by_priority[row["priority"]] = by_priority.get(row["priority"], 0) + row["n"]
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": [{"status": k, "count": by_status[k]} for k in sorted(by_status)],
+        "by_priority": [{"priority": k, "count": by_priority[k]} for k in sorted(by_priority)],
+        "counters": {
+            "open": by_status.get("OPEN", 0),
+            "in_progress": by_status.get("IN_PROGRESS", 0),
+            "resolved": by_status.get("RESOLVED", 0),
+            "closed": by_status.get("CLOSED", 0),
+            "overdue": overdue,
+            "sla_breached": sla_breached,
+        },
+    }
+
+
+def ticket_stats_payload(user, visible_qs, is_technician: bool) -> dict:
+    """Stats payload for ``TicketStatsAPIView`` read from the rollup.
+
+    ``visible_qs`` is the user's visible ticket queryset; it is only used for
+    the (time-dependent) overdue and SLA breach counters.
+    """
+
+    rows = list(_rollup_rows(user, is_technician))
+    return _rollup_payload(
+        rows, _overdue_qs(visible_qs).count(), _sla_breached_qs(visible_qs).count()
+    )
+
+
+async def aticket_stats_payload(user, visible_qs, is_technician: bool) -> dict:
+    """``ticket_stats_payload`` on the async ORM."""
+
+    rows = [row async for row in _rollup_rows(user, is_technician)]
+    return _rollup_payload(
+        rows,
+        await _overdue_qs(visible_qs).acount(),
+        await _sla_breached_qs(visible_qs).acount(),
+    )
+
+
+def _stats_aggregates() -> dict:
+    # Whole payload in one pass: conditional aggregation instead of 8 COUNT queries
+    now = timezone.now()
+    status_keys = [key for key, _ in Ticket.STATUS_CHOICES]
+    priority_keys = [key for key, _ in Ticket.PRIORITY_CHOICES]
+    aggregates = {"total": Count("id")}
+    aggregates.update(
+        {f"status_{key}": Count("id", filter=Q(status=key)) for key in status_keys}
+    )
+    aggregates.update(
+        {f"priority_{key}": Count("id", filter=Q(priority=key)) for key in priority_keys}
+    )
+    aggregates["overdue"] = Count(
+        "id",
+        filter=Q(due_date__isnull=False, due_date__lt=now.date())
+        & ~Q(status__in=["RESOLVED", "CLOSED"]),
+    )
+    aggregates["sla_breached"] = Count("id", filter=breached_filter())
+    return aggregates
+
+
+def _aggregate_payload(result) -> dict:
+    status_keys = [key for key, _ in Ticket.STATUS_CHOICES]
+    priority_keys = [key for key, _ in Ticket.PRIORITY_CHOICES]
+
+    # Same shape as the former GROUP BY output: sorted by key, zero rows omitted
+    by_status = [
+        {"status": key, "count": result[f"status_{key}"]}
+        for key in sorted(status_keys)
+        if result[f"status_{key}"]
+    ]
+    by_priority = [
+        {"priority": key, "count": result[f"priority_{key}"]}
+        for key in sorted(priority_keys)
+        if result[f"priority_{key}"]
+    ]
+
+    return {
+        "total": result["total"],
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "counters": {
+            "open": result["status_OPEN"],
+            "in_progress": result["status_IN_PROGRESS"],
+            "resolved": result["status_RESOLVED"],
+            "closed": result["status_CLOSED"],
+            "overdue": result["overdue"],
+            "sla_breached": result["sla_breached"],
+        },
+    }
+
+
+def aggregate_ticket_stats(visible_qs) -> dict:
+    """Stats payload computed straight from tickets in one aggregate query.
+
+    Used when the rollup is not available (non-SQLite backends).
+    """
+
+    return _aggregate_payload(visible_qs.order_by().aggregate(**_stats_aggregates()))
+
+
+async def aaggregate_ticket_stats(visible_qs) -> dict:
+    """``aggregate_ticket_stats`` on the async ORM."""
+
+    return _aggregate_payload(await visible_qs.order_by().aaggregate(**_stats_aggregates()))
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import Category, Ticket
+from ..permissions import clear_role_cache
+
+
+def make_user(username, role=None, **extra):
+    user = User.objects.create_user(username, f"{username}@example.com", "secret-pass-123", **extra)
+    if role is not None:
+        user.groups.add(Group.objects.get_or_create(name=role)[0])
+    return user
+
+
+class HelpdeskTestCase(APITestCase):
+    """Users of every role plus a few tickets; role and token caches start empty."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user("admin", "ADMIN")
+        cls.tech = make_user("tech", "TECHNICIAN")
+        cls.other_tech = make_user("tech2", "TECHNICIAN")
+        cls.requester = make_user("requester")
+        cls.category = Category.objects.create(name="Hardware")
+
+        yesterday = timezone.now().date() - timedelta(days=1)
+        cls.tickets = [
+            Ticket.objects.create(
+                title=f"Ticket {i}",
+                description="Printer on the second floor is jammed.",
+                status=status,
+                priority=priority,
+                created_by=cls.requester,
+                assigned_to=assignee,
+                due_date=yesterday if i % 2 else None,
+                category=cls.category if i % 3 else None,
+            )
+            for i, (status, priority, assignee) in enumerate(
+                [
+                    ("OPEN", "LOW", None),
+                    ("OPEN", "HIGH", cls.tech),
+                    ("IN_PROGRESS", "MEDIUM", cls.tech),
+                    ("RESOLVED", "CRITICAL", cls.other_tech),
+                    ("CLOSED", "HIGH", None),
+                    ("IN_PROGRESS", "HIGH", cls.other_tech),
+                ]
+            )
+        ]
+
+    def setUp(self):
+        clear_role_cache()
+        for cache in caches.all():
+            cache.clear()
+
+    def fresh(self, user):
+        # a new instance per request, like authentication would return
+        return User.objects.get(pk=user.pk)
+
+    def login(self, user):
+        # a real token, not force_authenticate: some views read the
+        # Authorization header themselves
+        token, _ = Token.objects.get_or_create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        return token
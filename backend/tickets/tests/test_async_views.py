@@ -0,0 +1,64 @@
+from .base import HelpdeskTestCase
+
+
+class AsyncReadViewTests(HelpdeskTestCase):
+    """The native async GETs answer exactly like the DRF views they replace."""
+
+    def get_both(self, url, **params):
+        responses = {}
+        for async_views in (True, False):
+            with self.settings(ASYNC_READ_VIEWS=async_views):
+                responses[async_views] = self.client.get(url, params)
+        return responses[True], responses[False]
+
+    def assertSameResponse(self, url, **params):
+        native, drf = self.get_both(url, **params)
+        self.assertEqual(native.status_code, drf.status_code)
+        self.assertEqual(native.json(), drf.json())
+        self.assertEqual(native.get("ETag"), drf.get("ETag"))
+        self.assertEqual(native.get("WWW-Authenticate"), drf.get("WWW-Authenticate"))
+        return native
+
+    def test_reads_match_the_drf_views_for_every_role(self):
+        visible = self.tickets[1].pk  # assigned to tech, created by requester
+        hidden = self.tickets[3].pk  # assigned to tech2
+        cases = [
+            ("/api/tickets/", {}),
+            ("/api/tickets/", {"page_size": 2}),
+            ("/api/tickets/", {"page_size": "all", "status": "OPEN"}),
+            ("/api/tickets/", {"fields": "id,status", "expand": "assigned_to_user"}),
+            (f"/api/tickets/{visible}/", {}),
+            (f"/api/tickets/{hidden}/", {}),
+            (f"/api/tickets/{visible}/comments/", {}),
+            (f"/api/tickets/{hidden}/comments/", {}),
+            ("/api/tickets/stats/", {}),
+            ("/api/health/", {}),
+        ]
+        for user in (self.admin, self.tech, self.requester):
+            self.login(user)
+            for url, params in cases:
+                with self.subTest(user=user.username, url=url, params=params):
+                    self.assertSameResponse(url, **params)
+
+    def test_errors_have_the_drf_shape(self):
+        response = self.assertSameResponse("/api/tickets/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token not-a-token")
+        self.assertEqual(self.assertSameResponse("/api/health/").status_code, 401)
+
+        self.login(self.requester)
+        self.assertEqual(self.assertSameResponse("/api/tickets/stats/").status_code, 403)
+        self.assertEqual(self.assertSameResponse("/api/tickets/", fields="secret").status_code, 400)
+
+    def test_browsable_api_and_writes_still_reach_drf(self):
+        self.login(self.admin)
+        response = self.client.get("/api/tickets/", HTTP_ACCEPT="text/html")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("text/html", response["Content-Type"])
+
+        response = self.client.post(
+            "/api/tickets/", {"title": "Monitor flickers", "description": "Since Monday."}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
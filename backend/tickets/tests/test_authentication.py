@@ -0,0 +1,46 @@
+from django.contrib.auth.models import User
+
+from .base import HelpdeskTestCase, make_user
+
+
+class CachedTokenAuthenticationTests(HelpdeskTestCase):
+    def test_cached_user_matches_database_row(self):
+        user = make_user("jkowalska", first_name="Joanna", last_name="Kowalska")
+        self.login(user)
+        row = User.objects.values(
+            "id", "username", "email", "first_name", "last_name", "is_staff", "is_superuser"
+        ).get(pk=user.pk)
+        # first request fills the token cache, the second is served from it
+        for attempt in ("database", "cache"):
+            with self.subTest(attempt):
+                response = self.client.get("/api/auth/me/")
+                self.assertEqual(response.status_code, 200)
+                me = response.json()["user"]
+                self.assertEqual({key: me[key] for key in row}, row)
+                self.assertEqual(me["groups"], [])
+                # a plain user: no admin endpoints, whatever the snapshot says
+                self.assertEqual(self.client.get("/api/tickets/stats/").status_code, 403)
+
+    def test_cached_request_runs_no_query(self):
+        self.login(self.tech)
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/auth/me/")
+        self.assertEqual(response.json()["user"]["groups"], ["TECHNICIAN"])
+
+    def test_logout_drops_the_cached_token(self):
+        self.login(self.requester)
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 200)
+        self.assertEqual(self.client.post("/api/auth/logout/").status_code, 204)
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 401)
+
+    def test_deactivation_drops_the_cached_snapshot(self):
+        self.login(self.requester)
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 200)
+
+        self.login(self.admin)
+        response = self.client.patch(f"/api/users/{self.requester.pk}/", {"is_active": False}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        self.login(self.requester)
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 401)
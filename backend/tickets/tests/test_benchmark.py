@@ -0,0 +1,42 @@
+from io import StringIO
+
+from ..management.commands.benchmark_api import ROLES, Command
+from ..models import Comment
+from .base import HelpdeskTestCase, make_user
+
+
+class BenchmarkCaseTests(HelpdeskTestCase):
+    def test_every_api_route_is_measured(self):
+        make_user("bench_user_1")
+        for ticket in self.tickets:
+            Comment.objects.create(ticket=ticket, author=self.requester, message="Any news?")
+        users = {"ADMIN": self.admin, "TECHNICIAN": self.tech, "USER": self.requester}
+        actors = {role: (user, None) for role, user in users.items()}
+
+        command = Command()
+        cases = [command._login_case(actors, "secret")]
+        for role in ROLES:
+            cases.extend(command._cases(role, self.fresh(users[role]), actors, "bench"))
+        self.assertEqual(command._unmeasured_routes(cases), [])
+        self.assertTrue(any(case.stream and case.path == "/api/events/" for case in cases))
+
+    def test_baseline_comparison_flags_regressions_above_the_noise_floor(self):
+        def report(**results):
+            return {"dataset": {"tickets": 6}, "results": results}
+
+        def row(status=200, queries=3, p95_ms=10.0, peak_kib=100.0):
+            return {"status": status, "queries": queries, "p95_ms": p95_ms, "peak_kib": peak_kib}
+
+        baseline = report(a=row(), b=row(), c=row(), d=row(p95_ms=1.0))
+        current = report(
+            a=row(queries=4),
+            b=row(p95_ms=13.0),
+            c=row(status=500, peak_kib=120.0),
+            # +50%, but below the 1 ms floor
+            d=row(p95_ms=1.5),
+        )
+        command = Command(stdout=StringIO())
+        self.assertEqual(
+            command._compare(current, baseline, threshold=0.2),
+            ["a: queries 3 -> 4", "b: p95_ms 10.0 -> 13.0 (+30%)", "c: status 200 -> 500"],
+        )
@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..events import hub
+from ..models import Ticket, TicketStatusEvent
+from ..stats import rebuild_rollup
+from .base import HelpdeskTestCase
+
+BULK_URL = "/api/tickets/bulk/"
+
+
+class BulkTicketUpdateTests(HelpdeskTestCase):
+    def bulk(self, user, **body):
+        self.login(user)
+        return self.client.post(BULK_URL, body, format="json")
+
+    def statuses(self):
+        return dict(Ticket.objects.values_list("id", "status"))
+
+    def test_mixed_id_list_reports_every_id_in_request_order(self):
+        t = self.tickets
+        ids = [t[1].pk, t[0].pk, t[3].pk, 999999, t[2].pk, t[1].pk]
+        response = self.bulk(self.tech, ids=ids, status="RESOLVED")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["updated"], response.data["failed"]), (2, 3))
+        self.assertEqual(
+            [(row["id"], row["ok"], row.get("error")) for row in response.data["results"]],
+            [
+                (t[1].pk, True, None),
+                # unassigned: visible to a technician, but not theirs to change
+                (t[0].pk, False, "You do not have permission to change status for this ticket."),
+                # assigned to another technician: not visible at all
+                (t[3].pk, False, "Not found."),
+                (999999, False, "Not found."),
+                (t[2].pk, True, None),
+            ],
+        )
+        statuses = self.statuses()
+        self.assertEqual(
+            [statuses[ticket.pk] for ticket in t],
+            ["OPEN", "RESOLVED", "RESOLVED", "RESOLVED", "CLOSED", "IN_PROGRESS"],
+        )
+
+    def test_per_id_rule_errors(self):
+        t = self.tickets
+        response = self.bulk(self.admin, ids=[t[4].pk, t[0].pk], status="OPEN")
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"id": t[4].pk, "ok": False, "error": "Closed ticket cannot be reopened."},
+                {"id": t[0].pk, "ok": True},
+            ],
+        )
+
+        # a technician may take unassigned tickets, not someone else's
+        response = self.bulk(self.other_tech, ids=[t[0].pk, t[3].pk, t[1].pk], assigned_to=self.other_tech.pk)
+        self.assertEqual([row["ok"] for row in response.data["results"]], [True, True, False])
+        self.assertEqual(response.data["results"][2]["error"], "Not found.")
+
+        # priority follows the edit rules: the owner, not the technician
+        response = self.bulk(self.tech, ids=[t[1].pk], priority="LOW")
+        self.assertEqual(
+            response.data["results"],
+            [{"id": t[1].pk, "ok": False, "error": "You do not have permission to edit this ticket."}],
+        )
+        response = self.bulk(self.requester, ids=[t[1].pk], priority="LOW")
+        self.assertEqual(response.data["results"], [{"id": t[1].pk, "ok": True}])
+
+    def test_invalid_body(self):
+        self.login(self.admin)
+        for body in ({"ids": [self.tickets[0].pk]}, {"ids": [], "status": "OPEN"}, {"ids": [1], "status": "DONE"}):
+            with self.subTest(body=body):
+                response = self.client.post(BULK_URL, body, format="json")
+                self.assertEqual(response.status_code, 400)
+
+    def test_allowed_tickets_are_written_with_one_update(self):
+        ids = [ticket.pk for ticket in self.tickets if ticket.status != "CLOSED"]
+        self.login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(BULK_URL, {"ids": ids, "status": "IN_PROGRESS"}, format="json")
+        self.assertEqual(response.data["updated"], len(ids))
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith('UPDATE "tickets_ticket"')]
+        self.assertEqual(len(updates), 1)
+        # one status event per ticket whose status actually changed
+        self.assertEqual(TicketStatusEvent.objects.filter(to_status="IN_PROGRESS").count(), 3)
+
+    def test_rollup_follows_the_bulk_update(self):
+        ids = [ticket.pk for ticket in self.tickets]
+        self.bulk(self.admin, ids=ids, status="CLOSED", priority="CRITICAL", assigned_to=self.tech.pk)
+        self.assertEqual(rebuild_rollup(), {})
+
+        self.login(self.tech)
+        stats = self.client.get("/api/tickets/stats/").json()
+        self.assertEqual(stats["total"], 6)
+        self.assertEqual(stats["counters"]["closed"], 6)
+
+    def test_events_are_published_per_updated_ticket_after_commit(self):
+        t = self.tickets
+        with mock.patch.object(hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.bulk(self.admin, ids=[t[0].pk, t[4].pk, t[1].pk], status="IN_PROGRESS")
+                publish.assert_not_called()
+        self.assertEqual(response.data["updated"], 2)
+        events = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual(
+            sorted((event.kind, event.data["id"], event.data["status"], event.data["from_status"]) for event in events),
+            [
+                ("ticket.status_changed", t[0].pk, "IN_PROGRESS", "OPEN"),
+                ("ticket.status_changed", t[1].pk, "IN_PROGRESS", "OPEN"),
+            ],
+        )
+
+        with mock.patch.object(hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.bulk(self.admin, ids=[t[0].pk], assigned_to=self.other_tech.pk)
+        (event,) = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual(event.kind, "ticket.assigned")
+        self.assertEqual((event.assigned_to_id, event.previous_assigned_to_id), (self.other_tech.pk, None))
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+
+from ..models import Category, Comment, Ticket
+from .base import HelpdeskTestCase
+
+
+class TicketListValidatorTests(HelpdeskTestCase):
+    def get(self, params, **headers):
+        return self.client.get("/api/tickets/", params, headers=headers)
+
+    def test_page_revalidates_and_changes_when_a_listed_ticket_is_deleted(self):
+        self.login(self.admin)
+        for async_views in (True, False):
+            with self.subTest(async_views=async_views), self.settings(ASYNC_READ_VIEWS=async_views):
+                params = {"page_size": 3, "with_count": 1}
+                response = self.get(params)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Last-Modified", response)
+                etag = response["ETag"]
+                self.assertEqual(self.get(params, if_none_match=etag).status_code, 304)
+
+                # not the newest ticket: Max(updated_at) stays the same
+                listed = [row["id"] for row in response.json()["results"]]
+                Ticket.objects.filter(pk=listed[1]).delete()
+                response = self.get(params, if_none_match=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn(listed[1], [row["id"] for row in response.json()["results"]])
+
+    def test_page_request_does_not_aggregate_the_whole_set(self):
+        self.login(self.admin)
+        with self.settings(ASYNC_READ_VIEWS=False), CaptureQueriesContext(connection) as queries:
+            response = self.get({"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        tickets = [q["sql"] for q in queries if '"tickets_ticket"' in q["sql"]]
+        self.assertEqual(len(tickets), 1, tickets)
+        self.assertNotIn("MAX(", tickets[0])
+
+    def test_full_list_ignores_if_modified_since(self):
+        self.login(self.admin)
+        for async_views in (True, False):
+            with self.subTest(async_views=async_views), self.settings(ASYNC_READ_VIEWS=async_views):
+                params = {"page_size": "all"}
+                response = self.get(params)
+                self.assertNotIn("Last-Modified", response)
+                tomorrow = http_date((timezone.now() + timedelta(days=1)).timestamp())
+                self.assertEqual(self.get(params, if_modified_since=tomorrow).status_code, 200)
+                self.assertEqual(self.get(params, if_none_match=response["ETag"]).status_code, 304)
+
+
+class ConditionalGetTests(HelpdeskTestCase):
+    """Detail, category and comment responses are validated by ETag only."""
+
+    def setUp(self):
+        super().setUp()
+        self.login(self.admin)
+        self.ticket = self.tickets[0]
+        self.tomorrow = http_date((timezone.now() + timedelta(days=1)).timestamp())
+
+    def assertRevalidates(self, url, change):
+        for async_views in (True, False):
+            with self.subTest(url=url, async_views=async_views), self.settings(ASYNC_READ_VIEWS=async_views):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn("Last-Modified", response)
+                etag = response["ETag"]
+                self.assertEqual(self.client.get(url, headers={"if_none_match": etag}).status_code, 304)
+
+                change()
+                # same second, no updated_at moved: only the ETag notices
+                self.assertEqual(
+                    self.client.get(url, headers={"if_modified_since": self.tomorrow}).status_code, 200
+                )
+                self.assertEqual(self.client.get(url, headers={"if_none_match": etag}).status_code, 200)
+
+    def add_comment(self):
+        Comment.objects.create(ticket=self.ticket, author=self.tech, message="Replaced the toner.")
+
+    def test_ticket_detail_changes_when_the_ticket_is_assigned(self):
+        self.assertRevalidates(
+            f"/api/tickets/{self.ticket.pk}/",
+            lambda: self.client.patch(
+                f"/api/tickets/{self.ticket.pk}/assign/", {"assigned_to": self.tech.pk}, format="json"
+            ),
+        )
+
+    def test_ticket_detail_changes_with_its_comment_counters(self):
+        self.assertRevalidates(f"/api/tickets/{self.ticket.pk}/", self.add_comment)
+
+    def test_comment_list_changes_when_a_comment_is_added(self):
+        self.assertRevalidates(f"/api/tickets/{self.ticket.pk}/comments/", self.add_comment)
+
+    def test_category_list_changes_when_a_category_is_deleted(self):
+        for name in ("Network", "Software"):
+            Category.objects.create(name=name)
+        self.assertRevalidates(
+            "/api/categories/", lambda: Category.objects.exclude(pk=self.category.pk).first().delete()
+        )
@@ -0,0 +1,100 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..counters import comment_counter_drift
+from ..models import Comment, Ticket
+from .base import HelpdeskTestCase
+
+
+class CommentCounterTests(HelpdeskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ticket = self.tickets[1]  # created by requester, assigned to tech
+
+    def counters(self):
+        return Ticket.objects.values_list(
+            "public_comment_count", "internal_comment_count", "last_comment_at", "last_public_comment_at"
+        ).get(pk=self.ticket.pk)
+
+    def comment(self, visibility=Comment.VISIBILITY_PUBLIC):
+        return Comment.objects.create(
+            ticket=self.ticket, author=self.tech, message="Checked the cable.", visibility=visibility
+        )
+
+    def test_triggers_follow_inserts_visibility_changes_and_deletes(self):
+        public = self.comment()
+        internal = self.comment(Comment.VISIBILITY_INTERNAL)
+        self.assertEqual(self.counters(), (1, 1, internal.created_at, public.created_at))
+
+        Comment.objects.filter(pk=internal.pk).update(visibility=Comment.VISIBILITY_PUBLIC)
+        self.assertEqual(self.counters(), (2, 0, internal.created_at, internal.created_at))
+
+        internal.delete()
+        public.delete()
+        self.assertEqual(self.counters(), (0, 0, None, None))
+        self.assertEqual(comment_counter_drift(), {})
+
+    def test_save_does_not_overwrite_counters_of_a_stale_instance(self):
+        stale = Ticket.objects.get(pk=self.ticket.pk)
+        self.comment()
+        stale.title = "Printer jammed again"
+        stale.save()
+        self.assertEqual(self.counters()[0], 1)
+
+    def test_requester_does_not_see_internal_counters(self):
+        self.comment()
+        internal = self.comment(Comment.VISIBILITY_INTERNAL)
+        url = f"/api/tickets/{self.ticket.pk}/"
+        for async_views in (True, False):
+            with self.subTest(async_views=async_views), self.settings(ASYNC_READ_VIEWS=async_views):
+                self.login(self.requester)
+                data = self.client.get(url).json()
+                self.assertEqual((data["public_comment_count"], data["internal_comment_count"]), (1, None))
+                self.assertNotEqual(data["last_comment_at"], None)
+
+                self.login(self.tech)
+                data = self.client.get(url).json()
+                self.assertEqual((data["public_comment_count"], data["internal_comment_count"]), (1, 1))
+                self.assertEqual(
+                    Ticket.objects.get(pk=self.ticket.pk).last_comment_at, internal.created_at
+                )
+
+    def test_reconcile_repairs_drift(self):
+        self.comment()
+        Ticket.objects.filter(pk=self.ticket.pk).update(public_comment_count=7)
+
+        out = StringIO()
+        call_command("reconcile_comment_counters", "--dry-run", stdout=out)
+        self.assertIn(f"ticket {self.ticket.pk}: public_comment_count: 7 -> 1", out.getvalue())
+        self.assertEqual(self.counters()[0], 7)
+
+        out = StringIO()
+        call_command("reconcile_comment_counters", stdout=out)
+        self.assertIn("Counters rebuilt.", out.getvalue())
+        self.assertEqual(self.counters()[0], 1)
+        self.assertEqual(comment_counter_drift(), {})
+
+
+class CommentPaginationTests(HelpdeskTestCase):
+    def test_comment_pages_walk_the_thread_newest_first(self):
+        ticket = self.tickets[1]
+        comments = [
+            Comment.objects.create(ticket=ticket, author=self.tech, message=f"Update {i}") for i in range(5)
+        ]
+        self.login(self.tech)
+        url = f"/api/tickets/{ticket.pk}/comments/"
+
+        # no parameters: the whole thread, as before
+        self.assertEqual(len(self.client.get(url).json()), 5)
+
+        seen = []
+        response = self.client.get(url, {"page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            seen += [row["id"] for row in page["results"]]
+            if not page["next"]:
+                break
+            response = self.client.get(page["next"])
+        self.assertEqual(seen, [c.pk for c in reversed(comments)])
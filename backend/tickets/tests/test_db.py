@@ -0,0 +1,92 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.test import SimpleTestCase
+
+from ..db import write_transaction
+
+ALIAS = "concurrent_writers"
+WRITERS = 4
+
+
+class ConcurrentWriteTests(SimpleTestCase):
+    """Read-then-write transactions from several threads on one SQLite file.
+
+    The test database is an in-memory shared cache, whose table locks behave
+    differently; this uses a file with the configured OPTIONS and pragmas.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        default = connections["default"].settings_dict
+        self.settings_dict = {
+            **default,
+            "NAME": str(Path(directory.name) / "writers.sqlite3"),
+            "OPTIONS": dict(default["OPTIONS"]),
+        }
+        with self.connect().cursor() as cursor:
+            cursor.execute("CREATE TABLE counter (id INTEGER PRIMARY KEY, n INTEGER NOT NULL)")
+            cursor.execute("INSERT INTO counter (id, n) VALUES (1, 0)")
+        self.addCleanup(self.disconnect)
+
+    def connect(self):
+        # a per-thread connection under an alias outside DATABASES, which
+        # write_transaction(using=ALIAS) finds like any configured one
+        connections[ALIAS] = connections["default"].__class__(self.settings_dict, ALIAS)
+        return connections[ALIAS]
+
+    def disconnect(self):
+        connections[ALIAS].close()
+        del connections[ALIAS]
+
+    def increment(self, barrier, errors):
+        try:
+            self.connect()
+            barrier.wait()
+            with write_transaction(using=ALIAS), connections[ALIAS].cursor() as cursor:
+                cursor.execute("SELECT n FROM counter WHERE id = 1")
+                (n,) = cursor.fetchone()
+                time.sleep(0.02)  # work between the read and the write
+                cursor.execute("UPDATE counter SET n = %s WHERE id = 1", [n + 1])
+        except OperationalError as exc:
+            errors.append(str(exc))
+        finally:
+            self.disconnect()
+
+    def run_writers(self):
+        barrier = threading.Barrier(WRITERS)
+        errors = []
+        threads = [threading.Thread(target=self.increment, args=(barrier, errors)) for _ in range(WRITERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with connections[ALIAS].cursor() as cursor:
+            cursor.execute("SELECT n FROM counter WHERE id = 1")
+            return errors, cursor.fetchone()[0]
+
+    def test_new_connections_get_the_pragmas(self):
+        with connections[ALIAS].cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            self.assertEqual(cursor.fetchone()[0], "wal")
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS["busy_timeout"])
+
+    def test_concurrent_writers_wait_for_the_lock(self):
+        self.assertEqual(self.settings_dict["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+        errors, n = self.run_writers()
+        self.assertEqual(errors, [])
+        self.assertEqual(n, WRITERS)
+
+    def test_deferred_transactions_fail_to_upgrade_their_lock(self):
+        # what the option prevents
+        self.settings_dict["OPTIONS"]["transaction_mode"] = None
+        errors, n = self.run_writers()
+        self.assertTrue(errors)
+        self.assertIn("database is locked", errors[0])
+        self.assertEqual(n, WRITERS - len(errors))
@@ -0,0 +1,126 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+
+from .. import events
+from ..events import EventHub, event_stream, publish_comment_event, publish_ticket_event
+from ..models import Comment
+from ..permissions import get_user_role
+from .base import HelpdeskTestCase
+
+
+class EventHubTests(HelpdeskTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(events, "hub", EventHub())
+        self.hub = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def open_stream(self, user):
+        role = await sync_to_async(get_user_role)(user)
+        stream = event_stream(user, role, heartbeat=5)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        return stream
+
+    def publish(self, kind, ticket, **extra):
+        # what a view does, with the commit it waits for
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_ticket_event(kind, ticket, **extra)
+
+    async def test_slow_subscriber_gets_resync_instead_of_a_growing_queue(self):
+        with self.settings(EVENT_STREAM_QUEUE_SIZE=2):
+            slow = await self.open_stream(self.admin)
+            # does not see tickets[3] (assigned to tech2): its queue stays empty
+            tech = await self.open_stream(self.tech)
+            for _ in range(3):
+                await sync_to_async(self.publish)("updated", self.tickets[3])
+            await sync_to_async(self.publish)("updated", self.tickets[0])
+            await asyncio.sleep(0)
+
+            self.assertEqual(await anext(slow), b"event: resync\ndata: {}\n\n")
+            with self.assertRaises(StopAsyncIteration):
+                await anext(slow)
+            message = await anext(tech)
+            self.assertIn(b"event: ticket.updated\n", message)
+            self.assertIn(f'"id":{self.tickets[0].pk},'.encode(), message)
+        self.assertEqual(self.hub.subscriber_count(), 1)
+        await tech.aclose()
+        self.assertEqual(self.hub.subscriber_count(), 0)
+
+    async def test_events_follow_ticket_visibility(self):
+        ticket = self.tickets[1]  # assigned to tech, created by requester
+        other_tech = await self.open_stream(self.other_tech)
+        tech = await self.open_stream(self.tech)
+        await sync_to_async(self.publish)("assigned", ticket, previous_assigned_to_id=self.other_tech.pk)
+        await sync_to_async(self.publish)("updated", ticket)
+        await asyncio.sleep(0)
+
+        self.assertIn(b"event: ticket.assigned\n", await anext(tech))
+        self.assertIn(b"event: ticket.updated\n", await anext(tech))
+        # reassigned away from tech2: told once, then no longer sees the ticket
+        self.assertIn(b"event: ticket.assigned\n", await anext(other_tech))
+        with self.assertRaises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                await anext(other_tech)
+        await tech.aclose()
+        await other_tech.aclose()
+
+    async def test_internal_comments_reach_support_only(self):
+        ticket = self.tickets[1]
+        comment = Comment(
+            pk=1, ticket=ticket, author=self.tech, message="Driver issue.",
+            visibility=Comment.VISIBILITY_INTERNAL,
+        )
+        requester = await self.open_stream(self.requester)
+        tech = await self.open_stream(self.tech)
+
+        def publish():
+            with self.captureOnCommitCallbacks(execute=True):
+                publish_comment_event("created", comment, ticket)
+
+        await sync_to_async(publish)()
+        await asyncio.sleep(0)
+        self.assertIn(b"event: comment.created\n", await anext(tech))
+        with self.assertRaises(TimeoutError):
+            async with asyncio.timeout(0.05):
+                await anext(requester)
+        await tech.aclose()
+        await requester.aclose()
+
+
+class PublishOnCommitTests(HelpdeskTestCase):
+    def test_event_is_published_only_after_commit(self):
+        ticket = self.tickets[0]
+        with mock.patch.object(events.hub, "publish") as publish:
+            with self.captureOnCommitCallbacks() as callbacks:
+                publish_ticket_event("updated", ticket)
+                publish.assert_not_called()
+            publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+        (event,) = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual((event.kind, event.data["id"]), ("ticket.updated", ticket.pk))
+
+    def test_rolled_back_change_publishes_nothing(self):
+        ticket = self.tickets[0]
+        with mock.patch.object(events.hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertRaises(RuntimeError), transaction.atomic():
+                    publish_ticket_event("updated", ticket)
+                    raise RuntimeError("rollback")
+        self.assertEqual(callbacks, [])
+        publish.assert_not_called()
+
+    def test_api_change_is_published_after_its_transaction(self):
+        self.login(self.admin)
+        with mock.patch.object(events.hub, "publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.patch(
+                    f"/api/tickets/{self.tickets[0].pk}/assign/", {"assigned_to": self.tech.pk}, format="json"
+                )
+                publish.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        (event,) = [call.args[0] for call in publish.call_args_list]
+        self.assertEqual((event.kind, event.assigned_to_id), ("ticket.assigned", self.tech.pk))
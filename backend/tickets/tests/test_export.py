@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from ..models import Comment
+from .base import HelpdeskTestCase
+
+
+class TicketExportTests(HelpdeskTestCase):
+    def export_csv(self, user, **params):
+        self.login(user)
+        response = self.client.get("/api/tickets/export/", {"format": "csv", **params})
+        self.assertEqual(response.status_code, 200)
+        return list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_export_applies_filters_visibility_and_comment_visibility(self):
+        ticket = self.tickets[1]
+        Comment.objects.create(ticket=ticket, author=self.tech, message="Ordered a new drum.")
+        Comment.objects.create(
+            ticket=ticket, author=self.tech, message="Vendor is slow.", visibility=Comment.VISIBILITY_INTERNAL
+        )
+
+        rows = self.export_csv(self.tech, status="OPEN", include="comment_count")
+        # own and unassigned tickets only, filtered like the list
+        self.assertEqual(sorted(int(row["id"]) for row in rows), [self.tickets[0].pk, ticket.pk])
+        counts = {int(row["id"]): row["comment_count"] for row in rows}
+        self.assertEqual(counts[ticket.pk], "2")
+
+        rows = self.export_csv(self.requester, status="OPEN", include="comment_count")
+        counts = {int(row["id"]): row["comment_count"] for row in rows}
+        # a plain user only counts public comments
+        self.assertEqual(counts[ticket.pk], "1")
+        self.assertEqual(rows[0]["created_by_username"], "requester")
+
+    def test_unknown_format_is_a_json_error(self):
+        self.login(self.admin)
+        response = self.client.get("/api/tickets/export/", {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_asgi_export_streams_the_same_rows_asynchronously(self):
+        token = self.login(self.admin)
+        client = AsyncClient()
+
+        async def export(export_format):
+            response = await client.get(
+                "/api/tickets/export/",
+                {"format": export_format},
+                headers={"authorization": f"Token {token.key}"},
+            )
+            return response, b"".join([chunk async for chunk in response.streaming_content])
+
+        for export_format in ("csv", "ndjson"):
+            with self.subTest(export_format):
+                response, body = async_to_sync(export)(export_format)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.is_async)
+
+                wsgi = self.client.get("/api/tickets/export/", {"format": export_format})
+                self.assertFalse(wsgi.is_async)
+                self.assertEqual(body, b"".join(wsgi.streaming_content))
+
+        lines = body.decode().splitlines()
+        self.assertEqual(sorted(json.loads(line)["id"] for line in lines), sorted(t.pk for t in self.tickets))
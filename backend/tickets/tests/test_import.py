@@ -0,0 +1,48 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+
+from ..models import Comment, ImportCheckpoint, Ticket
+from .base import HelpdeskTestCase
+
+
+class ImportTicketsTests(HelpdeskTestCase):
+    def test_crash_between_batches_resumes_without_duplicates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "legacy.jsonl"
+            path.write_text(
+                "".join(
+                    json.dumps({"title": f"Legacy {i}", "created_by": "requester"}) + "\n"
+                    for i in range(5)
+                ),
+                encoding="utf-8",
+            )
+
+            def run():
+                call_command("import_tickets", str(path), "--batch-size", "2", stdout=StringIO())
+
+            bulk_create = Comment.objects.bulk_create
+            calls = []
+
+            def crash_on_second_batch(*args, **kwargs):
+                # the batch's tickets are inserted, its checkpoint is not
+                calls.append(1)
+                if len(calls) == 2:
+                    raise RuntimeError("killed")
+                return bulk_create(*args, **kwargs)
+
+            with mock.patch.object(Comment.objects, "bulk_create", crash_on_second_batch):
+                with self.assertRaises(RuntimeError):
+                    run()
+            legacy = Ticket.objects.filter(title__startswith="Legacy")
+            self.assertEqual(legacy.count(), 2)
+            self.assertEqual(ImportCheckpoint.objects.get(source=str(path.resolve())).last_row, 2)
+
+            run()
+            titles = sorted(legacy.values_list("title", flat=True))
+            self.assertEqual(titles, [f"Legacy {i}" for i in range(5)])
+            self.assertEqual(ImportCheckpoint.objects.get(source=str(path.resolve())).last_row, 5)
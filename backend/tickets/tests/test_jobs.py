@@ -0,0 +1,145 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.utils import timezone
+
+from .. import jobs, views
+from ..jobs import PermanentJobError, claim_jobs, enqueue, finish_jobs, retry_delay, run_job
+from ..models import Job, Ticket
+from ..notifications import JOB_KIND
+from .base import HelpdeskTestCase
+
+KIND = "tests.job"
+
+
+class JobOutboxTests(HelpdeskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.handler = mock.Mock(return_value=None)
+        patcher = mock.patch.dict(jobs.HANDLERS, {KIND: self.handler})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_ticket(self):
+        self.login(self.requester)
+        return self.client.post("/api/tickets/", {"title": "Monitor", "description": "No signal."}, format="json")
+
+    def run_batch(self, worker="w1", lease=None):
+        """One worker iteration: claim, run, record."""
+
+        claimed = claim_jobs(worker, 10, lease)
+        return claimed, finish_jobs(worker, [(job, *run_job(job)) for job in claimed])
+
+    def make_ready(self, job):
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+    def test_job_is_written_with_the_change(self):
+        response = self.create_ticket()
+        self.assertEqual(response.status_code, 201)
+        job = Job.objects.get()
+        self.assertEqual((job.kind, job.status), (JOB_KIND, Job.STATUS_PENDING))
+        self.assertEqual(job.payload["ticket"], response.data["id"])
+
+    def test_rolled_back_change_leaves_no_job(self):
+        tickets = Ticket.objects.count()
+        # fails after the notification was queued, inside the same transaction
+        with mock.patch.object(views, "publish_ticket_event", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.create_ticket()
+        self.assertEqual(Ticket.objects.count(), tickets)
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_goes_back_to_pending_with_a_growing_delay(self):
+        self.handler.side_effect = ConnectionError("SMTP down")
+        job = enqueue(KIND, {"n": 1})
+        with self.settings(JOB_RETRY_BASE_SECONDS=10), mock.patch.object(jobs.random, "uniform", return_value=1):
+            for attempt, delay in ((1, 10), (2, 20)):
+                before = timezone.now()
+                claimed, counts = self.run_batch()
+                self.assertEqual(counts, {"done": 0, "retried": 1, "dead": 0})
+                job.refresh_from_db()
+                self.assertEqual((job.status, job.attempts, job.locked_by), (Job.STATUS_PENDING, attempt, ""))
+                self.assertEqual(job.last_error, "ConnectionError: SMTP down")
+                self.assertGreaterEqual(job.run_after, before + timedelta(seconds=delay))
+                self.assertLessEqual(job.run_after, timezone.now() + timedelta(seconds=delay))
+                # not ready before its run_after
+                self.assertEqual(claim_jobs("w1", 10), [])
+                self.make_ready(job)
+
+        self.handler.side_effect = None
+        _, counts = self.run_batch()
+        self.assertEqual(counts, {"done": 1, "retried": 0, "dead": 0})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.last_error), (Job.STATUS_DONE, 3, ""))
+
+    def test_retry_delay_is_capped_and_jittered(self):
+        with self.settings(JOB_RETRY_BASE_SECONDS=10, JOB_RETRY_MAX_SECONDS=60):
+            with mock.patch.object(jobs.random, "uniform", return_value=1):
+                self.assertEqual([retry_delay(n) for n in (1, 2, 3, 4, 5)], [10, 20, 40, 60, 60])
+            for _ in range(20):
+                self.assertTrue(30 <= retry_delay(3) <= 50)
+
+    def test_job_is_dead_after_max_attempts(self):
+        self.handler.side_effect = ConnectionError("SMTP down")
+        with self.settings(JOB_MAX_ATTEMPTS=2):
+            job = enqueue(KIND, {})
+        _, counts = self.run_batch()
+        self.assertEqual(counts["retried"], 1)
+        self.make_ready(job)
+        _, counts = self.run_batch()
+        self.assertEqual(counts, {"done": 0, "retried": 0, "dead": 1})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_DEAD, 2))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(claim_jobs("w1", 10), [])
+
+    def test_permanent_errors_are_not_retried(self):
+        self.handler.side_effect = PermanentJobError("bad payload")
+        failing = enqueue(KIND, {})
+        unknown = enqueue("tests.unknown", {})
+        _, counts = self.run_batch()
+        self.assertEqual(counts["dead"], 2)
+        failing.refresh_from_db()
+        unknown.refresh_from_db()
+        self.assertEqual((failing.status, failing.attempts), (Job.STATUS_DEAD, 1))
+        self.assertEqual(failing.last_error, "PermanentJobError: bad payload")
+        self.assertEqual(unknown.last_error, "No handler registered for job kind 'tests.unknown'.")
+
+    def test_expired_lease_is_claimed_again(self):
+        job = enqueue(KIND, {})
+        (claimed,) = claim_jobs("w1", 10, lease=60)
+        self.assertEqual((claimed.locked_by, claimed.attempts), ("w1", 1))
+        # still leased: nobody else gets it
+        self.assertEqual(claim_jobs("w2", 10), [])
+
+        # w1 died; its lease runs out
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        claimed, counts = self.run_batch("w2")
+        self.assertEqual([(j.pk, j.locked_by, j.attempts) for j in claimed], [(job.pk, "w2", 2)])
+        self.assertEqual(counts["done"], 1)
+
+    def test_expired_lease_after_the_last_attempt_is_dead(self):
+        with self.settings(JOB_MAX_ATTEMPTS=1):
+            job = enqueue(KIND, {})
+        claim_jobs("w1", 10)
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(claim_jobs("w2", 10), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DEAD)
+        self.assertIn("Lease expired", job.last_error)
+
+    def test_stale_worker_cannot_finish_a_job_it_no_longer_holds(self):
+        job = enqueue(KIND, {})
+        (stale,) = claim_jobs("w1", 10, lease=60)
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        (current,) = claim_jobs("w2", 10, lease=60)
+
+        # w1 comes back and reports, successfully or not
+        self.assertEqual(finish_jobs("w1", [(stale, None, False)]), {"done": 0, "retried": 0, "dead": 0})
+        self.assertEqual(finish_jobs("w1", [(stale, "Timeout", True)]), {"done": 0, "retried": 0, "dead": 0})
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.last_error), (Job.STATUS_RUNNING, "w2", ""))
+
+        self.assertEqual(finish_jobs("w2", [(current, None, False)])["done"], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_DONE)
@@ -0,0 +1,50 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TransactionTestCase
+
+from ..counters import comment_counter_drift
+from ..management.commands import generate_load_data
+from ..management.utils import maintenance_triggers, missing_triggers
+from ..models import Ticket
+from ..search import apply_ticket_search
+from ..stats import drop_stats_triggers, ensure_stats_triggers, rebuild_rollup
+
+LOAD_ARGS = ("--users", "10", "--tickets", "30", "--comments", "60", "--batch-size", "7", "--prefix", "lt")
+
+
+class DeferredIndexMaintenanceTests(TransactionTestCase):
+    """Real commits and rollbacks: the load runs in one top-level transaction."""
+
+    def generate(self, *extra):
+        call_command("generate_load_data", *LOAD_ARGS, *extra, stdout=StringIO())
+
+    def test_load_rebuilds_indexes_and_restores_triggers(self):
+        self.generate()
+        self.assertEqual(missing_triggers(connection), [])
+        self.assertEqual(Ticket.objects.count(), 30)
+        self.assertEqual(rebuild_rollup(), {})
+        self.assertEqual(comment_counter_drift(), {})
+        title = Ticket.objects.values_list("title", flat=True)[0]
+        self.assertTrue(apply_ticket_search(Ticket.objects.all(), title).exists())
+
+    def test_failed_load_rolls_back_with_the_dropped_triggers(self):
+        with mock.patch.object(
+            generate_load_data.Command, "_create_comments", side_effect=RuntimeError("killed")
+        ):
+            with self.assertRaises(RuntimeError):
+                self.generate()
+        self.assertEqual(missing_triggers(connection), [])
+        self.assertFalse(User.objects.filter(username__startswith="lt_").exists())
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_check_query_plans_fails_on_missing_triggers(self):
+        self.assertEqual(len(maintenance_triggers()), 12)
+        drop_stats_triggers(connection)
+        self.addCleanup(ensure_stats_triggers, connection)
+        with self.assertRaisesMessage(CommandError, "Missing triggers: tickets_ticketstats_au"):
+            call_command("check_query_plans", stdout=StringIO())
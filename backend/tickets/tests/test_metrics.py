@@ -0,0 +1,77 @@
+import tempfile
+from wsgiref.util import FileWrapper
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.http import FileResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import path
+
+from ..metrics import registry
+from .base import HelpdeskTestCase
+
+BODY = b"console.log(1);\n" * 300
+
+
+def download(request):
+    fileobj = tempfile.TemporaryFile()
+    fileobj.write(BODY)
+    fileobj.seek(0)
+    return FileResponse(fileobj)
+
+
+urlpatterns = [path("download/", download, name="download")]
+
+
+class SendfileWrapper(FileWrapper):
+    """``wsgi.file_wrapper`` of a server with sendfile: it gets the file object itself."""
+
+
+def wsgi_get(url, **headers):
+    """GET through the full WSGI stack: (status, body iterable, content).
+
+    The test client re-wraps streaming bodies, so it never shows what a
+    server would get.
+    """
+
+    environ = RequestFactory().get(url, headers=headers).environ
+    environ["wsgi.file_wrapper"] = SendfileWrapper
+    started = []
+    body = WSGIHandler()(environ, lambda status, response_headers: started.append(status))
+    try:
+        return started[0], body, b"".join(body)
+    finally:
+        body.close()
+
+
+@override_settings(ROOT_URLCONF=__name__, ALLOWED_HOSTS=["testserver"])
+class RequestMetricsStreamingTests(SimpleTestCase):
+    """Streaming bodies are counted without changing how the server sends them."""
+
+    def size_histogram(self):
+        histogram = registry.response_size.get("download")
+        return (histogram.count, histogram.total) if histogram else (0, 0)
+
+    def test_file_response_reaches_the_file_wrapper_and_is_counted(self):
+        count, total = self.size_histogram()
+        status, body, content = wsgi_get("/download/")
+        self.assertEqual(status, "200 OK")
+        self.assertIsInstance(body, SendfileWrapper)
+        self.assertEqual(content, BODY)
+        self.assertEqual(self.size_histogram(), (count + 1, total + len(BODY)))
+
+
+class MetricsEndpointTests(HelpdeskTestCase):
+    def test_requests_are_counted_per_route_and_shown_to_admins_only(self):
+        self.login(self.requester)
+        self.assertEqual(self.client.get("/api/categories/").status_code, 200)
+        self.assertEqual(self.client.get("/api/metrics/").status_code, 403)
+
+        self.login(self.admin)
+        response = self.client.get("/api/metrics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertRegex(
+            body, r'helpdesk_http_requests_total\{route="category-list-create",method="GET",status="200"\} \d+'
+        )
+        self.assertIn('helpdesk_db_queries_per_request_bucket{route="category-list-create",le="+Inf"}', body)
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Ticket
+from .base import HelpdeskTestCase
+
+
+class TicketCursorPaginationTests(HelpdeskTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Ticket.objects.bulk_create(
+            Ticket(
+                title=f"Bulk {i}",
+                description="Monitor flickers after the update.",
+                created_by=cls.requester,
+                assigned_to=(cls.tech, None, cls.other_tech)[i % 3],
+            )
+            for i in range(60)
+        )
+        # ties on created_at: the id breaks them
+        same_time = timezone.now() - timedelta(hours=1)
+        Ticket.objects.filter(title__in=[f"Bulk {i}" for i in range(10, 30)]).update(created_at=same_time)
+
+    def ordered_ids(self, queryset):
+        return list(queryset.order_by("-created_at", "-id").values_list("id", flat=True))
+
+    def follow(self, params):
+        """Ids of every page from ``params`` on, following ``next``."""
+
+        seen, url = [], "/api/tickets/"
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            seen += [row["id"] for row in response.json()["results"]]
+            url, params = response.json()["next"], None
+        return seen
+
+    def test_list_is_paginated_by_default(self):
+        self.login(self.admin)
+        response = self.client.get("/api/tickets/")
+        self.assertEqual(response.status_code, 200)
+        page = response.json()
+        self.assertEqual(len(page["results"]), 50)
+        self.assertIn("cursor=", page["next"])
+        self.assertNotIn("count", page)
+
+    def test_page_size_all_returns_the_whole_list(self):
+        self.login(self.admin)
+        response = self.client.get("/api/tickets/", {"page_size": "all"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.json()], self.ordered_ids(Ticket.objects.all()))
+
+    def test_cursor_round_trip_visits_every_ticket_once_in_order(self):
+        self.login(self.admin)
+        expected = self.ordered_ids(Ticket.objects.all())
+        for page_size in (1, 7, 500):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.follow({"page_size": page_size}), expected)
+
+    def test_filters_are_kept_in_next_links(self):
+        self.login(self.admin)
+        expected = self.ordered_ids(Ticket.objects.filter(status="OPEN"))
+        self.assertEqual(self.follow({"page_size": 4, "status": "OPEN"}), expected)
+
+    def test_count_is_the_whole_filtered_set(self):
+        self.login(self.requester)
+        response = self.client.get("/api/tickets/", {"page_size": 5, "with_count": 1})
+        self.assertEqual(response.json()["count"], Ticket.objects.filter(created_by=self.requester).count())
+
+    def test_invalid_cursor_is_404(self):
+        self.login(self.admin)
+        for cursor in ("not-a-cursor", "bm90LWpzb24", "WyJ4IiwxXQ"):
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/tickets/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 404)
+
+    def test_technician_pages_merge_own_and_unassigned(self):
+        expected = self.ordered_ids(
+            Ticket.objects.filter(Q(assigned_to=self.tech) | Q(assigned_to__isnull=True))
+        )
+        self.login(self.tech)
+        for async_views in (True, False):
+            with self.subTest(async_views=async_views), self.settings(ASYNC_READ_VIEWS=async_views):
+                response = self.client.get("/api/tickets/", {"page_size": 7, "with_count": 1})
+                self.assertEqual(response.json()["count"], len(expected))
+                self.assertEqual(self.follow({"page_size": 7}), expected)
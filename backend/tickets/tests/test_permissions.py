@@ -0,0 +1,74 @@
+from django.contrib.auth.models import Group
+
+from .. import permissions
+from ..permissions import get_user_role, is_admin_user
+from .base import HelpdeskTestCase, make_user
+
+
+class RoleResolutionTests(HelpdeskTestCase):
+    def test_role_from_groups_and_superuser(self):
+        both = make_user("both", "TECHNICIAN")
+        both.groups.add(Group.objects.get(name="ADMIN"))
+        root = make_user("root", is_superuser=True)
+        expected = {
+            self.admin: "ADMIN",
+            self.tech: "TECHNICIAN",
+            self.requester: "USER",
+            both: "ADMIN",
+            root: "ADMIN",
+        }
+        for user, role in expected.items():
+            with self.subTest(user.username):
+                self.assertEqual(get_user_role(self.fresh(user)), role)
+
+    def test_role_is_resolved_once_per_instance_and_shared_through_the_cache(self):
+        tech = self.fresh(self.tech)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_role(tech), "TECHNICIAN")
+            self.assertEqual(get_user_role(tech), "TECHNICIAN")
+        # another request (new instance) of the same user
+        tech = self.fresh(self.tech)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_role(tech), "TECHNICIAN")
+
+    def test_cache_keeps_the_most_recently_used_users(self):
+        users = [make_user(f"user{i}") for i in range(3)]
+        with self.settings(ROLE_CACHE_MAX_ENTRIES=2):
+            for user in users:
+                get_user_role(self.fresh(user))
+            get_user_role(self.fresh(users[1]))  # touch: users[2] is now the oldest
+            get_user_role(self.fresh(self.tech))
+        self.assertEqual(list(permissions._role_cache), [users[1].pk, self.tech.pk])
+
+
+class RoleInvalidationTests(HelpdeskTestCase):
+    def assertRole(self, user, role):
+        self.assertEqual(get_user_role(self.fresh(user)), role)
+
+    def test_removing_the_admin_group_demotes_at_once(self):
+        self.assertRole(self.admin, "ADMIN")
+        # what the Django admin user form does
+        self.fresh(self.admin).groups.set([])
+        self.assertRole(self.admin, "USER")
+
+    def test_membership_changed_from_the_group_side(self):
+        technicians = Group.objects.get(name="TECHNICIAN")
+        self.assertRole(self.requester, "USER")
+        technicians.user_set.add(self.requester)
+        self.assertRole(self.requester, "TECHNICIAN")
+        technicians.user_set.clear()
+        self.assertRole(self.requester, "USER")
+        self.assertRole(self.tech, "USER")
+
+    def test_deleting_a_role_group(self):
+        self.assertRole(self.tech, "TECHNICIAN")
+        Group.objects.filter(name="TECHNICIAN").delete()
+        self.assertRole(self.tech, "USER")
+
+    def test_role_change_through_the_api(self):
+        self.assertRole(self.tech, "TECHNICIAN")
+        self.login(self.admin)
+        response = self.client.patch(f"/api/users/{self.tech.pk}/", {"role": "USER"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(is_admin_user(self.fresh(self.tech)))
+        self.assertRole(self.tech, "USER")
@@ -0,0 +1,34 @@
+from ..models import Comment, Ticket
+from ..query_plans import PlanCase, ROLES, global_cases, plan_problems, role_cases
+from .base import HelpdeskTestCase
+
+
+class QueryPlanTests(HelpdeskTestCase):
+    """EXPLAIN QUERY PLAN of the API querysets: no full scans, list pages read in index order."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for ticket in cls.tickets:
+            Comment.objects.create(ticket=ticket, author=cls.requester, message="Any news?")
+
+    def role_users(self):
+        return {"ADMIN": self.admin, "TECHNICIAN": self.tech, "USER": self.requester}
+
+    def test_global_plans(self):
+        for case in global_cases():
+            with self.subTest(case.label):
+                self.assertEqual(plan_problems(case), [])
+
+    def test_role_plans(self):
+        for role in ROLES:
+            user = self.fresh(self.role_users()[role])
+            for case in role_cases(role, user):
+                with self.subTest(role=role, case=case.label):
+                    self.assertEqual(plan_problems(case), [], case.queryset.explain())
+
+    def test_checker_rejects_sorted_pages_and_scans(self):
+        sorted_page = PlanCase("by title", Ticket.objects.order_by("title")[:50], list_page=True)
+        self.assertTrue(any("TEMP B-TREE" in line for line in plan_problems(sorted_page)))
+        scan = PlanCase("by title", Ticket.objects.filter(title="x"))
+        self.assertTrue(any("SCAN tickets_ticket" in line for line in plan_problems(scan)))
@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Ticket
+from ..serializers import TicketSerializer
+from .base import HelpdeskTestCase
+
+
+def serialized(tickets):
+    return [dict(item) for item in TicketSerializer(tickets, many=True).data]
+
+
+@override_settings(TIME_ZONE="Europe/Warsaw")
+class TicketReadPathTests(HelpdeskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.admin)
+
+    def test_list_matches_ticket_serializer(self):
+        expected = serialized(Ticket.objects.order_by("-created_at", "-id"))
+
+        response = self.client.get("/api/tickets/", {"page_size": "all"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected)
+
+        response = self.client.get("/api/tickets/", {"page_size": 4})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], expected[:4])
+
+    def test_detail_matches_ticket_serializer(self):
+        # unassigned, no category, no due date: the nullable branches
+        ticket = self.tickets[0]
+        response = self.client.get(f"/api/tickets/{ticket.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), serialized([ticket])[0])
+
+        ticket = self.tickets[5]
+        response = self.client.get(f"/api/tickets/{ticket.pk}/")
+        self.assertEqual(response.json(), serialized([ticket])[0])
+
+    def test_benchmark_checks_both_paths_agree(self):
+        out = StringIO()
+        call_command("benchmark_serializers", rows=[len(self.tickets)], repeat=1, stdout=out)
+        self.assertIn(f"{len(self.tickets)} rows", out.getvalue())
+
+
+class SparseFieldsetTests(HelpdeskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.login(self.admin)
+
+    def test_fields_limit_keys_and_the_sql_projection(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/tickets/", {"page_size": 2, "fields": "id,title,status"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([list(row) for row in response.json()["results"]], [["id", "title", "status"]] * 2)
+        page_sql = [q["sql"] for q in queries.captured_queries if '"tickets_ticket"."title"' in q["sql"]]
+        self.assertTrue(page_sql)
+        for sql in page_sql:
+            self.assertNotIn("auth_user", sql)
+            self.assertNotIn('"description"', sql)
+
+    def test_expand_adds_the_nested_users(self):
+        ticket = self.tickets[1]
+        response = self.client.get(
+            f"/api/tickets/{ticket.pk}/", {"fields": "id,assigned_to", "expand": "assigned_to_user"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "id": ticket.pk,
+                "assigned_to": self.tech.pk,
+                "assigned_to_user": {"id": self.tech.pk, "username": "tech", "email": "tech@example.com"},
+            },
+        )
+
+    def test_detail_validator_depends_on_the_selected_fields(self):
+        url = f"/api/tickets/{self.tickets[0].pk}/"
+        full = self.client.get(url)
+        response = self.client.get(url, {"fields": "id,title"}, HTTP_IF_NONE_MATCH=full["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"id": self.tickets[0].pk, "title": "Ticket 0"})
+
+    def test_unknown_names_are_rejected(self):
+        response = self.client.get("/api/tickets/", {"fields": "id,secret", "expand": "category"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secret", response.json()["fields"])
+        self.assertIn("category", response.json()["expand"])
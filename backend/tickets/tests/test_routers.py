@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from .. import routers
+from .base import HelpdeskTestCase
+
+REPLICA = "replica"
+
+
+class ReplicaRoutingTests(HelpdeskTestCase):
+    """A second connection to the test database under the replica alias.
+
+    The test database is an in-memory shared cache; with ``read_uncommitted``
+    the replica connection reads the rows of the open test transaction, like
+    a replica that has caught up.
+    """
+
+    def setUp(self):
+        super().setUp()
+        default = connections["default"]
+        # an alias outside DATABASES: the router reaches it through connections[]
+        connections[REPLICA] = default.__class__({**default.settings_dict}, REPLICA)
+        connections[REPLICA].cursor().execute("PRAGMA read_uncommitted = 1")
+        self.addCleanup(self.remove_replica)
+        patcher = mock.patch.object(routers, "replica_alias", return_value=REPLICA)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def remove_replica(self):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+
+    def ticket_reads(self, request, *args, **kwargs):
+        """(response, aliases that read tickets) for one request, body consumed."""
+
+        aliases = {}
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                response = request(*args, **kwargs)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+        for alias, queries in (("default", primary), (REPLICA, replica)):
+            aliases[alias] = sum('FROM "tickets_ticket"' in q["sql"] for q in queries.captured_queries)
+        return response, {alias for alias, count in aliases.items() if count}
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.login(self.tech)
+        for url in ("/api/tickets/", "/api/tickets/stats/", f"/api/tickets/{self.tickets[1].pk}/comments/"):
+            with self.subTest(url):
+                response, aliases = self.ticket_reads(self.client.get, url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(aliases, {REPLICA})
+                if url == "/api/tickets/":
+                    self.assertEqual(len(response.json()["results"]), 4)
+
+        # not opted in: a detail view reads the primary
+        _, aliases = self.ticket_reads(self.client.get, f"/api/tickets/{self.tickets[1].pk}/")
+        self.assertEqual(aliases, {"default"})
+
+    def test_write_pins_the_user_to_the_primary(self):
+        self.login(self.tech)
+        response = self.client.post(
+            f"/api/tickets/{self.tickets[1].pk}/comments/", {"message": "On it."}, format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+
+        _, aliases = self.ticket_reads(self.client.get, "/api/tickets/")
+        self.assertEqual(aliases, {"default"})
+        # other users are not pinned
+        self.login(self.admin)
+        _, aliases = self.ticket_reads(self.client.get, "/api/tickets/")
+        self.assertEqual(aliases, {REPLICA})
+
+        # the pin expires
+        self.login(self.tech)
+        routers._pin_cache().delete(routers._pin_key(self.tech.pk))
+        _, aliases = self.ticket_reads(self.client.get, "/api/tickets/")
+        self.assertEqual(aliases, {REPLICA})
+
+    def test_failed_write_does_not_pin(self):
+        self.login(self.tech)
+        response = self.client.post(f"/api/tickets/{self.tickets[1].pk}/comments/", {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        _, aliases = self.ticket_reads(self.client.get, "/api/tickets/")
+        self.assertEqual(aliases, {REPLICA})
+
+    def test_export_streams_from_the_read_alias(self):
+        # rows are read after the view has returned and reset the context
+        # variable: the queryset carries current_read_alias() itself
+        self.login(self.tech)
+        response, aliases = self.ticket_reads(self.client.get, "/api/tickets/export/", {"format": "ndjson"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(aliases, {REPLICA})
+
+        routers.pin_to_primary(self.tech)
+        _, aliases = self.ticket_reads(self.client.get, "/api/tickets/export/", {"format": "ndjson"})
+        self.assertEqual(aliases, {"default"})
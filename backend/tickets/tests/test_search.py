@@ -0,0 +1,81 @@
+from ..models import Comment, Ticket
+from .base import HelpdeskTestCase
+
+
+class TicketSearchTests(HelpdeskTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        def ticket(title, description, assigned_to=None):
+            return Ticket.objects.create(
+                title=title,
+                description=description,
+                created_by=cls.requester,
+                assigned_to=assigned_to,
+            )
+
+        cls.in_title = ticket("VPN connection drops", "Happens every hour.")
+        cls.in_description = ticket("Laptop issue", "Cannot reach the vpn gateway from home.")
+        cls.accented = ticket("Różowa lampka na drukarce", "Toner?")
+        cls.public_hit = ticket("Email", "Outlook keeps asking for a password.")
+        Comment.objects.create(ticket=cls.public_hit, author=cls.tech, message="Reset the keychain entry.")
+        cls.internal_hit = ticket("Monitor", "Flickers.", assigned_to=cls.tech)
+        Comment.objects.create(
+            ticket=cls.internal_hit,
+            author=cls.tech,
+            message="Vendor escalation number 4711.",
+            visibility=Comment.VISIBILITY_INTERNAL,
+        )
+
+    def search(self, text, **params):
+        response = self.client.get("/api/tickets/", {"search": text, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def ids(self, page):
+        return [row["id"] for row in page["results"]]
+
+    def test_matches_title_description_and_word_prefixes(self):
+        self.login(self.requester)
+        self.assertEqual(self.ids(self.search("vpn")), [self.in_title.pk, self.in_description.pk])
+        self.assertEqual(self.ids(self.search("conn drop")), [self.in_title.pk])
+        self.assertEqual(self.ids(self.search("nothing-like-this")), [])
+
+    def test_diacritics_are_ignored(self):
+        self.login(self.requester)
+        self.assertEqual(self.ids(self.search("rozowa lampka")), [self.accented.pk])
+
+    def test_fts_operators_are_plain_words(self):
+        self.login(self.requester)
+        self.assertEqual(self.ids(self.search("vpn OR laptop")), [])
+        # every word is required: "-gateway" does not exclude, it must match
+        self.assertEqual(self.ids(self.search('"vpn" -gateway')), [self.in_description.pk])
+
+    def test_public_comment_text_is_searchable(self):
+        self.login(self.requester)
+        self.assertEqual(self.ids(self.search("keychain")), [self.public_hit.pk])
+
+    def test_internal_comment_text_only_for_support(self):
+        self.login(self.requester)
+        self.assertEqual(self.ids(self.search("escalation")), [])
+        self.login(self.tech)
+        self.assertEqual(self.ids(self.search("escalation")), [self.internal_hit.pk])
+
+    def test_results_keep_visibility_rules(self):
+        self.login(self.tech)
+        # assigned to nobody -> visible for a technician; other_tech's tickets are not
+        Ticket.objects.filter(pk=self.in_title.pk).update(assigned_to=self.other_tech)
+        self.assertEqual(self.ids(self.search("vpn")), [self.in_description.pk])
+
+    def test_search_page_is_ranked_and_has_no_cursor(self):
+        self.login(self.admin)
+        page = self.search("vpn", page_size=1, with_count=1)
+        # the title hit ranks first although the description hit is newer
+        self.assertEqual(self.ids(page), [self.in_title.pk])
+        self.assertIsNone(page["next"])
+        self.assertEqual(page["count"], 2)
+
+        response = self.client.get("/api/tickets/", {"search": "vpn", "cursor": "WyIyMDI2LTAxLTAxIiwxXQ"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cursor", response.json())
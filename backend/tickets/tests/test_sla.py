@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ..models import Job, SlaPolicy, Ticket
+from ..sla import recompute_deadlines, sweep_breaches
+from .base import HelpdeskTestCase
+
+AT_RISK_URL = "/api/tickets/at-risk/"
+
+
+class SlaDeadlineTests(HelpdeskTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # default policies come from the migration: HIGH 4h / 24h, CRITICAL 1h / 4h
+        SlaPolicy.objects.create(priority="HIGH", category=cls.category, response_minutes=30, resolve_minutes=120)
+
+    def create(self, **body):
+        self.login(self.requester)
+        response = self.client.post("/api/tickets/", {"title": "Laptop", "description": "Does not boot at all.", **body}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return Ticket.objects.get(pk=response.data["id"])
+
+    def assertDeadlines(self, ticket, response_minutes, resolve_minutes):
+        ticket.refresh_from_db()
+        # deadlines start when the request does, a moment before created_at
+        for due, minutes in ((ticket.response_due_at, response_minutes), (ticket.resolve_due_at, resolve_minutes)):
+            self.assertAlmostEqual(due - ticket.created_at, timedelta(minutes=minutes), delta=timedelta(seconds=5))
+
+    def test_category_policy_wins_over_the_default(self):
+        self.assertDeadlines(self.create(priority="HIGH", category=self.category.pk), 30, 120)
+        self.assertDeadlines(self.create(priority="HIGH"), 4 * 60, 24 * 60)
+        # no category policy for this priority: the default one
+        self.assertDeadlines(self.create(priority="CRITICAL", category=self.category.pk), 60, 4 * 60)
+
+    def test_sql_recompute_matches_the_policies(self):
+        tickets = Ticket.objects.filter(pk__in=[t.pk for t in self.tickets])
+        recompute_deadlines(tickets)
+        for ticket in tickets:
+            with self.subTest(priority=ticket.priority, category=ticket.category_id):
+                policy = SlaPolicy.objects.filter(priority=ticket.priority, category=ticket.category).first()
+                policy = policy or SlaPolicy.objects.get(priority=ticket.priority, category=None)
+                self.assertEqual(ticket.response_due_at, ticket.created_at + timedelta(minutes=policy.response_minutes))
+                self.assertEqual(ticket.resolve_due_at, ticket.created_at + timedelta(minutes=policy.resolve_minutes))
+
+    def test_deadlines_follow_priority_and_category_changes(self):
+        ticket = self.create(priority="LOW")
+        self.assertDeadlines(ticket, 24 * 60, 7 * 24 * 60)
+        url = f"/api/tickets/{ticket.pk}/"
+
+        self.client.patch(url, {"priority": "HIGH"}, format="json")
+        self.assertDeadlines(ticket, 4 * 60, 24 * 60)
+        self.client.patch(url, {"category": self.category.pk}, format="json")
+        self.assertDeadlines(ticket, 30, 120)
+
+        # other edits keep the stored deadlines
+        before = (ticket.response_due_at, ticket.resolve_due_at)
+        self.client.patch(url, {"title": "Laptop again"}, format="json")
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.response_due_at, ticket.resolve_due_at), before)
+
+
+class SlaClockTests(HelpdeskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        # deadlines of their own, not the fixture's (created around the API)
+        Ticket.objects.update(response_due_at=None, resolve_due_at=None)
+
+    def due(self, ticket, **deadlines):
+        Ticket.objects.filter(pk=ticket.pk).update(
+            **{name: self.now + timedelta(minutes=minutes) for name, minutes in deadlines.items()}
+        )
+
+    def ticket_updates(self, queries):
+        return [q["sql"] for q in queries.captured_queries if q["sql"].startswith('UPDATE "tickets_ticket" ')]
+
+    def test_late_response_is_flagged_by_the_update_that_records_it(self):
+        late, on_time = self.tickets[1], self.tickets[2]  # OPEN / IN_PROGRESS, assigned to tech
+        self.due(late, response_due_at=-5, resolve_due_at=60)
+        self.due(on_time, response_due_at=5, resolve_due_at=-5)
+        self.login(self.tech)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(f"/api/tickets/{late.pk}/status/", {"status": "IN_PROGRESS"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        (update,) = self.ticket_updates(queries)
+        self.assertIn('"response_breached_at"', update)
+        late.refresh_from_db()
+        self.assertIsNotNone(late.responded_at)
+        self.assertEqual(late.response_breached_at, late.responded_at)
+        self.assertIsNone(late.resolve_breached_at)
+
+        # answered in time by a comment; resolved late
+        self.client.post(f"/api/tickets/{on_time.pk}/comments/", {"message": "Looking."}, format="json")
+        on_time.refresh_from_db()
+        self.assertIsNotNone(on_time.responded_at)
+        self.assertIsNone(on_time.response_breached_at)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(f"/api/tickets/{on_time.pk}/status/", {"status": "RESOLVED"}, format="json")
+        (update,) = self.ticket_updates(queries)
+        self.assertIn('"resolve_breached_at"', update)
+        on_time.refresh_from_db()
+        self.assertIsNotNone(on_time.resolve_breached_at)
+        self.assertIsNone(on_time.response_breached_at)
+
+    def test_internal_comment_is_not_a_response(self):
+        ticket = self.tickets[1]
+        self.due(ticket, response_due_at=-5)
+        self.login(self.tech)
+        self.client.post(
+            f"/api/tickets/{ticket.pk}/comments/", {"message": "Driver?", "visibility": "INTERNAL"}, format="json"
+        )
+        ticket.refresh_from_db()
+        self.assertIsNone(ticket.responded_at)
+        self.client.post(f"/api/tickets/{ticket.pk}/comments/", {"message": "On it."}, format="json")
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.response_breached_at, ticket.responded_at)
+
+    def test_sweep_flags_only_running_clocks(self):
+        t = self.tickets  # OPEN, OPEN, IN_PROGRESS, RESOLVED, CLOSED, IN_PROGRESS
+        Ticket.objects.update(
+            response_due_at=self.now - timedelta(minutes=10), resolve_due_at=self.now - timedelta(minutes=5)
+        )
+        self.due(t[2], resolve_due_at=30)  # response late, resolve still in time
+        Ticket.objects.filter(pk=t[1].pk).update(responded_at=self.now - timedelta(minutes=20))
+        flagged_before = self.now - timedelta(minutes=1)
+        Ticket.objects.filter(pk=t[5].pk).update(response_breached_at=flagged_before)
+
+        flagged = sweep_breaches(self.now)
+        self.assertEqual(sorted(flagged["response"]), [t[0].pk, t[2].pk])
+        self.assertEqual(sorted(flagged["resolve"]), [t[0].pk, t[1].pk, t[5].pk])
+        self.assertEqual(Ticket.objects.get(pk=t[5].pk).response_breached_at, flagged_before)
+        self.assertFalse(Ticket.objects.filter(pk__in=[t[3].pk, t[4].pk], resolve_breached_at__isnull=False).exists())
+        # one notification per newly flagged clock
+        self.assertEqual(
+            sorted((job.payload["target"], job.payload["ticket"]) for job in Job.objects.all()),
+            [("resolve", t[0].pk), ("resolve", t[1].pk), ("resolve", t[5].pk), ("response", t[0].pk), ("response", t[2].pk)],
+        )
+
+        # flagged once
+        self.assertEqual(sweep_breaches(self.now + timedelta(minutes=1)), {"response": [], "resolve": []})
+
+    def at_risk(self, user, **params):
+        self.login(user)
+        response = self.client.get(AT_RISK_URL, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [row["id"] for row in response.data["results"]]
+
+    def test_at_risk_queue(self):
+        t = self.tickets
+        self.due(t[0], response_due_at=-5, resolve_due_at=600)  # passed since the last sweep, not flagged
+        self.due(t[1], response_due_at=90, resolve_due_at=600)
+        self.due(t[2], response_due_at=-60, resolve_due_at=-30)
+        Ticket.objects.filter(pk=t[2].pk).update(
+            response_breached_at=self.now, resolve_breached_at=self.now
+        )
+        self.due(t[3], resolve_due_at=-5)  # RESOLVED: clock stopped
+        self.due(t[5], response_due_at=-600, resolve_due_at=10)
+        Ticket.objects.filter(pk=t[5].pk).update(responded_at=self.now - timedelta(minutes=700))
+
+        # nearest deadline first: t[5] races its resolve deadline, t[0] its response
+        self.assertEqual(self.at_risk(self.admin, within=60), [t[0].pk, t[5].pk])
+        self.assertEqual(self.at_risk(self.admin, within=120), [t[0].pk, t[5].pk, t[1].pk])
+        self.assertEqual(self.at_risk(self.admin, within=60, breached="true"), [t[2].pk, t[0].pk, t[5].pk])
+        self.assertEqual(self.at_risk(self.admin, within=60, breached="true", limit=1), [t[2].pk])
+        # visibility: t[5] is tech2's
+        self.assertEqual(self.at_risk(self.tech, within=120, breached="true"), [t[2].pk, t[0].pk, t[1].pk])
+
+    def test_at_risk_access_and_parameters(self):
+        self.login(self.requester)
+        self.assertEqual(self.client.get(AT_RISK_URL).status_code, 403)
+        self.login(self.admin)
+        for params in ({"within": 0}, {"within": "soon"}, {"limit": 501}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(AT_RISK_URL, params).status_code, 400)
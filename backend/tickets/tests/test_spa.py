@@ -0,0 +1,79 @@
+import gzip
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from .test_metrics import SendfileWrapper, wsgi_get
+
+ASSET = "/static/assets/app-1a2b.js"
+BODY = b"console.log(1);\n" * 300
+
+
+class FrontendDistTestCase(SimpleTestCase):
+    """A throwaway FRONTEND_DIST_DIR with index.html and one hashed asset (plus .gz)."""
+
+    def setUp(self):
+        dist = tempfile.TemporaryDirectory()
+        self.addCleanup(dist.cleanup)
+        assets = Path(dist.name) / "assets"
+        assets.mkdir()
+        (assets / "app-1a2b.js").write_bytes(BODY)
+        (assets / "app-1a2b.js.gz").write_bytes(gzip.compress(BODY))
+        self.index = Path(dist.name) / "index.html"
+        self.index.write_text('<script src="/static/assets/app-1a2b.js"></script>')
+        settings = override_settings(FRONTEND_DIST_DIR=dist.name, ALLOWED_HOSTS=["testserver"])
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class StaticAssetTests(FrontendDistTestCase):
+    """Assets go through every middleware and still reach the server's file wrapper."""
+
+    def test_full_file_is_sent_by_the_file_wrapper(self):
+        status, body, content = wsgi_get(ASSET)
+        self.assertEqual(status, "200 OK")
+        self.assertIsInstance(body, SendfileWrapper)
+        self.assertEqual(content, BODY)
+
+    def test_compressed_variant_and_range_are_sent_by_the_file_wrapper(self):
+        status, body, content = wsgi_get(ASSET, accept_encoding="gzip")
+        self.assertIsInstance(body, SendfileWrapper)
+        self.assertEqual(gzip.decompress(content), BODY)
+
+        status, body, content = wsgi_get(ASSET, range="bytes=16-31")
+        self.assertEqual(status, "206 Partial Content")
+        self.assertIsInstance(body, SendfileWrapper)
+        self.assertEqual(content, b"console.log(1);\n")
+
+    def test_hashed_asset_is_immutable_and_revalidates_per_variant(self):
+        response = self.client.get(ASSET, headers={"accept-encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+        gzip_etag = response["ETag"]
+
+        response = self.client.get(ASSET)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertNotEqual(response["ETag"], gzip_etag)
+        self.assertEqual(self.client.get(ASSET, headers={"if-none-match": response["ETag"]}).status_code, 304)
+
+    def test_unsatisfiable_range_is_416(self):
+        response = self.client.get(ASSET, headers={"range": f"bytes={len(BODY)}-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(BODY)}")
+
+
+class SpaIndexTests(FrontendDistTestCase):
+    def test_index_is_revalidated_and_reloaded_when_the_build_changes(self):
+        response = self.client.get("/tickets/123")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        etag = response["ETag"]
+        self.assertEqual(self.client.get("/", headers={"if-none-match": etag}).status_code, 304)
+
+        # same second is possible: the size changes too
+        self.index.write_text('<script type="module" src="/static/assets/app-9f8e.js"></script>')
+        response = self.client.get("/", headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"app-9f8e.js", response.content)
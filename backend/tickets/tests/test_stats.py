@@ -0,0 +1,46 @@
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from ..stats import aggregate_ticket_stats
+from ..views import TicketStatsAPIView, _visible_ticket_qs
+from .base import HelpdeskTestCase
+
+
+class TicketStatsQueryCountTests(HelpdeskTestCase):
+    factory = APIRequestFactory()
+
+    def get_stats(self, user):
+        request = self.factory.get("/api/tickets/stats/")
+        force_authenticate(request, user=user)
+        return TicketStatsAPIView.as_view()(request)
+
+    def test_admin_stats_query_count(self):
+        admin = self.fresh(self.admin)
+        # role groups, rollup rows, overdue count, SLA breach count
+        with self.assertNumQueries(4):
+            response = self.get_stats(admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total"], 6)
+        self.assertEqual(response.data["counters"]["open"], 2)
+        self.assertEqual(response.data["counters"]["overdue"], 2)
+
+    def test_technician_stats_query_count(self):
+        tech = self.fresh(self.tech)
+        with self.assertNumQueries(4):
+            response = self.get_stats(tech)
+        self.assertEqual(response.status_code, 200)
+        # own + unassigned
+        self.assertEqual(response.data["total"], 4)
+
+    def test_user_is_rejected_after_role_lookup(self):
+        requester = self.fresh(self.requester)
+        with self.assertNumQueries(1):
+            response = self.get_stats(requester)
+        self.assertEqual(response.status_code, 403)
+
+    def test_aggregate_fallback_is_one_query_and_matches_rollup(self):
+        for user in (self.admin, self.tech):
+            user = self.fresh(user)
+            qs = _visible_ticket_qs(user)
+            with self.assertNumQueries(1):
+                aggregated = aggregate_ticket_stats(qs)
+            self.assertEqual(aggregated, self.get_stats(user).data)
@@ -0,0 +1,98 @@
+from unittest import mock
+
+from ..models import Job, Ticket, TicketStatusEvent
+from ..serializers import TicketSerializer
+from ..services import ChangeTicketStatusCommand, TicketStatusConflict
+from .base import HelpdeskTestCase
+
+
+class TicketStatusChangeTests(HelpdeskTestCase):
+    def change_status(self, user, ticket, new_status):
+        self.login(user)
+        return self.client.patch(f"/api/tickets/{ticket.pk}/status/", {"status": new_status}, format="json")
+
+    def test_transitions_are_listed_in_the_status_history(self):
+        ticket = self.tickets[1]
+        self.assertEqual(self.change_status(self.tech, ticket, "IN_PROGRESS").status_code, 200)
+        self.assertEqual(self.change_status(self.tech, ticket, "RESOLVED").status_code, 200)
+
+        self.login(self.requester)
+        response = self.client.get(f"/api/tickets/{ticket.pk}/status-history/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["from_status"], row["to_status"], row["changed_by_username"]) for row in response.data],
+            [("OPEN", "IN_PROGRESS", "tech"), ("IN_PROGRESS", "RESOLVED", "tech")],
+        )
+
+        # assigned to another technician: not visible
+        self.login(self.other_tech)
+        response = self.client.get(f"/api/tickets/{ticket.pk}/status-history/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_change_from_a_stale_read_is_a_conflict(self):
+        ticket = Ticket.objects.get(pk=self.tickets[1].pk)
+        # another request commits between this one's read and its UPDATE
+        Ticket.objects.filter(pk=ticket.pk).update(status="IN_PROGRESS")
+        command = ChangeTicketStatusCommand(ticket=ticket, new_status="RESOLVED", performed_by=self.tech)
+        with self.assertRaises(TicketStatusConflict):
+            command.execute()
+        self.assertEqual(Ticket.objects.get(pk=ticket.pk).status, "IN_PROGRESS")
+        self.assertFalse(TicketStatusEvent.objects.filter(ticket=ticket).exists())
+
+    def test_closed_ticket_cannot_be_reopened(self):
+        response = self.change_status(self.admin, self.tickets[4], "OPEN")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Ticket.objects.get(pk=self.tickets[4].pk).status, "CLOSED")
+
+
+class TicketDetailUpdateTests(HelpdeskTestCase):
+    def test_status_change_on_detail_is_recorded_like_the_status_endpoint(self):
+        ticket = self.tickets[0]
+        self.login(self.requester)
+        response = self.client.patch(
+            f"/api/tickets/{ticket.pk}/", {"status": "RESOLVED", "priority": "HIGH"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.status, ticket.priority), ("RESOLVED", "HIGH"))
+        event = TicketStatusEvent.objects.get(ticket=ticket)
+        self.assertEqual((event.from_status, event.to_status), ("OPEN", "RESOLVED"))
+        self.assertEqual(event.changed_by_id, self.requester.pk)
+        self.assertTrue(
+            Job.objects.filter(payload__event="status_changed", payload__ticket=ticket.pk).exists()
+        )
+        # the owner's own change is not a support response
+        self.assertIsNone(ticket.responded_at)
+
+    def test_detail_update_without_status_change_records_nothing(self):
+        ticket = self.tickets[1]
+        self.login(self.admin)
+        response = self.client.patch(f"/api/tickets/{ticket.pk}/", {"priority": "LOW"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(TicketStatusEvent.objects.filter(ticket=ticket).exists())
+        self.assertFalse(Job.objects.filter(payload__event="status_changed").exists())
+
+    def test_detail_update_keeps_a_concurrent_status_change_and_assignment(self):
+        ticket = self.tickets[0]
+        real_validate = TicketSerializer.validate
+
+        def concurrent_change(serializer, data):
+            # another request commits between this one's read and its save()
+            Ticket.objects.filter(pk=ticket.pk).update(status="IN_PROGRESS", assigned_to=self.tech)
+            return real_validate(serializer, data)
+
+        self.login(self.requester)
+        with mock.patch.object(TicketSerializer, "validate", autospec=True, side_effect=concurrent_change):
+            response = self.client.patch(
+                f"/api/tickets/{ticket.pk}/", {"title": "Printer still jammed"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            (response.data["title"], response.data["status"], response.data["assigned_to"]),
+            ("Printer still jammed", "IN_PROGRESS", self.tech.pk),
+        )
+        ticket.refresh_from_db()
+        self.assertEqual(
+            (ticket.title, ticket.status, ticket.assigned_to_id),
+            ("Printer still jammed", "IN_PROGRESS", self.tech.pk),
+        )
@@ -1,13 +1,18 @@
 from django.urls import path
 from .views import (
     HealthCheckView,
+    MetricsAPIView,
     UserListCreateAPIView,
     UserRetrieveUpdateDestroyAPIView,
     TicketListCreateAPIView,
+    TicketExportAPIView,
     TicketRetrieveUpdateDestroyAPIView,
     TicketChangeStatusAPIView,
+    TicketStatusHistoryAPIView,
     TicketStatsAPIView,
+    TicketAtRiskAPIView,
     TicketAssignAPIView,       
+    TicketBulkUpdateAPIView,
     TechnicianListAPIView,       
     CategoryListCreateAPIView,
     CategoryRetrieveUpdateDestroyAPIView,
@@ -15,11 +20,18 @@ from .views import (
     CommentRetrieveUpdateDestroyAPIView,
 )
 from .auth_views import LoginView, MeView, LogoutView
+from .event_views import ticket_event_stream
+from . import async_views
+from .async_views import read_dispatch
 
 
 urlpatterns = [
     # health
-    path("health/", HealthCheckView.as_view(), name="health-check"),
+    path("health/", read_dispatch(HealthCheckView.as_view(), async_views.health_check), name="health-check"),
+    path("metrics/", MetricsAPIView.as_view(), name="metrics"),
+
+    # live updates (Server-Sent Events, ASGI only)
+    path("events/", ticket_event_stream, name="ticket-events"),
 
     # auth
     path("auth/login/", LoginView.as_view(), name="api-login"),
@@ -34,17 +46,22 @@ urlpatterns = [
     path("users/technicians/", TechnicianListAPIView.as_view(), name="technician-list"),
 
     # tickets
-    path("tickets/", TicketListCreateAPIView.as_view(), name="ticket-list-create"),
-    path("tickets/<int:pk>/", TicketRetrieveUpdateDestroyAPIView.as_view(), name="ticket-detail"),
+    # GET (JSON) served by native async views, see async_views.py
+    path("tickets/", read_dispatch(TicketListCreateAPIView.as_view(), async_views.ticket_list), name="ticket-list-create"),
+    path("tickets/<int:pk>/", read_dispatch(TicketRetrieveUpdateDestroyAPIView.as_view(), async_views.ticket_detail), name="ticket-detail"),
     path("tickets/<int:pk>/status/", TicketChangeStatusAPIView.as_view(), name="ticket-change-status"),
+    path("tickets/<int:pk>/status-history/", TicketStatusHistoryAPIView.as_view(), name="ticket-status-history"),
     path("tickets/<int:pk>/assign/", TicketAssignAPIView.as_view(), name="ticket-assign"),
-    path("tickets/stats/", TicketStatsAPIView.as_view(), name="ticket-stats"),
+    path("tickets/stats/", read_dispatch(TicketStatsAPIView.as_view(), async_views.ticket_stats), name="ticket-stats"),
+    path("tickets/at-risk/", TicketAtRiskAPIView.as_view(), name="ticket-at-risk"),
+    path("tickets/export/", TicketExportAPIView.as_view(), name="ticket-export"),
+    path("tickets/bulk/", TicketBulkUpdateAPIView.as_view(), name="ticket-bulk-update"),
 
     # categories
     path("categories/", CategoryListCreateAPIView.as_view(), name="category-list-create"),
     path("categories/<int:pk>/", CategoryRetrieveUpdateDestroyAPIView.as_view(), name="category-detail"),
 
     # comments
-    path("tickets/<int:ticket_id>/comments/", CommentListCreateAPIView.as_view(), name="comment-list-create"),
+    path("tickets/<int:ticket_id>/comments/", read_dispatch(CommentListCreateAPIView.as_view(), async_views.comment_list), name="comment-list-create"),
     path("comments/<int:pk>/", CommentRetrieveUpdateDestroyAPIView.as_view(), name="comment-detail"),
 ]
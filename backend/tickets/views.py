@@ -1,13 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Q
+from django.db.models import Count, Max, Q
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework import generics, permissions, status
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.exceptions import PermissionDenied
+from rest_framework.negotiation import DefaultContentNegotiation
 
 from .permissions import (
     is_support_or_admin,
@@ -18,38 +24,119 @@ from .permissions import (
     can_change_ticket_status,
     can_assign_ticket,
     CanManageComment,
+    invalidate_user_role,
 )
-from .models import Ticket, Category, Comment
+from .authentication import invalidate_user_tokens
+from .db import write_transaction
+from .events import hub, publish_comment_event, publish_ticket_event
+from .models import Ticket, Category, Comment, TicketStatusEvent
+from .notifications import notify_ticket
 from .serializers import (
     TicketSerializer,
     CategorySerializer,
     CommentSerializer,
     UserBriefSerializer,
     TicketAssignSerializer,
+    TicketBulkUpdateSerializer,
     AdminUserSerializer,
 )
-from .services import ChangeTicketStatusCommand
+from .services import ChangeTicketStatusCommand, BulkTicketUpdateCommand
 from .filters import TicketFilter
+from .pagination import CommentCursorPagination, TicketCursorPagination
+from .conditional import make_etag, not_modified_response, set_validators
+from .export import EXPORT_FORMATS, astream_export, export_rows, stream_export
+from .sla import (
+    at_risk_filter,
+    deadline_changes,
+    deadlines,
+    next_deadline,
+    record_response,
+)
+from .stats import aggregate_ticket_stats, rollup_enabled, ticket_stats_payload
+from .metrics import registry as metrics_registry
+from .representation import (
+    render_tickets,
+    requested_ticket_fields,
+    ticket_list_state,
+    ticket_page_state,
+    ticket_row_state,
+    ticket_rows,
+)
+from .routers import ReplicaReadMixin, current_read_alias
 
 
-def _visible_ticket_qs(user):
-    """Base queryset limited to tickets visible for given user."""
+def _visibility_filters(user) -> list[Q]:
+    """Disjoint conditions that together select the tickets visible for given user.
 
-    qs = Ticket.objects.select_related("created_by", "assigned_to", "category").order_by(
-        "-created_at"
-    )
+    A technician sees two ranges of the assignee indexes (own, unassigned).
+    ``WHERE own OR unassigned`` loses their (-created_at, -id) order and
+    sorts every match, so list pages read the parts separately and merge
+    them (see ``TicketCursorPagination``).
+    """
 
     if is_admin_user(user):
-        return qs
+        return [Q()]
     if is_technician_user(user):
-        return qs.filter(Q(assigned_to=user) | Q(assigned_to__isnull=True))
-    return qs.filter(created_by=user)
+        return [Q(assigned_to=user), Q(assigned_to__isnull=True)]
+    return [Q(created_by=user)]
+
+
+def _any_of(conditions: list[Q]) -> Q:
+    combined = Q()
+    for condition in conditions:
+        combined |= condition
+    return combined
+
+
+def _ticket_base_qs():
+    return Ticket.objects.select_related("created_by", "assigned_to", "category").order_by(
+        "-created_at", "-id"
+    )
+
+
+def _visible_ticket_qs(user):
+    """Base queryset limited to tickets visible for given user."""
+
+    return _ticket_base_qs().filter(_any_of(_visibility_filters(user)))
+
+
+def _matching_ticket_qs(user, params):
+    return TicketFilter(params, user).apply(_ticket_base_qs())
+
+
+def _filtered_ticket_qs(user, params):
+    """Tickets matching TicketFilter params, limited to what the user may see."""
+
+    # Apply visibility rules LAST (prevents leaking by query params)
+    return _matching_ticket_qs(user, params).filter(_any_of(_visibility_filters(user)))
+
+
+def _filtered_ticket_parts(user, params) -> list:
+    """``_filtered_ticket_qs`` as disjoint querysets, one per visibility condition.
+
+    A search stays one queryset: its page is ordered by relevance, not by
+    the indexes the split is for.
+    """
+
+    if params.get("search"):
+        return [_filtered_ticket_qs(user, params)]
+    queryset = _matching_ticket_qs(user, params)
+    return [queryset.filter(condition) for condition in _visibility_filters(user)]
 
 
 def _get_visible_ticket_or_404(user, pk: int) -> Ticket:
     return get_object_or_404(_visible_ticket_qs(user), pk=pk)
 
 
+def _ticket_page_etag(request, paginator, page, include_internal: bool) -> str:
+    """ETag of a ticket list page: its rows plus the ``next`` cursor and ``count`` it returns."""
+
+    return make_etag(
+        "tickets", request.user.pk, request.get_full_path(), include_internal,
+        paginator.next_cursor, paginator.count, *ticket_page_state(page),
+    )
+
+
 # =========================
 # USER MANAGEMENT (ADMIN)
 # =========================
@@ -104,6 +191,9 @@ class UserRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
                 {"detail": "You cannot delete your own account."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        invalidate_user_tokens(obj)
+        invalidate_user_role(obj)
+        hub.disconnect_user(obj.pk)
         return super().destroy(request, *args, **kwargs)
 
 
@@ -114,7 +204,25 @@ class HealthCheckView(APIView):
         return Response({"status": "ok"})
 
 
-class TechnicianListAPIView(generics.ListAPIView):
+class MetricsAPIView(APIView):
+    """
+    Request / SQL metrics in Prometheus text format.
+    GET /api/metrics/
+
+    Access: ADMIN only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not is_admin_user(request.user):
+            raise PermissionDenied("Only admin can view metrics.")
+        return HttpResponse(
+            metrics_registry.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+class TechnicianListAPIView(ReplicaReadMixin, generics.ListAPIView):
     """
     Returns list of technicians/admins for assignment dropdown.
     Access: TECHNICIAN / ADMIN only.
@@ -142,28 +250,104 @@ class TechnicianListAPIView(generics.ListAPIView):
             .order_by("username")
         )
 
-class TicketListCreateAPIView(generics.ListCreateAPIView):
+class TicketListCreateAPIView(ReplicaReadMixin, generics.ListCreateAPIView):
+    """
+    GET returns keyset pages: the first 50 rows (?page_size=N), then follow `next`.
+    ?page_size=all returns the full list in one response.
+    Sparse output: ?fields=id,title,status&expand=assigned_to_user
+    """
     serializer_class = TicketSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TicketCursorPagination
 
     def get_queryset(self):
-        base_qs = Ticket.objects.select_related("created_by", "assigned_to", "category").order_by(
-            "-created_at"
+        return _filtered_ticket_qs(self.request.user, self.request.query_params)
+
+    def list(self, request, *args, **kwargs):
+        keys = requested_ticket_fields(request.query_params)
+        include_internal = is_support_or_admin(request.user)
+
+        # Read path: plain row tuples rendered to the TicketSerializer shape
+        parts = _filtered_ticket_parts(request.user, request.query_params)
+        page = self.paginate_queryset([ticket_rows(part, keys) for part in parts])
+        if page is not None:
+            # validator of the fetched page only, no aggregate over the whole set
+            etag = _ticket_page_etag(request, self.paginator, page, include_internal)
+            not_modified = not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+            response = self.get_paginated_response(render_tickets(page, keys, include_internal))
+            return set_validators(response, etag)
+
+        # Validator of the filtered + visible set: row count, newest updated_at, comment counters
+        queryset = self.filter_queryset(self.get_queryset())
+        state = ticket_list_state(queryset)
+        etag = make_etag("tickets", request.user.pk, request.get_full_path(), include_internal, *state.values())
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        response = Response(render_tickets(ticket_rows(queryset, keys), keys, include_internal))
+        return set_validators(response, etag)
+
+    def perform_create(self, serializer):
+        data = serializer.validated_data
+        category = data.get("category")
+        sla_deadlines = deadlines(
+            data.get("priority", Ticket._meta.get_field("priority").default),
+            category.pk if category is not None else None,
+            timezone.now(),
         )
+        with write_transaction():
+            ticket = serializer.save(created_by=self.request.user, **sla_deadlines)
+            notify_ticket("created", ticket, self.request.user)
+            publish_ticket_event("created", ticket)
 
-        filters = TicketFilter(self.request.query_params, self.request.user)
-        queryset = filters.apply(base_qs)
 
-        user = self.request.user
-        # Apply visibility rules LAST (prevents leaking by query params)
-        if is_admin_user(user):
-            return queryset
-        if is_technician_user(user):
-            return queryset.filter(Q(assigned_to=user) | Q(assigned_to__isnull=True))
-        return queryset.filter(created_by=user)
+class IgnoreFormatParamNegotiation(DefaultContentNegotiation):
+    """Always negotiate JSON (for error responses); `?format=` is the export format."""
 
-    def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class TicketExportAPIView(ReplicaReadMixin, APIView):
+    """
+    Streaming export of the ticket list.
+    GET /api/tickets/export/?format=csv|ndjson[&include=comment_count][&<TicketFilter params>]
+
+    Same filters and visibility rules as GET /api/tickets/.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = IgnoreFormatParamNegotiation
+
+    def get(self, request):
+        export_format = request.query_params.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        include = set(filter(None, request.query_params.get("include", "").split(",")))
+        # ASGI consumes sync streaming content in one go: give it an async iterator
+        asynchronous = isinstance(request._request, ASGIRequest)
+        # rows are read while the response streams, after the view has returned
+        header, rows = export_rows(
+            _filtered_ticket_qs(user, request.query_params).using(current_read_alias()),
+            include_comment_count="comment_count" in include,
+            include_internal=is_support_or_admin(user),
+            asynchronous=asynchronous,
+        )
+
+        stream = astream_export if asynchronous else stream_export
+        response = StreamingHttpResponse(
+            stream(export_format, header, rows),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        filename = timezone.now().strftime(f"tickets-%Y%m%d-%H%M%S.{export_format}")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
 
 
 class TicketRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -173,6 +357,24 @@ class TicketRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return _visible_ticket_qs(self.request.user)
 
+    def retrieve(self, request, *args, **kwargs):
+        # One query for validator and body (same shape as TicketSerializer)
+        keys = requested_ticket_fields(request.query_params)
+        row = ticket_rows(self.get_queryset().filter(pk=kwargs["pk"]), keys).first()
+        if row is None:
+            raise Http404
+        include_internal = is_support_or_admin(request.user)
+        etag = make_etag(
+            "ticket", kwargs["pk"], row.updated_at.isoformat(), keys, include_internal,
+            *ticket_row_state(row),
+        )
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        data = render_tickets([row], keys, include_internal)[0]
+        return set_validators(Response(data), etag)
+
     def update(self, request, *args, **kwargs):
         ticket = self.get_object()
         if not can_edit_ticket(request.user, ticket):
@@ -191,6 +393,32 @@ class TicketRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
             raise PermissionDenied("Only admin can delete tickets.")
         return super().destroy(request, *args, **kwargs)
 
+    def perform_update(self, serializer):
+        ticket = serializer.instance
+        # status goes through the same command as PATCH .../status/ (CAS,
+        # status event, notification, SLA clocks), not through save()
+        new_status = serializer.validated_data.pop("status", ticket.status)
+        # priority / category change -> deadlines from the new policy
+        sla_deadlines = deadline_changes(ticket, serializer.validated_data)
+        with write_transaction():
+            if new_status != ticket.status:
+                ChangeTicketStatusCommand(
+                    ticket=ticket,
+                    new_status=new_status,
+                    performed_by=self.request.user,
+                    by_support=is_support_or_admin(self.request.user),
+                ).execute()
+            ticket = serializer.save(**sla_deadlines)
+            # save() wrote only the edited columns; pick up the rest as committed
+            ticket.refresh_from_db(fields=["status", "assigned_to"])
+        publish_ticket_event("updated", ticket)
+
+    def perform_destroy(self, instance):
+        pk = instance.pk
+        instance.delete()
+        instance.pk = pk
+        publish_ticket_event("deleted", instance)
+
 
 class TicketChangeStatusAPIView(generics.UpdateAPIView):
     serializer_class = TicketSerializer
@@ -217,6 +445,43 @@ class TicketChangeStatusAPIView(generics.UpdateAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class TicketStatusHistoryAPIView(APIView):
+    """
+    Status transition timeline of a ticket (oldest first).
+    GET /api/tickets/{id}/status-history/
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        if not _visible_ticket_qs(request.user).filter(pk=pk).exists():
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        # Only indexed columns -> served from status_event_timeline_idx alone
+        events = list(
+            TicketStatusEvent.objects.filter(ticket_id=pk)
+            .order_by("created_at")
+            .values_list("id", "created_at", "from_status", "to_status", "changed_by_id")
+        )
+
+        User = get_user_model()
+        user_ids = {row[4] for row in events if row[4] is not None}
+        usernames = dict(User.objects.filter(pk__in=user_ids).values_list("id", "username"))
+        as_datetime = serializers.DateTimeField().to_representation
+
+        data = [
+            {
+                "id": event_id,
+                "created_at": as_datetime(created_at),
+                "from_status": from_status,
+                "to_status": to_status,
+                "changed_by": changed_by_id,
+                "changed_by_username": usernames.get(changed_by_id),
+            }
+            for event_id, created_at, from_status, to_status, changed_by_id in events
+        ]
+        return Response(data, status=status.HTTP_200_OK)
+
+
 class TicketAssignAPIView(generics.UpdateAPIView):
     """
     Assign or unassign ticket to technician/admin.
@@ -234,6 +499,7 @@ class TicketAssignAPIView(generics.UpdateAPIView):
 
         # Ticket must be visible to the requester (technician sees only own/unassigned)
         ticket = _get_visible_ticket_or_404(user, pk)
+        previous_assigned_to_id = ticket.assigned_to_id
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -256,15 +522,67 @@ class TicketAssignAPIView(generics.UpdateAPIView):
                 )
             ticket.assigned_to = new_assignee
 
-        ticket.save(update_fields=["assigned_to"])
+        with write_transaction():
+            ticket.save(update_fields=["assigned_to", "updated_at"])
+            if ticket.assigned_to_id != previous_assigned_to_id:
+                notify_ticket(
+                    "assigned", ticket, user, previous_assigned_to=previous_assigned_to_id
+                )
+        publish_ticket_event("assigned", ticket, previous_assigned_to_id=previous_assigned_to_id)
         return Response(TicketSerializer(ticket).data, status=status.HTTP_200_OK)
 
 
+class TicketBulkUpdateAPIView(APIView):
+    """
+    Bulk status / assignment / priority change.
+    POST /api/tickets/bulk/
+    Body: { "ids": [1, 2, 3], "status": "CLOSED" }  (status / assigned_to / priority)
+
+    Same rules as the single-ticket endpoints, checked per id. Allowed tickets are
+    updated in one transaction; response lists success or error for every id.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = TicketBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = dict(serializer.validated_data)
+        ticket_ids = data.pop("ids")
+
+        command = BulkTicketUpdateCommand(
+            queryset=_visible_ticket_qs(request.user),
+            ticket_ids=ticket_ids,
+            changes=data,
+            performed_by=request.user,
+        )
+        results = command.execute()
+
+        return Response(
+            {
+                "updated": sum(1 for row in results if row["ok"]),
+                "failed": sum(1 for row in results if not row["ok"]),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class CategoryListCreateAPIView(generics.ListCreateAPIView):
     queryset = Category.objects.all().order_by("name")
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def list(self, request, *args, **kwargs):
+        # Category "version": count + newest updated_at (changes on create/update/delete)
+        state = Category.objects.aggregate(n=Count("id"), last=Max("updated_at"))
+        etag = make_etag("categories", state["n"], state["last"])
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag)
+
     def create(self, request, *args, **kwargs):
         if not is_admin_user(request.user):
             raise PermissionDenied("Only admin can create categories.")
@@ -292,20 +610,22 @@ class CategoryRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView
         return super().destroy(request, *args, **kwargs)
 
 
-class CommentListCreateAPIView(generics.ListCreateAPIView):
+class CommentListCreateAPIView(ReplicaReadMixin, generics.ListCreateAPIView):
+    """
+    GET supports keyset pagination: ?page_size=50, then follow `next`.
+    Without page_size/cursor all comments are returned (legacy behaviour).
+    """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CommentCursorPagination
 
     def get_queryset(self):
         ticket_id = self.kwargs.get("ticket_id")
-        ticket = _get_visible_ticket_or_404(self.request.user, ticket_id)
+        if not _visible_ticket_qs(self.request.user).filter(pk=ticket_id).exists():
+            raise Http404(f"No {Ticket._meta.object_name} matches the given query.")
 
-        qs = (
-            Comment.objects
-            .filter(ticket=ticket)
-            .select_related("ticket", "author")
-            .order_by("-created_at")
-        )
+        # CommentSerializer only needs ticket_id / author_id: no joins
+        qs = Comment.objects.filter(ticket_id=ticket_id).order_by("-created_at")
 
         user = self.request.user
         if is_support_or_admin(user):
@@ -313,21 +633,53 @@ class CommentListCreateAPIView(generics.ListCreateAPIView):
 
         return qs.filter(visibility=Comment.VISIBILITY_PUBLIC)
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        state = queryset.order_by().aggregate(n=Count("id"), last=Max("updated_at"))
+        etag = make_etag(
+            "comments",
+            self.kwargs.get("ticket_id"),
+            is_support_or_admin(request.user),
+            request.get_full_path(),
+            state["n"],
+            state["last"],
+        )
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(self.get_serializer(queryset, many=True).data)
+        return set_validators(response, etag)
+
     def perform_create(self, serializer):
         ticket_id = self.kwargs.get("ticket_id")
-        ticket = _get_visible_ticket_or_404(self.request.user, ticket_id)
-
         user = self.request.user
         visibility = serializer.validated_data.get("visibility", Comment.VISIBILITY_PUBLIC)
 
         if not is_support_or_admin(user):
             visibility = Comment.VISIBILITY_PUBLIC
 
-        serializer.save(
-            author=user,
-            ticket=ticket,
-            visibility=visibility,
-        )
+        with write_transaction():
+            ticket = _get_visible_ticket_or_404(user, ticket_id)
+            comment = serializer.save(
+                author=user,
+                ticket=ticket,
+                visibility=visibility,
+            )
+            if (
+                visibility == Comment.VISIBILITY_PUBLIC
+                and is_support_or_admin(user)
+                and user.pk != ticket.created_by_id
+            ):
+                # first public answer from support stops the response clock
+                record_response(ticket.pk)
+            notify_ticket("comment_created", ticket, user, comment=comment.pk)
+            publish_comment_event("created", comment, ticket)
 
 
 class CommentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -347,12 +699,22 @@ class CommentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
         # Regular users: only comments for their tickets AND only public
         return qs.filter(ticket__created_by=user, visibility=Comment.VISIBILITY_PUBLIC)
 
+    def perform_update(self, serializer):
+        comment = serializer.save()
+        publish_comment_event("updated", comment, comment.ticket)
+
+    def perform_destroy(self, instance):
+        pk = instance.pk
+        instance.delete()
+        instance.pk = pk
+        publish_comment_event("deleted", instance, instance.ticket)
+
 
 # =========================
 # STATS
 # =========================
 
-class TicketStatsAPIView(APIView):
+class TicketStatsAPIView(ReplicaReadMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -363,35 +725,68 @@ class TicketStatsAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        now = timezone.now()
         # Admin: stats for all tickets, Technician: stats only for visible (own/unassigned)
         qs = _visible_ticket_qs(user)
-
-        total = qs.count()
-        by_status = qs.values("status").annotate(count=Count("id")).order_by("status")
-        by_priority = qs.values("priority").annotate(count=Count("id")).order_by("priority")
-
-        open_tickets = qs.filter(status="OPEN").count()
-        in_progress_tickets = qs.filter(status="IN_PROGRESS").count()
-        resolved_tickets = qs.filter(status="RESOLVED").count()
-        closed_tickets = qs.filter(status="CLOSED").count()
-
-        overdue_tickets = qs.filter(
-            due_date__isnull=False,
-            due_date__lt=now.date(),
-        ).exclude(status__in=["RESOLVED", "CLOSED"]).count()
-
-        data = {
-            "total": total,
-            "by_status": list(by_status),
-            "by_priority": list(by_priority),
-            "counters": {
-                "open": open_tickets,
-                "in_progress": in_progress_tickets,
-                "resolved": resolved_tickets,
-                "closed": closed_tickets,
-                "overdue": overdue_tickets,
-            },
-        }
+        if rollup_enabled():
+            data = ticket_stats_payload(user, qs, is_technician=is_technician_user(user))
+        else:
+            data = aggregate_ticket_stats(qs)
 
         return Response(data, status=status.HTTP_200_OK)
+
+
+class TicketAtRiskAPIView(ReplicaReadMixin, APIView):
+    """
+    Tickets nearing an SLA breach, nearest deadline first.
+    GET /api/tickets/at-risk/?within=<minutes>&breached=true&limit=100
+
+    A ticket is at risk while its response (unanswered) or resolve (OPEN /
+    IN_PROGRESS) deadline falls before now + `within` minutes and no breach
+    was flagged yet; `breached=true` adds the flagged ones. Read by index
+    range scans only (see sla.py). TECHNICIAN / ADMIN only.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    MAX_LIMIT = 500
+
+    def _int_param(self, name, default, maximum):
+        raw = self.request.query_params.get(name)
+        if raw in (None, ""):
+            return default
+        try:
+            value = int(raw)
+        except ValueError:
+            value = 0
+        if not 1 <= value <= maximum:
+            raise serializers.ValidationError({name: f"Must be an integer between 1 and {maximum}."})
+        return value
+
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        if not is_support_or_admin(user):
+            return Response(
+                {"detail": "You do not have permission to view the SLA queue."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        within = self._int_param("within", getattr(settings, "SLA_AT_RISK_MINUTES", 60), 7 * 24 * 60)
+        limit = self._int_param("limit", 100, self.MAX_LIMIT)
+        include_breached = request.query_params.get("breached", "").lower() in ("1", "true", "yes")
+        keys = requested_ticket_fields(request.query_params)
+        now = timezone.now()
+
+        queryset = (
+            _visible_ticket_qs(user)
+            .filter(at_risk_filter(now + timedelta(minutes=within), include_breached))
+            .annotate(sla_deadline=next_deadline())
+            .order_by("sla_deadline", "id")[:limit]
+        )
+        results = render_tickets(ticket_rows(queryset, keys), keys, include_internal=True)
+        return Response(
+            {
+                "now": serializers.DateTimeField().to_representation(now),
+                "within_minutes": within,
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
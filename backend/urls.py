@@ -1,9 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include, re_path
-from django.conf import settings
-from django.conf.urls.static import static
 
-from backend.spa import spa_index
+from backend.spa import spa_index, static_asset
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -11,11 +9,12 @@ urlpatterns = [
     path("api-auth/", include("rest_framework.urls")),
 ]
 
+# /static/* z frontend_dist (warianty .br/.gz, cache, Range) – bez CDN, także przy DEBUG=False
+urlpatterns += [
+    re_path(r"^static/(?P<path>.+)$", static_asset),
+]
+
 # SPA fallback – wszystko co nie jest admin/api/static
 urlpatterns += [
     re_path(r"^(?!admin/|api/|api-auth/|static/).*$", spa_index),
 ]
-
-# W trybie DEBUG Django serwuje statyczne pliki (czyli /static/* z frontend_dist)
-if settings.DEBUG:
-    urlpatterns += static(settings.STATIC_URL, document_root=settings.FRONTEND_DIST_DIR)
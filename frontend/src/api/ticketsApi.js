@@ -10,8 +10,16 @@ import api from "./httpClient";
  * - PATCH  /tickets/{id}/status/
  */
 
-export async function fetchTickets() {
-  const res = await api.get("/tickets/");
+export const TICKETS_PAGE_SIZE = 50;
+
+/**
+ * One page of the ticket list: { next, results }.
+ * Pass the previous page's `next` link to get the following page.
+ */
+export async function fetchTickets(next = null) {
+  const res = next
+    ? await api.get(next)
+    : await api.get("/tickets/", { params: { page_size: TICKETS_PAGE_SIZE } });
   return res.data;
 }
 
@@ -8,6 +8,7 @@ import Typography from "@mui/material/Typography";
 import Alert from "@mui/material/Alert";
 import CircularProgress from "@mui/material/CircularProgress";
 import Box from "@mui/material/Box";
+import Button from "@mui/material/Button";
 import Switch from "@mui/material/Switch";
 import FormControlLabel from "@mui/material/FormControlLabel";
 import { useAuth } from "../context/AuthContext";
@@ -15,6 +16,8 @@ import "./TicketListPage.css";
 
 function TicketListPage() {
   const [tickets, setTickets] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [categories, setCategories] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -45,11 +48,12 @@ function TicketListPage() {
   const loadData = async () => {
     try {
       setLoading(true);
-      const [ticketsData, categoriesData] = await Promise.all([
+      const [ticketsPage, categoriesData] = await Promise.all([
         fetchTickets(),
         fetchCategories(),
       ]);
-      setTickets(ticketsData);
+      setTickets(ticketsPage.results);
+      setNextPage(ticketsPage.next);
       setCategories(categoriesData);
       setError(null);
     } catch (err) {
@@ -60,6 +64,21 @@ function TicketListPage() {
     }
   };
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await fetchTickets(nextPage);
+      setTickets((current) => [...current, ...page.results]);
+      setNextPage(page.next);
+      setError(null);
+    } catch (err) {
+      console.error("Error fetching tickets:", err);
+      setError("Failed to load tickets");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadData();
   }, []);
@@ -109,6 +128,13 @@ function TicketListPage() {
           ) : (
             <TicketsTable tickets={visibleTickets} categories={categories} />
           )}
+          {!loading && !error && nextPage && (
+            <Box mt={2} display="flex" justifyContent="center">
+              <Button variant="outlined" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? "Loading..." : "Load more"}
+              </Button>
+            </Box>
+          )}
         </Paper>
       </Container>
     </div>